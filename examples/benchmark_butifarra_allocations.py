@@ -0,0 +1,103 @@
+''' Count the allocations of the Butifarra game engine over self-play games with tracemalloc
+
+The actions are interned ActionEvents and the moves are __slots__ records, so decoding
+an action and listing the legal actions should not allocate any action, and a move
+should cost one small block. Every game is traced on its own: the legal actions and the
+decoded actions of the game are kept alive until its snapshot, so the snapshot counts
+every block the engine allocated for them, next to the moves kept by the move_sheet.
+'''
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+import rlcard.games.butifarra
+from rlcard.games.butifarra.game import ButifarraGame
+from rlcard.games.butifarra.utils.action_event import ActionEvent
+
+ENGINE_DIR = os.path.dirname(rlcard.games.butifarra.__file__)
+ENGINE_FILES = ('judger.py', 'action_event.py', 'move.py', 'round.py')
+
+
+def play_game(game, rng, kept):
+    ''' Play a random game, keeping its legal and decoded actions in kept
+
+    Returns:
+        (int): The number of steps of the game
+    '''
+    game.init_game()
+    num_steps = 0
+    while not game.is_over():
+        legal_actions = game.judger.get_legal_actions()
+        action_id = legal_actions[rng.randint(len(legal_actions))].action_id
+        action = ActionEvent.from_action_id(action_id)
+        if kept is not None:
+            kept.append(legal_actions)
+            kept.append(action)
+        game.step(action)
+        num_steps += 1
+    return num_steps
+
+
+def engine_statistics(snapshot):
+    ''' Return the blocks and bytes allocated in each engine file, {file: [blocks, bytes]}
+    '''
+    statistics = {name: [0, 0] for name in ENGINE_FILES}
+    for statistic in snapshot.statistics('filename'):
+        filename = statistic.traceback[0].filename
+        name = os.path.basename(filename)
+        if name in statistics and filename.startswith(ENGINE_DIR):
+            statistics[name][0] += statistic.count
+            statistics[name][1] += statistic.size
+    return statistics
+
+
+def benchmark(num_games, seed):
+    game = ButifarraGame()
+    game.np_random.seed(seed)
+    rng = np.random.RandomState(seed)
+
+    totals = {name: [0, 0] for name in ENGINE_FILES}
+    num_steps = 0
+    for _ in range(num_games):
+        kept = []
+        tracemalloc.start()
+        num_steps += play_game(game, rng, kept)
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        for name, (count, size) in engine_statistics(snapshot).items():
+            totals[name][0] += count
+            totals[name][1] += size
+        del kept
+
+    print('{} games, {} steps, allocations kept alive until the end of each game:'.format(num_games, num_steps))
+    for name in ENGINE_FILES:
+        count, size = totals[name]
+        print('  {:16s} {:8.1f} blocks/game {:10.1f} bytes/game'.format(name, count / num_games, size / num_games))
+
+    # The same games without tracing
+    game.np_random.seed(seed)
+    rng = np.random.RandomState(seed)
+    start = time.perf_counter()
+    for _ in range(num_games):
+        play_game(game, rng, None)
+    print('{:.0f} steps/s without tracing'.format(num_steps / (time.perf_counter() - start)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Butifarra allocation benchmark in RLCard")
+    parser.add_argument(
+        '--num_games',
+        type=int,
+        default=10000,
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    args = parser.parse_args()
+
+    benchmark(args.num_games, args.seed)
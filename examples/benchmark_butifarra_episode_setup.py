@@ -0,0 +1,75 @@
+''' Measure the cost of setting up a Butifarra episode
+
+A ButifarraGame deals every new hand into the round of its last hand: the dealer
+reshuffles its deck lists, and the hands, tricks, card planes and logs are emptied in
+place. The benchmark times init_game with the round reused, and with the round dropped
+before each hand as it was before, which builds the round, its players, dealer, tray and
+card planes again. Both deal the same hands. The allocations of one setup are counted
+with tracemalloc.
+'''
+import argparse
+import time
+import tracemalloc
+
+from rlcard.games.butifarra.game import ButifarraGame
+
+
+def play_hands(game, num_games, reuse_round):
+    ''' Set up num_games hands, playing the bids and the first cards of each so that there is state to clear
+
+    Returns:
+        (float): The time spent in init_game, in seconds
+    '''
+    setup_time = 0.
+    for _ in range(num_games):
+        if not reuse_round:
+            game.round = None
+        start = time.perf_counter()
+        game.init_game()
+        setup_time += time.perf_counter() - start
+        for _ in range(8):
+            if game.is_over():
+                break
+            game.step(game.judger.get_legal_actions()[0])
+    return setup_time
+
+
+def count_setup_allocations(game, reuse_round):
+    ''' Return the blocks and bytes allocated by one init_game that are alive after it
+    '''
+    play_hands(game, 1, reuse_round)
+    if not reuse_round:
+        game.round = None
+    tracemalloc.start()
+    game.init_game()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    statistics = snapshot.statistics('filename')
+    return sum(statistic.count for statistic in statistics), sum(statistic.size for statistic in statistics)
+
+
+def benchmark(num_games, seed):
+    for reuse_round in [False, True]:
+        game = ButifarraGame()
+        game.np_random.seed(seed)
+        setup_time = play_hands(game, num_games, reuse_round)
+        blocks, size = count_setup_allocations(game, reuse_round)
+        print('{:14s} {:6.1f} us/setup {:6d} blocks {:8d} bytes allocated per setup'.format(
+            'reused round' if reuse_round else 'new round', setup_time / num_games * 1e6, blocks, size))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Butifarra episode setup benchmark in RLCard")
+    parser.add_argument(
+        '--num_games',
+        type=int,
+        default=20000,
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    args = parser.parse_args()
+
+    benchmark(args.num_games, args.seed)
@@ -0,0 +1,109 @@
+''' Benchmark the journaled step_back of limit and no limit holdem against deepcopy snapshots
+
+The games record per-action deltas (chips, pointers, raise counts, dealt cards) and
+undo them in step_back. This script walks the game tree depth first with step and
+step_back, as CFR does, once with the journal and once with the snapshots the games
+used to take (deepcopy of the round, dealer, public cards and players on every step).
+'''
+import argparse
+import time
+from copy import deepcopy
+
+import rlcard
+
+# The attributes the games used to deepcopy on every step
+SNAPSHOT_ATTRIBUTES = {
+    'limit-holdem': ('round', 'game_pointer', 'round_counter', 'dealer', 'public_cards', 'players',
+                     'history_raise_nums'),
+    'no-limit-holdem': ('round', 'game_pointer', 'round_counter', 'dealer', 'public_cards', 'players',
+                        'stage'),
+}
+
+
+class SnapshotStepBack(object):
+    ''' Step and step back a game by copying its state, as the games did before the journal
+    '''
+
+    def __init__(self, game, attributes):
+        self.game = game
+        self.attributes = attributes
+        self.snapshots = []
+
+    def step(self, action):
+        self.snapshots.append(deepcopy([getattr(self.game, name) for name in self.attributes]))
+        self.game.step(action)
+
+    def step_back(self):
+        for name, value in zip(self.attributes, self.snapshots.pop()):
+            setattr(self.game, name, value)
+
+
+class JournalStepBack(object):
+    ''' Step and step back a game with its own journal
+    '''
+
+    def __init__(self, game):
+        self.game = game
+
+    def step(self, action):
+        self.game.step(action)
+
+    def step_back(self):
+        self.game.step_back()
+
+
+def traverse(game, stepper, depth):
+    ''' Visit every node of the game tree down to depth with step and step_back
+
+    Returns:
+        (int): The number of visited nodes
+    '''
+    if depth == 0 or game.is_over():
+        return 1
+    num_nodes = 1
+    for action in game.get_legal_actions():
+        stepper.step(action)
+        num_nodes += traverse(game, stepper, depth - 1)
+        stepper.step_back()
+    return num_nodes
+
+
+def benchmark(env_name, depth, num_games, seed):
+    env = rlcard.make(env_name, config={'seed': seed, 'allow_step_back': True})
+    game = env.game
+    timings = {}
+    for mode in ('snapshot', 'journal'):
+        game.np_random.seed(seed)
+        num_nodes = 0
+        start = time.perf_counter()
+        for _ in range(num_games):
+            game.init_game()
+            if mode == 'snapshot':
+                game.allow_step_back = False
+                stepper = SnapshotStepBack(game, SNAPSHOT_ATTRIBUTES[env_name])
+            else:
+                game.allow_step_back = True
+                stepper = JournalStepBack(game)
+            num_nodes += traverse(game, stepper, depth)
+        timings[mode] = time.perf_counter() - start
+    print('{:16s} depth {:2d}  {:8d} nodes  snapshot {:7.3f}s  journal {:7.3f}s  speedup {:5.1f}x'.format(
+        env_name, depth, num_nodes, timings['snapshot'], timings['journal'],
+        timings['snapshot'] / timings['journal']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Journaled step_back benchmark in RLCard")
+    parser.add_argument(
+        '--num_games',
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    args = parser.parse_args()
+
+    benchmark('limit-holdem', 6, args.num_games, args.seed)
+    benchmark('no-limit-holdem', 5, args.num_games, args.seed)
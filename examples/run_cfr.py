@@ -1,4 +1,4 @@
-''' An example of solve Leduc Hold'em with CFR (chance sampling)
+''' An example of solve Leduc Hold'em with CFR (chance sampling) or Monte Carlo CFR
 '''
 import os
 import argparse
@@ -6,6 +6,9 @@ import argparse
 import rlcard
 from rlcard.agents import (
     CFRAgent,
+    ExternalSamplingCFRAgent,
+    OutcomeSamplingCFRAgent,
+    ParallelCFRAgent,
     RandomAgent,
 )
 from rlcard.utils import (
@@ -16,16 +19,16 @@ from rlcard.utils import (
 )
 
 def train(args):
-    # Make environments, CFR only supports Leduc Holdem
+    # Make environments, CFR needs an environment with step_back
     env = rlcard.make(
-        'leduc-holdem',
+        args.env,
         config={
             'seed': 0,
             'allow_step_back': True,
         }
     )
     eval_env = rlcard.make(
-        'leduc-holdem',
+        args.env,
         config={
             'seed': 0,
         }
@@ -35,13 +38,34 @@ def train(args):
     set_seed(args.seed)
 
     # Initilize CFR Agent
-    agent = CFRAgent(
-        env,
-        os.path.join(
-            args.log_dir,
-            'cfr_model',
-        ),
-    )
+    if args.algorithm == 'cfr':
+        agent = CFRAgent(
+            env,
+            os.path.join(
+                args.log_dir,
+                'cfr_model',
+            ),
+        )
+    elif args.algorithm == 'parallel':
+        agent = ParallelCFRAgent(
+            env,
+            os.path.join(
+                args.log_dir,
+                'cfr_model',
+            ),
+            num_workers=args.num_workers,
+            seed=args.seed,
+        )
+    else:
+        agent_class = ExternalSamplingCFRAgent if args.algorithm == 'external' else OutcomeSamplingCFRAgent
+        agent = agent_class(
+            env,
+            os.path.join(
+                args.log_dir,
+                'cfr_model',
+            ),
+            seed=args.seed,
+        )
     agent.load()  # If we have saved model, we first load the model
 
     # Evaluate CFR against random
@@ -68,11 +92,39 @@ def train(args):
 
         # Get the paths
         csv_path, fig_path = logger.csv_path, logger.fig_path
+    if args.algorithm == 'parallel':
+        agent.close()
     # Plot the learning curve
     plot_curve(csv_path, fig_path, 'cfr')
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser("CFR example in RLCard")
+    parser.add_argument(
+        '--env',
+        type=str,
+        default='leduc-holdem',
+        choices=[
+            'leduc-holdem',
+            'limit-holdem',
+            'no-limit-holdem',
+        ],
+    )
+    parser.add_argument(
+        '--algorithm',
+        type=str,
+        default='cfr',
+        choices=[
+            'cfr',
+            'external',
+            'outcome',
+            'parallel',
+        ],
+    )
+    parser.add_argument(
+        '--num_workers',
+        type=int,
+        default=None,
+    )
     parser.add_argument(
         '--seed',
         type=int,
@@ -1,19 +1,46 @@
-import subprocess
-import sys
-from distutils.version import LooseVersion
-
-reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-
-if 'torch' in installed_packages:
-    from rlcard.agents.dqn_agent import DQNAgent as DQNAgent
-    from rlcard.agents.nfsp_agent import NFSPAgent as NFSPAgent
-
-from rlcard.agents.cfr_agent import CFRAgent
-from rlcard.agents.human_agents.limit_holdem_human_agent import HumanAgent as LimitholdemHumanAgent
-from rlcard.agents.human_agents.nolimit_holdem_human_agent import HumanAgent as NolimitholdemHumanAgent
-from rlcard.agents.human_agents.leduc_holdem_human_agent import HumanAgent as LeducholdemHumanAgent
-from rlcard.agents.human_agents.blackjack_human_agent import HumanAgent as BlackjackHumanAgent
-from rlcard.agents.human_agents.uno_human_agent import HumanAgent as UnoHumanAgent
-from rlcard.agents.random_agent import RandomAgent
-from rlcard.agents.human_agents.butifarra_human_agent import HumanAgent as ButifarraHumanAgent
+''' The agents are imported on first access, so that importing rlcard.agents does not
+    load torch, or the modules of the agents that are not used
+'''
+import importlib
+import importlib.util
+
+# Exported name -> (module, attribute)
+_AGENTS = {
+    'CFRAgent': ('rlcard.agents.cfr_agent', 'CFRAgent'),
+    'ExternalSamplingCFRAgent': ('rlcard.agents.mccfr_agent', 'ExternalSamplingCFRAgent'),
+    'OutcomeSamplingCFRAgent': ('rlcard.agents.mccfr_agent', 'OutcomeSamplingCFRAgent'),
+    'ParallelCFRAgent': ('rlcard.agents.parallel_cfr_agent', 'ParallelCFRAgent'),
+    'LimitholdemHumanAgent': ('rlcard.agents.human_agents.limit_holdem_human_agent', 'HumanAgent'),
+    'NolimitholdemHumanAgent': ('rlcard.agents.human_agents.nolimit_holdem_human_agent', 'HumanAgent'),
+    'LeducholdemHumanAgent': ('rlcard.agents.human_agents.leduc_holdem_human_agent', 'HumanAgent'),
+    'BlackjackHumanAgent': ('rlcard.agents.human_agents.blackjack_human_agent', 'HumanAgent'),
+    'UnoHumanAgent': ('rlcard.agents.human_agents.uno_human_agent', 'HumanAgent'),
+    'RandomAgent': ('rlcard.agents.random_agent', 'RandomAgent'),
+    'ButifarraHumanAgent': ('rlcard.agents.human_agents.butifarra_human_agent', 'HumanAgent'),
+}
+
+# The agents that are only available when torch is installed
+_TORCH_AGENTS = {
+    'DQNAgent': ('rlcard.agents.dqn_agent', 'DQNAgent'),
+    'NFSPAgent': ('rlcard.agents.nfsp_agent', 'NFSPAgent'),
+}
+
+if importlib.util.find_spec('torch') is not None:
+    _AGENTS.update(_TORCH_AGENTS)
+
+__all__ = list(_AGENTS)
+
+
+def __getattr__(name):
+    if name not in _AGENTS:
+        if name in _TORCH_AGENTS:
+            raise AttributeError('{} requires torch, which is not installed'.format(name))
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    mod_name, attr_name = _AGENTS[name]
+    agent = getattr(importlib.import_module(mod_name), attr_name)
+    globals()[name] = agent
+    return agent
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
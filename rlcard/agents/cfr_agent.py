@@ -5,6 +5,7 @@ import os
 import pickle
 
 from rlcard.utils.utils import *
+from rlcard.agents.cfr_table import InfosetTable
 
 class CFRAgent():
     ''' Implement CFR (chance sampling) algorithm
@@ -20,15 +21,30 @@ class CFRAgent():
         self.env = env
         self.model_path = model_path
 
-        # A policy is a dict state_str -> action probabilities
-        self.policy = collections.defaultdict(list)
-        self.average_policy = collections.defaultdict(np.array)
-
-        # Regret is a dict state_str -> action regrets
-        self.regrets = collections.defaultdict(np.array)
+        # Every state_str is interned into a row of the table, which holds
+        # the policy, the average policy and the regrets of all the states
+        self.table = InfosetTable(self.env.num_actions)
 
         self.iteration = 0
 
+    @property
+    def policy(self):
+        ''' A dict state_str -> action probabilities
+        '''
+        return self.table.to_dict('policy')
+
+    @property
+    def average_policy(self):
+        ''' A dict state_str -> cumulative action probabilities
+        '''
+        return self.table.to_dict('average_policy')
+
+    @property
+    def regrets(self):
+        ''' A dict state_str -> action regrets
+        '''
+        return self.table.to_dict('regrets')
+
     def train(self):
         ''' Do one iteration of CFR
         '''
@@ -58,23 +74,22 @@ class CFRAgent():
 
         current_player = self.env.get_player_id()
 
-        action_utilities = {}
-        state_utility = np.zeros(self.env.num_players)
         obs, legal_actions = self.get_state(current_player)
-        action_probs = self.action_probs(obs, legal_actions, self.policy)
+        row = self.table.get_row(obs)
+        action_probs = self.action_probs(obs, legal_actions, self.table.policy)
+        legal_action_probs = action_probs[legal_actions]
+        action_utilities = np.zeros((len(legal_actions), self.env.num_players))
 
-        for action in legal_actions:
-            action_prob = action_probs[action]
+        for i, action in enumerate(legal_actions):
             new_probs = probs.copy()
-            new_probs[current_player] *= action_prob
+            new_probs[current_player] *= action_probs[action]
 
             # Keep traversing the child state
             self.env.step(action)
-            utility = self.traverse_tree(new_probs, player_id)
+            action_utilities[i] = self.traverse_tree(new_probs, player_id)
             self.env.step_back()
 
-            state_utility += action_prob * utility
-            action_utilities[action] = utility
+        state_utility = legal_action_probs.dot(action_utilities)
 
         if not current_player == player_id:
             return state_utility
@@ -85,41 +100,16 @@ class CFRAgent():
                                 np.prod(probs[current_player + 1:]))
         player_state_utility = state_utility[current_player]
 
-        if obs not in self.regrets:
-            self.regrets[obs] = np.zeros(self.env.num_actions)
-        if obs not in self.average_policy:
-            self.average_policy[obs] = np.zeros(self.env.num_actions)
-        for action in legal_actions:
-            action_prob = action_probs[action]
-            regret = counterfactual_prob * (action_utilities[action][current_player]
-                    - player_state_utility)
-            self.regrets[obs][action] += regret
-            self.average_policy[obs][action] += self.iteration * player_prob * action_prob
+        self.table.regrets[row, legal_actions] += counterfactual_prob * (action_utilities[:, current_player]
+                                                                         - player_state_utility)
+        self.table.average_policy[row, legal_actions] += self.iteration * player_prob * legal_action_probs
         return state_utility
 
     def update_policy(self):
-        ''' Update policy based on the current regrets
-        '''
-        for obs in self.regrets:
-            self.policy[obs] = self.regret_matching(obs)
-
-    def regret_matching(self, obs):
-        ''' Apply regret matching
-
-        Args:
-            obs (string): The state_str
+        ''' Update policy based on the current regrets, with regret matching
+            applied to all the states at once
         '''
-        regret = self.regrets[obs]
-        positive_regret_sum = sum([r for r in regret if r > 0])
-
-        action_probs = np.zeros(self.env.num_actions)
-        if positive_regret_sum > 0:
-            for action in range(self.env.num_actions):
-                action_probs[action] = max(0.0, regret[action] / positive_regret_sum)
-        else:
-            for action in range(self.env.num_actions):
-                action_probs[action] = 1.0 / self.env.num_actions
-        return action_probs
+        self.table.update_policy()
 
     def action_probs(self, obs, legal_actions, policy):
         ''' Obtain the action probabilities of the current state
@@ -127,19 +117,16 @@ class CFRAgent():
         Args:
             obs (str): state_str
             legal_actions (list): List of leagel actions
-            player_id (int): The current player
-            policy (dict): The used policy
+            policy (numpy.array): The used policy, self.table.policy or self.table.average_policy
 
         Returns:
-            (tuple) that contains:
-                action_probs(numpy.array): The action probabilities
-                legal_actions (list): Indices of legal actions
+            action_probs(numpy.array): The action probabilities
         '''
-        if obs not in policy.keys():
-            action_probs = np.array([1.0/self.env.num_actions for _ in range(self.env.num_actions)])
-            self.policy[obs] = action_probs
+        row = self.table.index.get(obs)
+        if row is None:
+            action_probs = np.full(self.env.num_actions, 1.0 / self.env.num_actions)
         else:
-            action_probs = policy[obs]
+            action_probs = policy[row]
         action_probs = remove_illegal(action_probs, legal_actions)
         return action_probs
 
@@ -153,7 +140,7 @@ class CFRAgent():
             action (int): Predicted action
             info (dict): A dictionary containing information
         '''
-        probs = self.action_probs(state['obs'].tostring(), list(state['legal_actions'].keys()), self.average_policy)
+        probs = self.action_probs(state['obs'].tobytes(), list(state['legal_actions'].keys()), self.table.average_policy)
         action = np.random.choice(len(probs), p=probs)
 
         info = {}
@@ -173,7 +160,7 @@ class CFRAgent():
                 legal_actions (list): Indices of legal actions
         '''
         state = self.env.get_state(player_id)
-        return state['obs'].tostring(), list(state['legal_actions'].keys())
+        return state['obs'].tobytes(), list(state['legal_actions'].keys())
 
     def save(self):
         ''' Save model
@@ -181,16 +168,18 @@ class CFRAgent():
         if not os.path.exists(self.model_path):
             os.makedirs(self.model_path)
 
+        policy, average_policy, regrets = self.table.to_dicts()
+
         policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'wb')
-        pickle.dump(self.policy, policy_file)
+        pickle.dump(policy, policy_file)
         policy_file.close()
 
         average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'wb')
-        pickle.dump(self.average_policy, average_policy_file)
+        pickle.dump(average_policy, average_policy_file)
         average_policy_file.close()
 
         regrets_file = open(os.path.join(self.model_path, 'regrets.pkl'),'wb')
-        pickle.dump(self.regrets, regrets_file)
+        pickle.dump(regrets, regrets_file)
         regrets_file.close()
 
         iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'wb')
@@ -204,17 +193,19 @@ class CFRAgent():
             return
 
         policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'rb')
-        self.policy = pickle.load(policy_file)
+        policy = pickle.load(policy_file)
         policy_file.close()
 
         average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'rb')
-        self.average_policy = pickle.load(average_policy_file)
+        average_policy = pickle.load(average_policy_file)
         average_policy_file.close()
 
         regrets_file = open(os.path.join(self.model_path, 'regrets.pkl'),'rb')
-        self.regrets = pickle.load(regrets_file)
+        regrets = pickle.load(regrets_file)
         regrets_file.close()
 
+        self.table = InfosetTable.from_dicts(self.env.num_actions, policy, average_policy, regrets)
+
         iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'rb')
         self.iteration = pickle.load(iteration_file)
         iteration_file.close()
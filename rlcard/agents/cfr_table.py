@@ -0,0 +1,141 @@
+''' Array-backed tables of a tabular CFR solver
+'''
+import collections
+
+import numpy as np
+
+
+class InfosetTable():
+    ''' Regrets, current policy and cumulative policy of every information set,
+        stored as rows of contiguous 2D arrays
+
+        Each information set key (the state_str of the agent) is interned into a dense
+        row id the first time it is seen, so a visit costs one dict lookup and the
+        per-iteration regret matching is a single vectorized pass over all the rows.
+    '''
+
+    def __init__(self, num_actions, capacity=1024):
+        ''' Initilize the table
+
+        Args:
+            num_actions (int): The number of actions of the game
+            capacity (int): The number of rows allocated up front. The table grows as needed.
+        '''
+        self.num_actions = num_actions
+        self.index = {}  # state_str -> row
+        self.keys = []  # row -> state_str
+        self.regrets = np.zeros((capacity, num_actions))
+        self.average_policy = np.zeros((capacity, num_actions))
+        self.policy = np.full((capacity, num_actions), 1.0 / num_actions)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, obs):
+        return obs in self.index
+
+    def get_row(self, obs):
+        ''' Return the row of an information set, adding it if it is new
+
+        Args:
+            obs (str): The state_str
+
+        Returns:
+            (int): The row of obs in the arrays
+        '''
+        row = self.index.get(obs)
+        if row is None:
+            row = len(self.keys)
+            if row == self.regrets.shape[0]:
+                self._grow()
+            self.index[obs] = row
+            self.keys.append(obs)
+        return row
+
+    def update_policy(self):
+        ''' Apply regret matching to every information set at once
+
+        The policy is proportional to the positive regrets, or uniform where no regret is positive.
+        '''
+        size = len(self.keys)
+        positive_regrets = np.maximum(self.regrets[:size], 0.0)
+        positive_regret_sums = positive_regrets.sum(axis=1, keepdims=True)
+        np.divide(positive_regrets, positive_regret_sums, out=positive_regrets, where=positive_regret_sums > 0)
+        positive_regrets[positive_regret_sums[:, 0] <= 0] = 1.0 / self.num_actions
+        self.policy[:size] = positive_regrets
+
+    def regret_matching(self, row):
+        ''' Apply regret matching to a single information set, without storing the result
+
+        Args:
+            row (int): The row of the information set
+
+        Returns:
+            (numpy.array): The action probabilities given by the current regrets of the row
+        '''
+        positive_regrets = np.maximum(self.regrets[row], 0.0)
+        positive_regret_sum = positive_regrets.sum()
+        if positive_regret_sum > 0:
+            return positive_regrets / positive_regret_sum
+        return np.full(self.num_actions, 1.0 / self.num_actions)
+
+    def to_dict(self, name):
+        ''' Export one array of the table in the dict format of CFRAgent.save
+
+        Args:
+            name (str): 'policy', 'average_policy' or 'regrets'
+
+        Returns:
+            (dict): state_str -> the row of the array for that state
+        '''
+        if name not in ('policy', 'average_policy', 'regrets'):
+            raise ValueError('Unknown array: {}'.format(name))
+        exported = collections.defaultdict(list if name == 'policy' else np.array)
+        array = getattr(self, name)
+        for row, obs in enumerate(self.keys):
+            exported[obs] = array[row].copy()
+        return exported
+
+    def to_dicts(self):
+        ''' Export the table in the dict format of CFRAgent.save
+
+        Returns:
+            (tuple) that contains:
+                policy (dict): state_str -> current action probabilities
+                average_policy (dict): state_str -> cumulative action probabilities
+                regrets (dict): state_str -> action regrets
+        '''
+        return self.to_dict('policy'), self.to_dict('average_policy'), self.to_dict('regrets')
+
+    @classmethod
+    def from_dicts(cls, num_actions, policy, average_policy, regrets):
+        ''' Build a table from the dicts written by CFRAgent.save
+
+        Args:
+            num_actions (int): The number of actions of the game
+            policy (dict): state_str -> current action probabilities
+            average_policy (dict): state_str -> cumulative action probabilities
+            regrets (dict): state_str -> action regrets
+
+        Returns:
+            (InfosetTable): The table holding the union of the information sets
+        '''
+        keys = list(dict.fromkeys(list(policy) + list(average_policy) + list(regrets)))
+        table = cls(num_actions, capacity=max(len(keys), 1))
+        for obs in keys:
+            row = table.get_row(obs)
+            if obs in policy:
+                table.policy[row] = policy[obs]
+            if obs in average_policy:
+                table.average_policy[row] = average_policy[obs]
+            if obs in regrets:
+                table.regrets[row] = regrets[obs]
+        return table
+
+    def _grow(self):
+        capacity = 2 * self.regrets.shape[0]
+        for name, fill_value in (('regrets', 0.0), ('average_policy', 0.0), ('policy', 1.0 / self.num_actions)):
+            old = getattr(self, name)
+            new = np.full((capacity, self.num_actions), fill_value)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
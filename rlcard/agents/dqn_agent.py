@@ -31,9 +31,8 @@ import numpy as np
 import torch
 import torch.nn as nn
 from collections import namedtuple
-from copy import deepcopy
 
-from rlcard.utils.utils import remove_illegal
+from rlcard.utils.utils import remove_illegal, unpack_obs
 
 Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'done', 'legal_actions'])
 
@@ -59,7 +58,13 @@ class DQNAgent(object):
                  learning_rate=0.00005,
                  device=None,
                  save_path=None,
-                 save_every=float('inf'),):
+                 save_every=float('inf'),
+                 prioritized_replay=False,
+                 priority_alpha=0.6,
+                 priority_beta_start=0.4,
+                 priority_beta_end=1.0,
+                 target_update_tau=None,
+                 replay_packbits=False,):
 
         '''
         Q-Learning algorithm for off-policy TD control using Function Approximation.
@@ -86,14 +91,28 @@ class DQNAgent(object):
             device (torch.device): whether to use the cpu or gpu
             save_path (str): The path to save the model checkpoints
             save_every (int): Save the model every X training steps
+            prioritized_replay (bool): Sample the replay memory in proportion to the TD errors
+              of the transitions instead of uniformly
+            priority_alpha (float): How much the TD errors count in the prioritized replay
+            priority_beta_start (float): The importance sampling correction of the prioritized
+              replay. It is annealed over epsilon_decay_steps training steps and this is the start value
+            priority_beta_end (float): The final importance sampling correction
+            target_update_tau (float): If set, the target estimator is moved towards the Q estimator
+              by this fraction after every training step (Polyak averaging) instead of being copied
+              every update_target_estimator_every steps
+            replay_packbits (bool): Store the states of the replay memory packed with np.packbits, for
+              binary observations. Observations packed by the env (obs_dtype 'packed') are unpacked
+              before they reach the networks either way.
         '''
         self.use_raw = False
         self.replay_memory_init_size = replay_memory_init_size
         self.update_target_estimator_every = update_target_estimator_every
+        self.target_update_tau = target_update_tau
         self.discount_factor = discount_factor
         self.epsilon_decay_steps = epsilon_decay_steps
         self.batch_size = batch_size
         self.num_actions = num_actions
+        self.state_size = None if state_shape is None else int(np.prod(state_shape))
         self.train_every = train_every
 
         # Torch device
@@ -116,9 +135,22 @@ class DQNAgent(object):
             mlp_layers=mlp_layers, device=self.device)
         self.target_estimator = Estimator(num_actions=num_actions, learning_rate=learning_rate, state_shape=state_shape, \
             mlp_layers=mlp_layers, device=self.device)
+        if target_update_tau is not None:
+            # Averaging starts from the Q estimator
+            self.target_estimator.sync_from(self.q_estimator)
 
         # Create replay memory
-        self.memory = Memory(replay_memory_size, batch_size)
+        self.prioritized_replay = prioritized_replay
+        self.priority_beta_start = priority_beta_start
+        self.priority_beta_end = priority_beta_end
+        self.replay_packbits = replay_packbits
+        if prioritized_replay:
+            self.memory = PrioritizedMemory(replay_memory_size, batch_size, num_actions, alpha=priority_alpha,
+                                            packbits=replay_packbits, state_size=self.state_size)
+            self.priority_betas = np.linspace(priority_beta_start, priority_beta_end, max(epsilon_decay_steps, 1))
+        else:
+            self.memory = Memory(replay_memory_size, batch_size, num_actions, packbits=replay_packbits,
+                                 state_size=self.state_size)
         
         # Checkpoint saving parameters
         self.save_path = save_path
@@ -139,6 +171,24 @@ class DQNAgent(object):
         if tmp>=0 and tmp%self.train_every == 0:
             self.train()
 
+    def feed_episode(self, episode):
+        ''' Store all the transitions of an episode in the replay buffer at once, then
+            train the agent as many times as feeding them one by one would have
+
+        Args:
+            episode (Episode): the columnar episode of the agent, see rlcard.utils.trajectory
+        '''
+        num_transitions = len(episode)
+        if num_transitions == 0:
+            return
+        self.memory.save_batch(episode.states, episode.actions, episode.rewards, episode.next_states,
+                               episode.next_legal_actions_masks, episode.dones)
+        for _ in range(num_transitions):
+            self.total_t += 1
+            tmp = self.total_t - self.replay_memory_init_size
+            if tmp>=0 and tmp%self.train_every == 0:
+                self.train()
+
     def step(self, state):
         ''' Predict the action for genrating training data but
             have the predictions disconnected from the computation graph
@@ -187,7 +237,7 @@ class DQNAgent(object):
             q_values (numpy.array): a 1-d array where each entry represents a Q value
         '''
         
-        q_values = self.q_estimator.predict_nograd(np.expand_dims(state['obs'], 0))[0]
+        q_values = self.q_estimator.predict_nograd(self._unpack_states(np.expand_dims(state['obs'], 0)))[0]
         masked_q_values = -np.inf * np.ones(self.num_actions, dtype=float)
         legal_actions = list(state['legal_actions'].keys())
         masked_q_values[legal_actions] = q_values[legal_actions]
@@ -200,32 +250,46 @@ class DQNAgent(object):
         Returns:
             loss (float): The loss of the current batch.
         '''
-        state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch = self.memory.sample()
+        if self.prioritized_replay:
+            beta = self.priority_betas[min(self.train_t, len(self.priority_betas)-1)]
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch, \
+                indices, weights = self.memory.sample(beta)
+        else:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch = self.memory.sample()
+            weights = None
+
+        # Move the batch to the device once, the targets are computed there
+        state_batch = torch.from_numpy(self._unpack_states(state_batch)).float().to(self.device)
+        action_batch = torch.from_numpy(action_batch).to(self.device)
+        next_state_batch = torch.from_numpy(self._unpack_states(next_state_batch)).float().to(self.device)
+        legal_actions_batch = torch.from_numpy(legal_actions_batch).to(self.device)
+        not_done_batch = torch.from_numpy(np.invert(done_batch)).float().to(self.device)
+        reward_batch = torch.from_numpy(reward_batch).to(self.device)
 
         # Calculate best next actions using Q-network (Double DQN)
-        q_values_next = self.q_estimator.predict_nograd(next_state_batch)
-        legal_actions = []
-        for b in range(self.batch_size):
-            legal_actions.extend([i + b * self.num_actions for i in legal_actions_batch[b]])
-        masked_q_values = -np.inf * np.ones(self.num_actions * self.batch_size, dtype=float)
-        masked_q_values[legal_actions] = q_values_next.flatten()[legal_actions]
-        masked_q_values = masked_q_values.reshape((self.batch_size, self.num_actions))
-        best_actions = np.argmax(masked_q_values, axis=1)
+        q_values_next = self.q_estimator.predict_tensor_nograd(next_state_batch)
+        best_actions = q_values_next.masked_fill(~legal_actions_batch, -np.inf).argmax(dim=1, keepdim=True)
 
         # Evaluate best next actions using Target-network (Double DQN)
-        q_values_next_target = self.target_estimator.predict_nograd(next_state_batch)
-        target_batch = reward_batch + np.invert(done_batch).astype(np.float32) * \
-            self.discount_factor * q_values_next_target[np.arange(self.batch_size), best_actions]
+        q_values_next_target = self.target_estimator.predict_tensor_nograd(next_state_batch)
+        target_batch = reward_batch + not_done_batch * self.discount_factor * \
+            q_values_next_target.gather(1, best_actions).squeeze(1)
 
         # Perform gradient descent update
-        state_batch = np.array(state_batch)
-
-        loss = self.q_estimator.update(state_batch, action_batch, target_batch)
+        if self.prioritized_replay:
+            # The priorities are set from the TD errors of the forward pass of the update
+            loss, td_errors = self.q_estimator.update(state_batch, action_batch, target_batch, weights,
+                                                      return_td_errors=True)
+            self.memory.update_priorities(indices, td_errors.cpu().numpy())
+        else:
+            loss = self.q_estimator.update(state_batch, action_batch, target_batch, weights)
         print('\rINFO - Step {}, rl-loss: {}'.format(self.total_t, loss), end='')
 
         # Update the target estimator
-        if self.train_t % self.update_target_estimator_every == 0:
-            self.target_estimator = deepcopy(self.q_estimator)
+        if self.target_update_tau is not None:
+            self.target_estimator.sync_from(self.q_estimator, self.target_update_tau)
+        elif self.train_t % self.update_target_estimator_every == 0:
+            self.target_estimator.sync_from(self.q_estimator)
             print("\nINFO - Copied model parameters to target network.")
 
         self.train_t += 1
@@ -237,6 +301,13 @@ class DQNAgent(object):
             print("\nINFO - Saved model checkpoint.")
 
 
+    def _unpack_states(self, states):
+        ''' Unpack a batch of observations packed by the env, if they are
+        '''
+        if self.state_size is not None and states[0].size != self.state_size:
+            return unpack_obs(states, self.state_size)
+        return states
+
     def feed_memory(self, state, action, reward, next_state, legal_actions, done):
         ''' Feed transition to memory
 
@@ -265,6 +336,9 @@ class DQNAgent(object):
         return {
             'agent_type': 'DQNAgent',
             'q_estimator': self.q_estimator.checkpoint_attributes(),
+            'target_qnet': self.target_estimator.qnet.state_dict(),
+            'target_update': 'hard' if self.target_update_tau is None else 'soft',
+            'target_update_tau': self.target_update_tau,
             'memory': self.memory.checkpoint_attributes(),
             'total_t': self.total_t,
             'train_t': self.train_t,
@@ -279,7 +353,11 @@ class DQNAgent(object):
             'train_every': self.train_every,
             'device': self.device,
             'save_path': self.save_path,
-            'save_every': self.save_every
+            'save_every': self.save_every,
+            'prioritized_replay': self.prioritized_replay,
+            'priority_beta_start': self.priority_beta_start,
+            'priority_beta_end': self.priority_beta_end,
+            'replay_packbits': self.replay_packbits,
         }
 
     @classmethod
@@ -309,14 +387,22 @@ class DQNAgent(object):
             device=checkpoint['device'],
             save_path=checkpoint['save_path'],
             save_every=checkpoint['save_every'],
+            prioritized_replay=checkpoint.get('prioritized_replay', False),
+            priority_beta_start=checkpoint.get('priority_beta_start', 0.4),
+            priority_beta_end=checkpoint.get('priority_beta_end', 1.0),
+            target_update_tau=checkpoint.get('target_update_tau'),
+            replay_packbits=checkpoint.get('replay_packbits', False),
         )
         
         agent_instance.total_t = checkpoint['total_t']
         agent_instance.train_t = checkpoint['train_t']
         
         agent_instance.q_estimator = Estimator.from_checkpoint(checkpoint['q_estimator'])
-        agent_instance.target_estimator = deepcopy(agent_instance.q_estimator)
-        agent_instance.memory = Memory.from_checkpoint(checkpoint['memory'])
+        agent_instance.target_estimator.sync_from(agent_instance.q_estimator)
+        if 'target_qnet' in checkpoint:
+            agent_instance.target_estimator.qnet.load_state_dict(checkpoint['target_qnet'])
+        memory_class = PrioritizedMemory if agent_instance.prioritized_replay else Memory
+        agent_instance.memory = memory_class.from_checkpoint(checkpoint['memory'])
 
         return agent_instance
                      
@@ -383,32 +469,48 @@ class Estimator(object):
           np.ndarray of shape (batch_size, NUM_VALID_ACTIONS) containing the estimated
           action values.
         '''
+        s = torch.from_numpy(s).float().to(self.device)
+        return self.predict_tensor_nograd(s).cpu().numpy()
+
+    def predict_tensor_nograd(self, s):
+        ''' Predicts action values of states already on the device, without
+            leaving it. It is used for the Double-DQN targets.
+
+        Args:
+          s (torch.Tensor): (batch, state_len) on the device of the estimator
+
+        Returns:
+          torch.Tensor of shape (batch_size, NUM_VALID_ACTIONS) containing the estimated
+          action values.
+        '''
         with torch.no_grad():
-            s = torch.from_numpy(s).float().to(self.device)
-            q_as = self.qnet(s).cpu().numpy()
-        return q_as
+            return self.qnet(s)
 
-    def update(self, s, a, y):
+    def update(self, s, a, y, weights=None, return_td_errors=False):
         ''' Updates the estimator towards the given targets.
             In this case y is the target-network estimated
             value of the Q-network optimal actions, which
             is labeled y in Algorithm 1 of Minh et al. (2015)
 
         Args:
-          s (np.ndarray): (batch, state_shape) state representation
-          a (np.ndarray): (batch,) integer sampled actions
-          y (np.ndarray): (batch,) value of optimal actions according to Q-target
+          s (np.ndarray or torch.Tensor): (batch, state_shape) state representation
+          a (np.ndarray or torch.Tensor): (batch,) integer sampled actions
+          y (np.ndarray or torch.Tensor): (batch,) value of optimal actions according to Q-target
+          weights (np.ndarray): (batch,) importance sampling weights of the squared errors,
+            None to weight the batch uniformly
+          return_td_errors (boolean): True to also return the TD errors of the batch
 
         Returns:
-          The calculated loss on the batch.
+          The calculated loss on the batch, and if return_td_errors is set, the
+          (batch,) tensor of the TD errors Q(s, a) - y before the update.
         '''
         self.optimizer.zero_grad()
 
         self.qnet.train()
 
-        s = torch.from_numpy(s).float().to(self.device)
-        a = torch.from_numpy(a).long().to(self.device)
-        y = torch.from_numpy(y).float().to(self.device)
+        s = torch.as_tensor(s, device=self.device).float()
+        a = torch.as_tensor(a, device=self.device).long()
+        y = torch.as_tensor(y, device=self.device).float()
 
         # (batch, state_shape) -> (batch, num_actions)
         q_as = self.qnet(s)
@@ -417,15 +519,49 @@ class Estimator(object):
         Q = torch.gather(q_as, dim=-1, index=a.unsqueeze(-1)).squeeze(-1)
 
         # update model
-        batch_loss = self.mse_loss(Q, y)
+        if weights is None:
+            batch_loss = self.mse_loss(Q, y)
+        else:
+            weights = torch.from_numpy(weights).float().to(self.device)
+            batch_loss = torch.mean(weights * (Q - y) ** 2)
         batch_loss.backward()
         self.optimizer.step()
         batch_loss = batch_loss.item()
 
         self.qnet.eval()
 
+        if return_td_errors:
+            return batch_loss, (Q - y).detach()
         return batch_loss
     
+    def sync_from(self, estimator, tau=None):
+        ''' Copy the network of another estimator in place, without reallocating
+            the parameters or the optimizer state
+
+        Args:
+          estimator (Estimator): the estimator to copy, with the same architecture
+          tau (float): if set, move the parameters towards the ones of estimator by
+            this fraction instead of copying them (Polyak averaging)
+        '''
+        params = list(self.qnet.parameters())
+        source_params = list(estimator.qnet.parameters())
+        with torch.no_grad():
+            if hasattr(torch, '_foreach_copy_'):
+                # One fused call per parameter group, on torch >= 2.1
+                if tau is None:
+                    torch._foreach_copy_(params, source_params)
+                else:
+                    torch._foreach_lerp_(params, source_params, tau)
+            else:
+                for param, source_param in zip(params, source_params):
+                    if tau is None:
+                        param.copy_(source_param)
+                    else:
+                        param.lerp_(source_param, tau)
+            # The batch norm statistics are copied in both modes
+            for buffer, source_buffer in zip(self.qnet.buffers(), estimator.qnet.buffers()):
+                buffer.copy_(source_buffer)
+
     def checkpoint_attributes(self):
         ''' Return the attributes needed to restore the model from a checkpoint
         '''
@@ -495,16 +631,46 @@ class EstimatorNetwork(nn.Module):
 
 class Memory(object):
     ''' Memory for saving transitions
+
+        A ring buffer over preallocated arrays: state, action, reward, next_state,
+        done and the legal actions of next_state as a boolean mask of width num_actions.
+        Saving overwrites the oldest transition in O(1) once the memory is full and
+        sampling gathers a batch with one fancy index per array. The arrays are
+        allocated on the first save, when the shape and dtype of the states are known.
+
+        With packbits, the states are binary observations stored as the bits of their
+        flattened values, 8 per byte, and the sampled batches are unpacked to uint8
+        rows of state_size zeros and ones. States packed by the env with
+        obs_dtype 'packed' are stored as they are.
     '''
 
-    def __init__(self, memory_size, batch_size):
+    def __init__(self, memory_size, batch_size, num_actions=None, packbits=False, state_size=None):
         ''' Initialize
         Args:
             memory_size (int): the size of the memroy buffer
+            batch_size (int): the size of the sampled batches
+            num_actions (int): the width of the legal actions mask. If None, it is
+              inferred from the largest legal action of the first transition.
+            packbits (bool): whether to store the states packed with np.packbits
+            state_size (int): the number of values of a state. If None, it is inferred
+              from the first state, which must then not be packed already.
         '''
         self.memory_size = memory_size
         self.batch_size = batch_size
-        self.memory = []
+        self.num_actions = num_actions
+        self.packbits = packbits
+        self.state_size = state_size
+        self.position = 0  # where the next transition is written
+        self.size = 0  # the number of stored transitions
+        self.states = None
+        self.actions = None
+        self.rewards = None
+        self.next_states = None
+        self.dones = None
+        self.legal_actions_masks = None
+
+    def __len__(self):
+        return self.size
 
     def save(self, state, action, reward, next_state, legal_actions, done):
         ''' Save transition into memory
@@ -517,35 +683,124 @@ class Memory(object):
             legal_actions (list): the legal actions of the next state
             done (boolean): whether the episode is finished
         '''
-        if len(self.memory) == self.memory_size:
-            self.memory.pop(0)
-        transition = Transition(state, action, reward, next_state, done, legal_actions)
-        self.memory.append(transition)
+        if self.memory_size <= 0:
+            return
+        if self.states is None:
+            self._allocate(np.asarray(state), legal_actions)
+        if self.packbits:
+            state = self._pack(np.asarray(state)[np.newaxis])[0]
+            next_state = self._pack(np.asarray(next_state)[np.newaxis])[0]
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.legal_actions_masks[i] = False
+        self.legal_actions_masks[i, legal_actions] = True
+        self.position = (i + 1) % self.memory_size
+        self.size = min(self.size + 1, self.memory_size)
+
+    def save_batch(self, states, actions, rewards, next_states, legal_actions_masks, dones):
+        ''' Save consecutive transitions into memory with one write per array
+
+        Args:
+            states (numpy.array): (n, state_shape) the current states
+            actions (numpy.array): (n,) the performed action IDs
+            rewards (numpy.array): (n,) the rewards received
+            next_states (numpy.array): (n, state_shape) the next states after performing the actions
+            legal_actions_masks (numpy.array): (n, num_actions) the legal actions of the next states
+            dones (numpy.array): (n,) whether the episode is finished
+
+        Returns:
+            (numpy.array): the positions the transitions were written to
+        '''
+        num_transitions = len(actions)
+        if self.memory_size <= 0 or num_transitions == 0:
+            return np.zeros(0, dtype=np.int64)
+        if self.states is None:
+            self._allocate(np.asarray(states[0]), [legal_actions_masks.shape[1] - 1])
+        if self.packbits:
+            states = self._pack(states)
+            next_states = self._pack(next_states)
+        # Only the last memory_size transitions survive
+        skipped = max(num_transitions - self.memory_size, 0)
+        indices = (self.position + np.arange(skipped, num_transitions)) % self.memory_size
+        self.states[indices] = states[skipped:]
+        self.actions[indices] = actions[skipped:]
+        self.rewards[indices] = rewards[skipped:]
+        self.next_states[indices] = next_states[skipped:]
+        self.dones[indices] = dones[skipped:]
+        width = min(self.num_actions, legal_actions_masks.shape[1])
+        self.legal_actions_masks[indices] = False
+        self.legal_actions_masks[indices, :width] = legal_actions_masks[skipped:, :width]
+        self.position = (self.position + num_transitions) % self.memory_size
+        self.size = min(self.size + num_transitions, self.memory_size)
+        return indices
 
     def sample(self):
         ''' Sample a minibatch from the replay memory
 
         Returns:
-            state_batch (list): a batch of states
-            action_batch (list): a batch of actions
-            reward_batch (list): a batch of rewards
-            next_state_batch (list): a batch of states
-            done_batch (list): a batch of dones
+            state_batch (numpy.array): a batch of states
+            action_batch (numpy.array): a batch of actions
+            reward_batch (numpy.array): a batch of rewards
+            next_state_batch (numpy.array): a batch of states
+            done_batch (numpy.array): a batch of dones
+            legal_actions_batch (numpy.array): a batch of legal actions masks, (batch_size, num_actions)
         '''
-        samples = random.sample(self.memory, self.batch_size)
-        samples = tuple(zip(*samples))
-        return tuple(map(np.array, samples[:-1])) + (samples[-1],)
+        indices = random.sample(range(self.size), self.batch_size)
+        return self._unpack(self.states[indices]), self.actions[indices], self.rewards[indices], \
+            self._unpack(self.next_states[indices]), self.dones[indices], self.legal_actions_masks[indices]
+
+    def _allocate(self, state, legal_actions):
+        if self.num_actions is None:
+            self.num_actions = max(legal_actions) + 1
+        if self.packbits:
+            if self.state_size is None:
+                self.state_size = state.size
+            state = np.zeros((self.state_size + 7) // 8, dtype=np.uint8)
+        self.states = np.zeros((self.memory_size,) + state.shape, dtype=state.dtype)
+        self.actions = np.zeros(self.memory_size, dtype=np.int64)
+        self.rewards = np.zeros(self.memory_size, dtype=np.float32)
+        self.next_states = np.zeros((self.memory_size,) + state.shape, dtype=state.dtype)
+        self.dones = np.zeros(self.memory_size, dtype=bool)
+        self.legal_actions_masks = np.zeros((self.memory_size, self.num_actions), dtype=bool)
+
+    def _pack(self, states):
+        states = np.asarray(states).reshape(len(states), -1)
+        if states.shape[1] == self.state_size:
+            return np.packbits(states != 0, axis=1)
+        if states.dtype == np.uint8 and states.shape[1] == self.states.shape[1]:
+            # Already packed by the env
+            return states
+        raise ValueError('Expected states of {} values, got {}'.format(self.state_size, states.shape[1]))
+
+    def _unpack(self, states):
+        if self.packbits:
+            return unpack_obs(states, self.state_size)
+        return states
 
     def checkpoint_attributes(self):
         ''' Returns the attributes that need to be checkpointed
+
+        The arrays are written as they are, trimmed to the stored transitions.
         '''
-        
+        arrays = {}
+        if self.states is not None:
+            for name in ('states', 'actions', 'rewards', 'next_states', 'dones', 'legal_actions_masks'):
+                arrays[name] = getattr(self, name)[:self.size]
         return {
             'memory_size': self.memory_size,
             'batch_size': self.batch_size,
-            'memory': self.memory
+            'num_actions': self.num_actions,
+            'packbits': self.packbits,
+            'state_size': self.state_size,
+            'position': self.position,
+            'size': self.size,
+            'arrays': arrays,
         }
-            
+
     @classmethod
     def from_checkpoint(cls, checkpoint):
         ''' 
@@ -558,6 +813,208 @@ class Memory(object):
             instance (Memory): the restored instance
         '''
         
-        instance = cls(checkpoint['memory_size'], checkpoint['batch_size'])
-        instance.memory = checkpoint['memory']
+        instance = cls(checkpoint['memory_size'], checkpoint['batch_size'], checkpoint.get('num_actions'),
+                       packbits=checkpoint.get('packbits', False), state_size=checkpoint.get('state_size'))
+        if 'memory' in checkpoint:
+            # Checkpoints written before the ring buffer hold a list of Transitions
+            instance._save_transitions(checkpoint['memory'])
+            return instance
+        arrays = checkpoint['arrays']
+        if arrays:
+            instance._allocate(arrays['states'][0], [instance.num_actions - 1])
+            for name, array in arrays.items():
+                getattr(instance, name)[:len(array)] = array
+        instance.position = checkpoint['position']
+        instance.size = checkpoint['size']
+        return instance
+
+    def __setstate__(self, state):
+        ''' Unpickle, converting a memory pickled before the ring buffer
+        '''
+        if 'memory' in state:
+            self.__init__(state['memory_size'], state['batch_size'])
+            self._save_transitions(state['memory'])
+        else:
+            self.__dict__.update(state)
+
+    def _save_transitions(self, transitions):
+        for transition in transitions:
+            self.save(transition.state, transition.action, transition.reward, transition.next_state,
+                      transition.legal_actions, transition.done)
+
+
+class SumTree(object):
+    ''' A binary tree over an array where every node holds the sum of its children
+
+        The leaves are the priorities of the transitions, so the root is their total.
+        Updating a batch of leaves and finding the leaves of a batch of prefix sums
+        both walk the tree level by level, O(batch_size * log(capacity)).
+    '''
+
+    def __init__(self, capacity):
+        ''' Initialize
+        Args:
+            capacity (int): the number of leaves
+        '''
+        self.capacity = capacity
+        self.depth = max(int(np.ceil(np.log2(max(capacity, 1)))), 0)
+        self.num_leaves = 1 << self.depth
+        # Node i has children 2i and 2i+1, the root is node 1 and the leaves start at num_leaves
+        self.tree = np.zeros(2 * self.num_leaves)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def get(self, indices):
+        ''' Return the priorities of the leaves at indices
+        '''
+        return self.tree[self.num_leaves + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        ''' Set the priorities of the leaves at indices and update their ancestors
+
+        Args:
+            indices (numpy.array): the leaves to update
+            priorities (numpy.array): the new priorities
+        '''
+        nodes = self.num_leaves + np.asarray(indices)
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        ''' Find the leaves where the running sum of the priorities reaches values
+
+        Args:
+            values (numpy.array): prefix sums in [0, total)
+
+        Returns:
+            (numpy.array): the indices of the leaves
+        '''
+        values = np.array(values, dtype=float)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sums = self.tree[left]
+            go_right = values >= left_sums
+            values -= np.where(go_right, left_sums, 0.0)
+            nodes = left + go_right
+        return nodes - self.num_leaves
+
+
+class PrioritizedMemory(Memory):
+    ''' Memory sampling the transitions in proportion to their priorities (Schaul et al., 2016)
+
+        The priority of a transition is (|TD error| + epsilon) ** alpha. New transitions
+        get the largest priority seen so far, so they are replayed at least once.
+        The batches are drawn by stratified sampling on a SumTree and come with the
+        importance sampling weights that correct the bias of the prioritized sampling,
+        normalized by the largest weight of the batch.
+    '''
+
+    def __init__(self, memory_size, batch_size, num_actions=None, alpha=0.6, epsilon=1e-6, packbits=False,
+                 state_size=None):
+        ''' Initialize
+        Args:
+            memory_size (int): the size of the memroy buffer
+            batch_size (int): the size of the sampled batches
+            num_actions (int): the width of the legal actions mask
+            alpha (float): how much the priorities count, 0 is uniform sampling
+            epsilon (float): added to the TD errors so that no transition has zero priority
+            packbits (bool): whether to store the states packed with np.packbits
+            state_size (int): the number of values of a state
+        '''
+        super().__init__(memory_size, batch_size, num_actions, packbits=packbits, state_size=state_size)
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.sum_tree = SumTree(memory_size)
+
+    def save(self, state, action, reward, next_state, legal_actions, done):
+        ''' Save transition into memory, with the largest priority
+        '''
+        index = self.position
+        super().save(state, action, reward, next_state, legal_actions, done)
+        if self.memory_size > 0:
+            self.sum_tree.update([index], [self.max_priority])
+
+    def save_batch(self, states, actions, rewards, next_states, legal_actions_masks, dones):
+        ''' Save consecutive transitions into memory, with the largest priority
+        '''
+        indices = super().save_batch(states, actions, rewards, next_states, legal_actions_masks, dones)
+        self.sum_tree.update(indices, np.full(len(indices), self.max_priority))
+        return indices
+
+    def sample(self, beta=0.4):
+        ''' Sample a minibatch in proportion to the priorities
+
+        Args:
+            beta (float): how much the importance sampling weights correct the bias, 1 is fully
+
+        Returns:
+            state_batch (numpy.array): a batch of states
+            action_batch (numpy.array): a batch of actions
+            reward_batch (numpy.array): a batch of rewards
+            next_state_batch (numpy.array): a batch of states
+            done_batch (numpy.array): a batch of dones
+            legal_actions_batch (numpy.array): a batch of legal actions masks, (batch_size, num_actions)
+            indices (numpy.array): the positions of the transitions, for update_priorities
+            weights (numpy.array): the importance sampling weights of the transitions
+        '''
+        # One uniform draw in each of batch_size equal segments of the total priority
+        segment = self.sum_tree.total / self.batch_size
+        values = (np.arange(self.batch_size) + np.random.uniform(size=self.batch_size)) * segment
+        indices = np.minimum(self.sum_tree.find(values), self.size - 1)
+
+        probs = self.sum_tree.get(indices) / self.sum_tree.total
+        weights = (self.size * probs) ** (-beta)
+        weights = (weights / weights.max()).astype(np.float32)
+        return self._unpack(self.states[indices]), self.actions[indices], self.rewards[indices], \
+            self._unpack(self.next_states[indices]), self.dones[indices], self.legal_actions_masks[indices], \
+            indices, weights
+
+    def update_priorities(self, indices, td_errors):
+        ''' Set the priorities of sampled transitions from their new TD errors
+
+        Args:
+            indices (numpy.array): the positions returned by sample
+            td_errors (numpy.array): the TD errors of the transitions
+        '''
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.sum_tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, priorities.max())
+
+    def checkpoint_attributes(self):
+        ''' Returns the attributes that need to be checkpointed, with the priorities
+        '''
+        attributes = super().checkpoint_attributes()
+        attributes['alpha'] = self.alpha
+        attributes['epsilon'] = self.epsilon
+        attributes['max_priority'] = self.max_priority
+        attributes['priorities'] = self.sum_tree.get(np.arange(self.size))
+        return attributes
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint):
+        ''' 
+        Restores the attributes from the checkpoint. A checkpoint of a Memory
+        restores with the default alpha and uniform priorities.
+        
+        Args:
+            checkpoint (dict): the checkpoint dictionary
+            
+        Returns:
+            instance (PrioritizedMemory): the restored instance
+        '''
+        instance = super().from_checkpoint(checkpoint)
+        instance.alpha = checkpoint.get('alpha', instance.alpha)
+        instance.epsilon = checkpoint.get('epsilon', instance.epsilon)
+        if 'priorities' in checkpoint:
+            instance.max_priority = checkpoint['max_priority']
+            priorities = checkpoint['priorities']
+        else:
+            priorities = np.full(instance.size, instance.max_priority)
+        instance.sum_tree.update(np.arange(len(priorities)), priorities)
         return instance
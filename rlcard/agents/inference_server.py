@@ -0,0 +1,252 @@
+''' Batched inference for self-play actors
+
+The actors send their states to a server hosted by the process that owns the
+networks, which answers them with one forward pass per micro-batch.
+'''
+import itertools
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+
+import numpy as np
+import torch
+
+from rlcard.agents.dqn_agent import Estimator, EstimatorNetwork
+
+
+class InferenceServer(object):
+    ''' Serve the forward passes of some networks to many clients
+
+        The server runs in a thread of the process that owns the networks. The
+        requests of all the clients are put on one queue. The server waits for the
+        first request, collects the others until max_batch_size rows are pending
+        or max_latency seconds have passed, and runs one forward pass per network
+        over the rows of the micro-batch. Then it scatters the output rows back
+        to the response queue of each client. If a forward pass fails, its exception
+        is sent to the clients of the requests of that network instead, and raised
+        by their predict.
+
+        The clients must be created with `client` before the worker processes are
+        started, and passed to them as arguments, as the queues can only be shared
+        through inheritance.
+    '''
+
+    def __init__(self, model, max_batch_size=256, max_latency=0.002, context=None):
+        ''' Initialize the server
+
+        Args:
+            model: The networks to serve. An Estimator or EstimatorNetwork is served
+                as network 0. The DMCNet of player i of a DMCModel is served as network i.
+            max_batch_size (int): The number of rows after which a micro-batch is run
+            max_latency (float): The time in seconds a micro-batch waits for more requests
+            context: The multiprocessing context of the queues, the default context if None
+        '''
+        self.networks = self._get_networks(model)
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.context = context or multiprocessing.get_context()
+
+        self.request_queue = self.context.Queue()
+        self.response_queues = []
+        self.num_batches = 0
+        self.num_requests = 0
+        self._thread = None
+
+    def client(self):
+        ''' Create a client with its own response queue
+
+        Returns:
+            (InferenceClient): The client
+        '''
+        response_queue = self.context.Queue()
+        self.response_queues.append(response_queue)
+        return InferenceClient(len(self.response_queues) - 1, self.request_queue, response_queue)
+
+    def start(self):
+        ''' Start serving in a thread
+        '''
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.serve, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        ''' Stop the thread once the pending requests are answered
+        '''
+        if self._thread is not None:
+            self.request_queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def serve(self):
+        ''' Answer micro-batches of requests until stop is called
+        '''
+        while True:
+            request = self.request_queue.get()
+            if request is None:
+                return
+            requests = [request]
+            num_rows = _num_rows(request)
+            deadline = time.monotonic() + self.max_latency
+            stop = False
+            while num_rows < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    request = self.request_queue.get(timeout=remaining) if remaining > 0 \
+                        else self.request_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                requests.append(request)
+                num_rows += _num_rows(request)
+            self.serve_batch(requests)
+            if stop:
+                return
+
+    def serve_batch(self, requests):
+        ''' Run one forward pass per network over a micro-batch and answer its requests
+
+        Args:
+            requests (list): (client_id, request_id, network_id, inputs) tuples
+        '''
+        by_network = {}
+        for request in requests:
+            by_network.setdefault(request[2], []).append(request)
+        for network_id, network_requests in by_network.items():
+            try:
+                network = self.networks[network_id]
+                device = next(network.parameters()).device
+                num_inputs = len(network_requests[0][3])
+                inputs = [torch.from_numpy(np.concatenate([request[3][i] for request in network_requests])).float().to(device)
+                          for i in range(num_inputs)]
+                with torch.no_grad():
+                    outputs = network(*inputs).cpu().numpy()
+                sizes = [len(request[3][0]) for request in network_requests]
+                responses = [(request, output, None)
+                             for request, output in zip(network_requests, np.split(outputs, np.cumsum(sizes)[:-1]))]
+            except Exception as error:
+                error = _picklable(error)
+                responses = [(request, None, error) for request in network_requests]
+            for request, output, error in responses:
+                client_id, request_id = request[0], request[1]
+                self.response_queues[client_id].put((request_id, output, error))
+        self.num_batches += 1
+        self.num_requests += len(requests)
+
+    @staticmethod
+    def _get_networks(model):
+        if isinstance(model, Estimator):
+            return {0: model.qnet}
+        if isinstance(model, EstimatorNetwork):
+            return {0: model}
+        # DMCModel and DMCAgent are matched by their interface, as importing
+        # rlcard.agents.dmc_agent pulls in the dependencies of its trainer
+        if hasattr(model, 'get_agents'):
+            return {player_id: agent.net for player_id, agent in enumerate(model.get_agents())}
+        if isinstance(getattr(model, 'net', None), torch.nn.Module):
+            return {0: model.net}
+        raise ValueError('Cannot serve a {}'.format(type(model).__name__))
+
+
+def _num_rows(request):
+    try:
+        return len(request[3][0])
+    except (IndexError, TypeError):
+        # A malformed request, which fails in serve_batch
+        return 1
+
+
+def _picklable(error):
+    ''' Return the error, or a RuntimeError describing it if it cannot go through a queue
+    '''
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError('{}: {}'.format(type(error).__name__, error))
+
+
+class InferenceClient(object):
+    ''' The handle of an actor on an InferenceServer
+    '''
+
+    def __init__(self, client_id, request_queue, response_queue):
+        self.client_id = client_id
+        self.request_queue = request_queue
+        self.response_queue = response_queue
+        self._request_ids = itertools.count()
+
+    def predict(self, inputs, network_id=0, timeout=None):
+        ''' Run a network of the server on some rows and wait for the output
+
+        Args:
+            inputs (list): The numpy arrays given to the network, with the rows on the first axis
+            network_id (int): The network to run
+            timeout (float): The time in seconds to wait for the output, None to wait as long as needed
+
+        Returns:
+            (numpy.array): The output rows of the network
+
+        Raises:
+            TimeoutError: if the output did not come within timeout
+            Exception: the exception raised by the forward pass on the server
+        '''
+        request_id = next(self._request_ids)
+        self.request_queue.put((self.client_id, request_id, network_id, [np.asarray(x) for x in inputs]))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                response_id, output, error = self.response_queue.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError('No response to request {} within {} seconds'.format(request_id, timeout)) from None
+            # Skip the late responses to requests that timed out
+            if response_id < request_id:
+                continue
+            if response_id != request_id:
+                raise RuntimeError('Expected the response to request {}, got {}'.format(request_id, response_id))
+            if error is not None:
+                raise error
+            return output
+
+    def network(self, network_id=0):
+        ''' Return a stand-in for a network of the server
+
+        It can replace the qnet of an Estimator or the net of a DMCAgent,
+        as long as their device is the cpu:
+
+            agent.q_estimator.qnet = client.network()
+            dmc_model.get_agent(player_id).net = client.network(player_id)
+
+        Args:
+            network_id (int): The network of the server
+
+        Returns:
+            (RemoteNetwork): The stand-in
+        '''
+        return RemoteNetwork(self, network_id)
+
+
+class RemoteNetwork(object):
+    ''' Forwards the calls of a network to an InferenceServer
+    '''
+
+    def __init__(self, client, network_id):
+        self.client = client
+        self.network_id = network_id
+
+    def __call__(self, *inputs):
+        output = self.client.predict([x.detach().cpu().numpy() for x in inputs], self.network_id)
+        return torch.from_numpy(output)
+
+    def forward(self, *inputs):
+        return self(*inputs)
+
+    def eval(self):
+        return self
+
+    def train(self, mode=True):
+        raise RuntimeError('A RemoteNetwork cannot be trained')
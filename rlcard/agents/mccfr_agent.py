@@ -0,0 +1,187 @@
+''' Monte Carlo CFR agents: external sampling and outcome sampling
+'''
+import numpy as np
+
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.utils import seeding
+from rlcard.utils.utils import remove_illegal
+
+
+class MCCFRAgent(CFRAgent):
+    ''' Base class of the Monte Carlo CFR agents
+
+        The agents only traverse a sampled part of the game tree on each iteration,
+        so an iteration stays cheap on games where the full-width traversal of
+        CFRAgent is intractable. They share the table, eval_step and the save/load
+        format of CFRAgent. The current policy of a state is computed from its
+        regrets when the state is visited, and the policy table is only refreshed
+        on save.
+    '''
+
+    def __init__(self, env, model_path='./mccfr_model', save_every=None, seed=None):
+        ''' Initilize Agent
+
+        Args:
+            env (Env): Env class, created with allow_step_back=True
+            model_path (str): The directory of the checkpoints
+            save_every (int): Save a checkpoint every save_every iterations. None to only save on demand.
+            seed (int): The seed of the sampling of the actions
+        '''
+        super().__init__(env, model_path=model_path)
+        self.save_every = save_every
+        self.np_random, _ = seeding.np_random(seed)
+
+    def train(self):
+        ''' Do one iteration of MCCFR: one sampled traversal for each player
+        '''
+        self.iteration += 1
+        for player_id in range(self.env.num_players):
+            self.env.reset()
+            self.traverse_player(player_id)
+
+        if self.save_every and self.iteration % self.save_every == 0:
+            self.save()
+
+    def traverse_player(self, player_id):
+        ''' Do the sampled traversal that updates the regrets of player_id
+
+        Args:
+            player_id (int): The player to update the value
+        '''
+        raise NotImplementedError
+
+    def current_policy(self, row, legal_actions):
+        ''' Return the regret matching policy of a state over its legal actions
+
+        Args:
+            row (int): The row of the state in the table
+            legal_actions (list): Indices of legal actions
+        '''
+        return remove_illegal(self.table.regret_matching(row), legal_actions)
+
+    def save(self):
+        ''' Save model, with the policy table refreshed from the regrets
+        '''
+        self.table.update_policy()
+        super().save()
+
+
+class ExternalSamplingCFRAgent(MCCFRAgent):
+    ''' Implement external sampling MCCFR
+
+        The actions of the traversing player are all explored, while the actions of
+        the other players are sampled from their current policy. Chance is sampled
+        by the environment.
+    '''
+
+    def traverse_player(self, player_id):
+        self.traverse_tree(player_id)
+
+    def traverse_tree(self, player_id):
+        ''' Traverse the sampled game tree, update the regrets
+
+        Args:
+            player_id: The player to update the value
+
+        Returns:
+            (float): The sampled utility of player_id
+        '''
+        if self.env.is_over():
+            return self.env.get_payoffs()[player_id]
+
+        current_player = self.env.get_player_id()
+        obs, legal_actions = self.get_state(current_player)
+        row = self.table.get_row(obs)
+        action_probs = self.current_policy(row, legal_actions)
+
+        if not current_player == player_id:
+            # Sample one action of the other players, and accumulate their average policy
+            self.table.average_policy[row, legal_actions] += action_probs[legal_actions]
+            action = self.np_random.choice(len(action_probs), p=action_probs)
+            self.env.step(action)
+            utility = self.traverse_tree(player_id)
+            self.env.step_back()
+            return utility
+
+        action_utilities = np.zeros(len(legal_actions))
+        for i, action in enumerate(legal_actions):
+            self.env.step(action)
+            action_utilities[i] = self.traverse_tree(player_id)
+            self.env.step_back()
+
+        state_utility = action_probs[legal_actions].dot(action_utilities)
+        self.table.regrets[row, legal_actions] += action_utilities - state_utility
+        return state_utility
+
+
+class OutcomeSamplingCFRAgent(MCCFRAgent):
+    ''' Implement outcome sampling MCCFR
+
+        A single trajectory is sampled on each traversal. The traversing player
+        samples from its current policy mixed with epsilon exploration, and the
+        regrets and the average policy are importance weighted by the probability
+        of sampling the trajectory.
+    '''
+
+    def __init__(self, env, model_path='./mccfr_model', save_every=None, seed=None, epsilon=0.6):
+        ''' Initilize Agent
+
+        Args:
+            env (Env): Env class, created with allow_step_back=True
+            model_path (str): The directory of the checkpoints
+            save_every (int): Save a checkpoint every save_every iterations. None to only save on demand.
+            seed (int): The seed of the sampling of the actions
+            epsilon (float): The exploration of the traversing player
+        '''
+        super().__init__(env, model_path=model_path, save_every=save_every, seed=seed)
+        self.epsilon = epsilon
+
+    def traverse_player(self, player_id):
+        self.traverse_tree(np.ones(self.env.num_players), 1.0, player_id)
+
+    def traverse_tree(self, probs, sample_prob, player_id):
+        ''' Traverse one sampled trajectory, update the regrets
+
+        Args:
+            probs: The reach probability of the current node for each player
+            sample_prob: The probability of sampling the trajectory up to the current node
+            player_id: The player to update the value
+
+        Returns:
+            (float): The sampled utility of player_id, weighted by the tail of the trajectory
+        '''
+        if self.env.is_over():
+            return self.env.get_payoffs()[player_id]
+
+        current_player = self.env.get_player_id()
+        obs, legal_actions = self.get_state(current_player)
+        row = self.table.get_row(obs)
+        action_probs = self.current_policy(row, legal_actions)
+
+        if current_player == player_id:
+            sample_probs = np.zeros(len(action_probs))
+            sample_probs[legal_actions] = self.epsilon / len(legal_actions)
+            sample_probs += (1 - self.epsilon) * action_probs
+        else:
+            sample_probs = action_probs
+        action = self.np_random.choice(len(sample_probs), p=sample_probs)
+
+        new_probs = probs.copy()
+        new_probs[current_player] *= action_probs[action]
+        self.env.step(action)
+        utility = self.traverse_tree(new_probs, sample_prob * sample_probs[action], player_id)
+        self.env.step_back()
+
+        # Only the sampled action has a (importance weighted) utility estimate
+        action_utilities = np.zeros(len(action_probs))
+        action_utilities[action] = utility / sample_probs[action]
+        state_utility = action_probs.dot(action_utilities)
+
+        if current_player == player_id:
+            counterfactual_prob = (np.prod(probs[:current_player]) *
+                                   np.prod(probs[current_player + 1:]))
+            self.table.regrets[row, legal_actions] += (action_utilities[legal_actions] - state_utility) \
+                * counterfactual_prob / sample_prob
+            self.table.average_policy[row, legal_actions] += probs[current_player] * action_probs[legal_actions] \
+                / sample_prob
+        return state_utility
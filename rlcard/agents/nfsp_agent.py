@@ -29,7 +29,7 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 from rlcard.agents.dqn_agent import DQNAgent
-from rlcard.utils.utils import remove_illegal
+from rlcard.utils.utils import remove_illegal, unpack_obs
 
 Transition = collections.namedtuple('Transition', 'info_state action_probs')
 
@@ -46,6 +46,7 @@ class NFSPAgent(object):
                  state_shape=None,
                  hidden_layers_sizes=None,
                  reservoir_buffer_capacity=20000,
+                 reservoir_buffer_memmap_dir=None,
                  anticipatory_param=0.1,
                  batch_size=256,
                  train_every=1,
@@ -62,6 +63,7 @@ class NFSPAgent(object):
                  q_batch_size=32,
                  q_train_every=1,
                  q_mlp_layers=None,
+                 q_target_update_tau=None,
                  evaluate_with='average_policy',
                  device=None,
                  save_path=None,
@@ -74,6 +76,8 @@ class NFSPAgent(object):
             hidden_layers_sizes (list): The hidden layers sizes for the layers of
               the average policy.
             reservoir_buffer_capacity (int): The size of the buffer for average policy.
+            reservoir_buffer_memmap_dir (str): If set, the buffer for average policy is kept in
+              memory-mapped files in this directory instead of in memory.
             anticipatory_param (float): The hyper-parameter that balances rl/avarage policy.
             batch_size (int): The batch_size for training average policy.
             train_every (int): Train the SL policy every X steps.
@@ -91,11 +95,14 @@ class NFSPAgent(object):
             q_batch_size (int): The batch size of inner DQN agent.
             q_train_step (int): Train the model every X steps.
             q_mlp_layers (list): The layer sizes of inner DQN agent.
+            q_target_update_tau (float): If set, the target network of inner DQN agent is
+              Polyak averaged by this fraction every training step instead of copied.
             device (torch.device): Whether to use the cpu or gpu
         '''
         self.use_raw = False
         self._num_actions = num_actions
         self._state_shape = state_shape
+        self._state_size = None if state_shape is None else int(np.prod(state_shape))
         self._layer_sizes = hidden_layers_sizes + [num_actions]
         self._batch_size = batch_size
         self._train_every = train_every
@@ -103,7 +110,7 @@ class NFSPAgent(object):
         self._anticipatory_param = anticipatory_param
         self._min_buffer_size_to_learn = min_buffer_size_to_learn
 
-        self._reservoir_buffer = ReservoirBuffer(reservoir_buffer_capacity)
+        self._reservoir_buffer = ReservoirBuffer(reservoir_buffer_capacity, reservoir_buffer_memmap_dir)
         self._prev_timestep = None
         self._prev_action = None
         self.evaluate_with = evaluate_with
@@ -123,7 +130,7 @@ class NFSPAgent(object):
         self._rl_agent = DQNAgent(q_replay_memory_size, q_replay_memory_init_size, \
             q_update_target_estimator_every, q_discount_factor, q_epsilon_start, q_epsilon_end, \
             q_epsilon_decay_steps, q_batch_size, num_actions, state_shape, q_train_every, q_mlp_layers, \
-            rl_learning_rate, device)
+            rl_learning_rate, device, target_update_tau=q_target_update_tau)
 
         # Build the average policy supervised model
         self._build_model()
@@ -164,6 +171,19 @@ class NFSPAgent(object):
             sl_loss  = self.train_sl()
             print('\rINFO - Step {}, sl-loss: {}'.format(self.total_t, sl_loss), end='')
 
+    def feed_episode(self, episode):
+        ''' Feed all the transitions of an episode to inner RL agent at once
+
+        Args:
+            episode (Episode): the columnar episode of the agent, see rlcard.utils.trajectory
+        '''
+        self._rl_agent.feed_episode(episode)
+        for _ in range(len(episode)):
+            self.total_t += 1
+            if self.total_t>0 and len(self._reservoir_buffer) >= self._min_buffer_size_to_learn and self.total_t%self._train_every == 0:
+                sl_loss  = self.train_sl()
+                print('\rINFO - Step {}, sl-loss: {}'.format(self.total_t, sl_loss), end='')
+
     def step(self, state):
         ''' Returns the action to be taken.
 
@@ -229,7 +249,7 @@ class NFSPAgent(object):
         Returns:
             action_probs (numpy.array): The predicted action probability.
         '''
-        info_state = np.expand_dims(info_state, axis=0)
+        info_state = self._unpack_states(np.expand_dims(info_state, axis=0))
         info_state = torch.from_numpy(info_state).float().to(self.device)
 
         with torch.no_grad():
@@ -266,18 +286,16 @@ class NFSPAgent(object):
                 len(self._reservoir_buffer) < self._min_buffer_size_to_learn):
             return None
 
-        transitions = self._reservoir_buffer.sample(self._batch_size)
-        info_states = [t.info_state for t in transitions]
-        action_probs = [t.action_probs for t in transitions]
+        info_states, action_probs = self._reservoir_buffer.sample(self._batch_size)
 
         self.policy_network_optimizer.zero_grad()
         self.policy_network.train()
 
         # (batch, state_size)
-        info_states = torch.from_numpy(np.array(info_states)).float().to(self.device)
+        info_states = torch.from_numpy(self._unpack_states(info_states)).float().to(self.device)
 
         # (batch, num_actions)
-        eval_action_probs = torch.from_numpy(np.array(action_probs)).float().to(self.device)
+        eval_action_probs = torch.from_numpy(action_probs).float().to(self.device)
 
         # (batch, num_actions)
         log_forecast_action_probs = self.policy_network(info_states)
@@ -299,6 +317,16 @@ class NFSPAgent(object):
 
         return ce_loss
 
+    def _unpack_states(self, states):
+        ''' Unpack a batch of observations packed by the env, if they are
+
+        The reservoir buffer keeps the observations as they are fed, so
+        packed observations stay packed there until a batch is sampled.
+        '''
+        if self._state_size is not None and states[0].size != self._state_size:
+            return unpack_obs(states, self._state_size)
+        return states
+
     def set_device(self, device):
         self.device = device
         self._rl_agent.set_device(device)
@@ -361,7 +389,7 @@ class NFSPAgent(object):
         agent.policy_network.eval()
         agent.policy_network_optimizer = torch.optim.Adam(agent.policy_network.parameters(), lr=agent._sl_learning_rate)
         agent.policy_network_optimizer.load_state_dict(checkpoint['policy_network_optimizer'])
-        agent._rl_agent.from_checkpoint(checkpoint['rl_agent'])
+        agent._rl_agent = DQNAgent.from_checkpoint(checkpoint['rl_agent'])
         agent._rl_agent.set_device(agent.device)
         return agent
         
@@ -454,31 +482,46 @@ class AveragePolicyNetwork(nn.Module):
 class ReservoirBuffer(object):
     ''' Allows uniform sampling over a stream of data.
 
-    This class supports the storage of arbitrary elements, such as observation
-    tensors, integer actions, etc.
+    The (info_state, action_probs) transitions are stored in two preallocated
+    columns, so a batch is sampled with one gather per column. The columns are
+    allocated on the first add, when the shape and dtype of the states are known.
+    With memmap_dir they are memory-mapped .npy files in that directory, which
+    allows reservoirs larger than memory, and the checkpoint only records
+    where they are.
 
     See https://en.wikipedia.org/wiki/Reservoir_sampling for more details.
     '''
 
-    def __init__(self, reservoir_buffer_capacity):
+    def __init__(self, reservoir_buffer_capacity, memmap_dir=None):
         ''' Initialize the buffer.
+
+        Args:
+            reservoir_buffer_capacity (int): The number of transitions kept.
+            memmap_dir (str): The directory of the memory-mapped columns. None to keep them in memory.
         '''
         self._reservoir_buffer_capacity = reservoir_buffer_capacity
-        self._data = []
+        self._memmap_dir = memmap_dir
+        self._info_states = None
+        self._action_probs = None
+        self._size = 0
         self._add_calls = 0
 
     def add(self, element):
         ''' Potentially adds `element` to the reservoir buffer.
 
         Args:
-            element (object): data to be added to the reservoir buffer.
+            element (Transition): data to be added to the reservoir buffer.
         '''
-        if len(self._data) < self._reservoir_buffer_capacity:
-            self._data.append(element)
+        if self._size < self._reservoir_buffer_capacity:
+            idx = self._size
+            self._size += 1
         else:
             idx = np.random.randint(0, self._add_calls + 1)
-            if idx < self._reservoir_buffer_capacity:
-                self._data[idx] = element
+        if idx < self._reservoir_buffer_capacity:
+            if self._info_states is None:
+                self._allocate(np.asarray(element.info_state), np.asarray(element.action_probs))
+            self._info_states[idx] = element.info_state
+            self._action_probs[idx] = element.action_probs
         self._add_calls += 1
 
     def sample(self, num_samples):
@@ -488,39 +531,83 @@ class ReservoirBuffer(object):
             num_samples (int): The number of samples to draw.
 
         Returns:
-            An iterable over `num_samples` random elements of the buffer.
+            info_states (numpy.array): (num_samples, state_shape) the sampled states
+            action_probs (numpy.array): (num_samples, num_actions) their action probabilities
 
         Raises:
             ValueError: If there are less than `num_samples` elements in the buffer
         '''
-        if len(self._data) < num_samples:
+        if self._size < num_samples:
             raise ValueError("{} elements could not be sampled from size {}".format(
-                    num_samples, len(self._data)))
-        return random.sample(self._data, num_samples)
+                    num_samples, self._size))
+        indices = random.sample(range(self._size), num_samples)
+        return self._info_states[indices], self._action_probs[indices]
 
     def clear(self):
         ''' Clear the buffer
         '''
-        self._data = []
+        self._size = 0
         self._add_calls = 0
-        
+
+    def _allocate(self, info_state, action_probs):
+        shapes = {
+            'info_states': ((self._reservoir_buffer_capacity,) + info_state.shape, info_state.dtype),
+            'action_probs': ((self._reservoir_buffer_capacity,) + action_probs.shape, np.float32),
+        }
+        for name, (shape, dtype) in shapes.items():
+            if self._memmap_dir is None:
+                column = np.zeros(shape, dtype=dtype)
+            else:
+                os.makedirs(self._memmap_dir, exist_ok=True)
+                column = np.lib.format.open_memmap(os.path.join(self._memmap_dir, name + '.npy'),
+                                                   mode='w+', dtype=dtype, shape=shape)
+            setattr(self, '_' + name, column)
+
     def checkpoint_attributes(self):
+        ''' Returns the attributes that need to be checkpointed
+
+        The in-memory columns are written trimmed to the stored transitions.
+        The memory-mapped columns are flushed and left in their files.
+        '''
+        columns = {}
+        if self._info_states is not None and self._memmap_dir is None:
+            columns['info_states'] = self._info_states[:self._size]
+            columns['action_probs'] = self._action_probs[:self._size]
+        elif self._info_states is not None:
+            self._info_states.flush()
+            self._action_probs.flush()
         return {
-            'data': self._data,
+            'columns': columns,
+            'size': self._size,
+            'memmap_dir': self._memmap_dir,
             'add_calls': self._add_calls,
             'reservoir_buffer_capacity': self._reservoir_buffer_capacity,
         }
-        
+
     @classmethod
     def from_checkpoint(cls, checkpoint):
-        reservoir_buffer = cls(checkpoint['reservoir_buffer_capacity'])
-        reservoir_buffer._data = checkpoint['data']
+        reservoir_buffer = cls(checkpoint['reservoir_buffer_capacity'], checkpoint.get('memmap_dir'))
+        if 'data' in checkpoint:
+            # Checkpoints written before the columns hold a list of Transitions
+            for transition in checkpoint['data']:
+                reservoir_buffer.add(transition)
+        elif reservoir_buffer._memmap_dir is not None:
+            if checkpoint['size'] > 0:
+                for name in ('info_states', 'action_probs'):
+                    column = np.load(os.path.join(reservoir_buffer._memmap_dir, name + '.npy'), mmap_mode='r+')
+                    setattr(reservoir_buffer, '_' + name, column)
+        elif checkpoint['columns']:
+            columns = checkpoint['columns']
+            reservoir_buffer._allocate(columns['info_states'][0], columns['action_probs'][0])
+            reservoir_buffer._info_states[:len(columns['info_states'])] = columns['info_states']
+            reservoir_buffer._action_probs[:len(columns['action_probs'])] = columns['action_probs']
+        reservoir_buffer._size = checkpoint.get('size', reservoir_buffer._size)
         reservoir_buffer._add_calls = checkpoint['add_calls']
         return reservoir_buffer
 
     def __len__(self):
-        return len(self._data)
+        return self._size
 
     def __iter__(self):
-        return iter(self._data)
-
+        for idx in range(self._size):
+            yield Transition(info_state=self._info_states[idx], action_probs=self._action_probs[idx])
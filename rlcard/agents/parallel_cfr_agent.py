@@ -0,0 +1,203 @@
+''' CFR (chance sampling) with the traversals sharded over a pool of processes
+'''
+import multiprocessing
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+import numpy as np
+
+import rlcard
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.cfr_table import InfosetTable
+from rlcard.utils import seeding
+
+
+class SharedPolicyTable(InfosetTable):
+    ''' The table of a worker: regret and average policy deltas of the states visited
+        in one iteration, and the current policy read from the shared memory of the agent
+    '''
+
+    def __init__(self, num_actions, shared_index, shared_policy):
+        ''' Initilize the table
+
+        Args:
+            num_actions (int): The number of actions of the game
+            shared_index (dict): state_str -> row of the state in shared_policy
+            shared_policy (numpy.array): The current policy of the agent, in shared memory
+        '''
+        super().__init__(num_actions)
+        self.shared_index = shared_index
+        self.shared_policy = shared_policy
+
+    def get_row(self, obs):
+        row = self.index.get(obs)
+        if row is None:
+            row = super().get_row(obs)
+            shared_row = self.shared_index.get(obs)
+            if shared_row is not None:
+                self.policy[row] = self.shared_policy[shared_row]
+        return row
+
+
+def _attach_policy(shm_name, capacity, num_actions):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    return shm, np.ndarray((capacity, num_actions), dtype=np.float64, buffer=shm.buf)
+
+
+def _worker(connection, env_id, env_config, num_traversals):
+    ''' Run the traversals of one worker until the agent closes the connection
+
+    Args:
+        connection (Connection): The worker end of the pipe to the agent
+        env_id (str): The environment to traverse
+        env_config (dict): The config of the environment, with the seed of the worker
+        num_traversals (int): The number of sampled deals traversed for each player per iteration
+    '''
+    env = rlcard.make(env_id, config=env_config)
+    agent = CFRAgent(env)
+    shm, shared_policy = None, None
+    shared_index = {}
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        iteration, new_keys, policy_buffer = message
+        if policy_buffer is not None:
+            if shm is not None:
+                shm.close()
+            shm, shared_policy = _attach_policy(*policy_buffer)
+        for obs in new_keys:
+            shared_index[obs] = len(shared_index)
+
+        agent.iteration = iteration
+        agent.table = SharedPolicyTable(env.num_actions, shared_index, shared_policy)
+        for _ in range(num_traversals):
+            for player_id in range(env.num_players):
+                env.reset()
+                agent.traverse_tree(np.ones(env.num_players), player_id)
+        size = len(agent.table)
+        connection.send((agent.table.keys, agent.table.regrets[:size], agent.table.average_policy[:size]))
+    if shm is not None:
+        shm.close()
+    connection.close()
+
+
+class ParallelCFRAgent(CFRAgent):
+    ''' Implement CFR (chance sampling) with the traversals of an iteration run by worker processes
+
+        Every worker owns an environment seeded from the seed of the agent and its worker id,
+        and traverses its own sampled deals with the current policy, which the workers read
+        from shared memory. At the end of the iteration the regret and average policy deltas
+        of the workers are merged in worker order, so training is deterministic for a given
+        seed and number of workers. The agent saves, loads and evaluates like CFRAgent.
+    '''
+
+    def __init__(self, env, model_path='./cfr_model', num_workers=None, num_traversals=1, seed=None,
+                 env_config=None):
+        ''' Initilize Agent
+
+        Args:
+            env (Env): Env class, used for evaluation and to build the environments of the workers
+            model_path (str): The directory of the model
+            num_workers (int): The number of worker processes. Default is the number of cores.
+            num_traversals (int): The number of sampled deals traversed for each player by every worker per iteration
+            seed (int): The seed the seeds of the workers are derived from
+            env_config (dict): The config to make the environments of the workers, without the seed
+        '''
+        if shared_memory is None:
+            raise ImportError('ParallelCFRAgent needs multiprocessing.shared_memory, which requires Python 3.8 or later')
+        super().__init__(env, model_path=model_path)
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.num_traversals = num_traversals
+        self.seed = seed
+        self.env_config = dict(env_config or {})
+
+        self.workers = []
+        self.connections = []
+        self.shm = None
+        self.shared_policy = None
+        self.num_synced_keys = 0
+
+    def train(self):
+        ''' Do one iteration of CFR over all the workers
+        '''
+        self.iteration += 1
+
+        # Share the current policy and the states added since the last iteration.
+        # The shared memory is created before the workers so that they share its resource tracker
+        policy_buffer = self._sync_policy()
+        if not self.workers:
+            self._start_workers()
+            policy_buffer = (self.shm.name, ) + self.shared_policy.shape
+        new_keys = self.table.keys[self.num_synced_keys:]
+        self.num_synced_keys = len(self.table)
+        for connection in self.connections:
+            connection.send((self.iteration, new_keys, policy_buffer))
+
+        # Merge the deltas in worker order
+        for connection in self.connections:
+            keys, regrets, average_policy = connection.recv()
+            rows = [self.table.get_row(obs) for obs in keys]
+            self.table.regrets[rows] += regrets
+            self.table.average_policy[rows] += average_policy
+
+        self.update_policy()
+
+    def close(self):
+        ''' Stop the workers and release the shared memory
+        '''
+        for connection in self.connections:
+            connection.send(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+        self.connections = []
+        self.num_synced_keys = 0
+        if self.shm is not None:
+            self.shared_policy = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def load(self):
+        ''' Load model, and stop the workers as their states no longer match the table
+        '''
+        self.close()
+        super().load()
+
+    def _start_workers(self):
+        for worker_id in range(self.num_workers):
+            env_config = dict(self.env_config)
+            env_config['seed'] = seeding.hash_seed(None if self.seed is None else self.seed + worker_id)
+            env_config['allow_step_back'] = True
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_worker,
+                                             args=(worker_connection, self.env.name, env_config, self.num_traversals),
+                                             daemon=True)
+            worker.start()
+            worker_connection.close()
+            self.workers.append(worker)
+            self.connections.append(connection)
+
+    def _sync_policy(self):
+        ''' Copy the policy to shared memory, reallocating it when the table outgrew it
+
+        Returns:
+            (tuple): (name, capacity, num_actions) of a new shared memory, or None if it did not change
+        '''
+        size = len(self.table)
+        policy_buffer = None
+        if self.shm is None or size > self.shared_policy.shape[0]:
+            if self.shm is not None:
+                self.shared_policy = None
+                self.shm.close()
+                self.shm.unlink()
+            capacity = max(2 * size, 1024)
+            num_actions = self.env.num_actions
+            self.shm = shared_memory.SharedMemory(create=True, size=capacity * num_actions * 8)
+            self.shared_policy = np.ndarray((capacity, num_actions), dtype=np.float64, buffer=self.shm.buf)
+            policy_buffer = (self.shm.name, capacity, num_actions)
+        self.shared_policy[:size] = self.table.policy[:size]
+        return policy_buffer
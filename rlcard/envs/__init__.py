@@ -1,8 +1,19 @@
 ''' Register new environments
+
+The environments are registered by entry point and only imported by make, so
+importing rlcard does not load the games. Env is also imported on first access.
 '''
-from rlcard.envs.env import Env
+import importlib
+
 from rlcard.envs.registration import register, make
 
+
+def __getattr__(name):
+    if name == 'Env':
+        return importlib.import_module('rlcard.envs.env').Env
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
 register(
     env_id='blackjack',
     entry_point='rlcard.envs.blackjack:BlackjackEnv',
@@ -6,6 +6,7 @@
 
 import numpy as np
 from collections import OrderedDict
+from functools import partial
 
 from rlcard.envs import Env
 
@@ -13,7 +14,8 @@ from rlcard.games.butifarra import Game
 
 from rlcard.games.butifarra.game import ButifarraGame
 from rlcard.games.butifarra.utils.action_event import ActionEvent
-from rlcard.games.butifarra.utils.butifarra_card import ButifarraCard
+from rlcard.games.butifarra.utils.butifarra_card import ButifarraCard, NO_TRUMP_PAL_INDEX, is_card_higher, pal_index
+from rlcard.games.butifarra.utils import card_mask
 from rlcard.games.butifarra.utils.move import CallMove, PlayCardMove, PlayerMove, CantarAction
 
 #   [] Why no_bid_action_id in bidding_rep ?
@@ -49,7 +51,8 @@ class ButifarraEnv(Env):
         self.game = Game()
         super().__init__(config=config)
         self.butifarraPayoffDelegate = DefaultButifarraPayoffDelegate()
-        self.butifarraStateExtractor = DefaultHiddenButifarraStateExtractor()
+        self.butifarraStateExtractor = IncrementalHiddenButifarraStateExtractor(
+            debug_views=config.get('debug_views', False))
         state_shape_size = self.butifarraStateExtractor.get_state_shape_size()
         self.state_shape = [[1, state_shape_size] for _ in range(self.num_players)]
         self.action_shape = [None for _ in range(self.num_players)]
@@ -129,11 +132,11 @@ class DefaultButifarraPayoffDelegate(ButifarraPayoffDelegate):
         if cantar_move:
             declarer = cantar_move.player
             won_bases_counts = game.round.won_bases_counts
-            won_cards = game.round.won_cards
+            won_cards_masks = game.round.won_cards_masks
             declarer_won_bases_count = won_bases_counts[declarer.player_id % 2]
             defender_won_bases_count = won_bases_counts[(declarer.player_id + 1) % 2]
-            declarer_valor_bases = sum([x.get_valor() for x in won_cards[declarer.player_id % 2]])
-            defender_valor_bases = sum([x.get_valor() for x in won_cards[(declarer.player_id +1 )% 2]])
+            declarer_valor_bases = card_mask.count_points(won_cards_masks[declarer.player_id % 2])
+            defender_valor_bases = card_mask.count_points(won_cards_masks[(declarer.player_id + 1) % 2])
 
             declarer_punts = (declarer_valor_bases + declarer_won_bases_count) - 36
             defender_punts = (defender_valor_bases + defender_won_bases_count) - 36
@@ -170,11 +173,11 @@ class V1ButifarraPayoffDelegate(ButifarraPayoffDelegate):
         if cantar_move:
             declarer = cantar_move.player
             won_bases_counts = game.round.won_bases_counts
-            won_cards = game.round.won_cards
+            won_cards_masks = game.round.won_cards_masks
             declarer_won_bases_count = won_bases_counts[declarer.player_id % 2]
             defender_won_bases_count = won_bases_counts[(declarer.player_id + 1) % 2]
-            declarer_valor_bases = sum([x.get_valor() for x in won_cards[declarer.player_id % 2]])
-            defender_valor_bases = sum([x.get_valor() for x in won_cards[(declarer.player_id +1 )% 2]])
+            declarer_valor_bases = card_mask.count_points(won_cards_masks[declarer.player_id % 2])
+            defender_valor_bases = card_mask.count_points(won_cards_masks[(declarer.player_id + 1) % 2])
             
             declarer_punts = (declarer_valor_bases + declarer_won_bases_count) - 36
             defender_punts = (defender_valor_bases + defender_won_bases_count) - 36
@@ -232,8 +235,73 @@ class V1ButifarraPayoffDelegate(ButifarraPayoffDelegate):
 
 
 
+class ButifarraExtractedState(dict):
+    ''' The state returned by the Butifarra state extractors
+
+        The human readable views of the state, such as 'raw_legal_actions' and
+        'text', are only read by the human agent, the web server and eval_step,
+        so they are built the first time one of them is looked up or tested with
+        `in` instead of on every step. keys(), len(), iterating over the dict or
+        serializing it do not build them, and leave them out until then: call
+        build_debug_views first, or make the env with 'debug_views' set.
+    '''
+
+    def __init__(self, debug_view_keys=(), build_debug_views=None):
+        ''' Initialize the state
+
+        Args:
+            debug_view_keys (tuple): The keys of the human readable views
+            build_debug_views (callable): Returns the dict of the human readable views
+        '''
+        super().__init__()
+        self.debug_view_keys = debug_view_keys
+        self._build_debug_views = build_debug_views
+
+    def __missing__(self, key):
+        if key in self.debug_view_keys and self.build_debug_views():
+            return self[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if not super().__contains__(key) and key in self.debug_view_keys:
+            self.build_debug_views()
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def build_debug_views(self):
+        ''' Add the human readable views to the dict, if they are not there yet
+
+        Returns:
+            (boolean): True if they were added by this call
+        '''
+        if self._build_debug_views is None:
+            return False
+        build_debug_views, self._build_debug_views = self._build_debug_views, None
+        self.update(build_debug_views())
+        return True
+
+
 class ButifarraStateExtractor(object):  # interface
 
+    def __init__(self, debug_views=False):
+        ''' Initialize the extractor
+
+        Args:
+            debug_views (boolean): True to build the human readable views of every
+                extracted state right away, instead of on first access
+        '''
+        self.debug_views = debug_views
+
+    @staticmethod
+    def extract_raw_legal_actions(legal_actions):
+        # TODO: needed for web server, as it complained of not being strings... Really have to check why othres don't have it
+        return {'raw_legal_actions': [str(a) for a in legal_actions]}
+
     def get_state_shape_size(self) -> int:
         raise NotImplementedError
 
@@ -262,8 +330,8 @@ class ButifarraStateExtractor(object):  # interface
 
 class DefaultButifarraStateExtractor(ButifarraStateExtractor):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, debug_views=False):
+        super().__init__(debug_views=debug_views)
 
         state_names = ['hand',
                         'cartes_jugades_jo',
@@ -322,8 +390,9 @@ class DefaultButifarraStateExtractor(ButifarraStateExtractor):
         Returns:
             (numpy.array): The extracted state
         '''
-        extracted_state = {}
         legal_actions: OrderedDict = self.get_legal_actions(game=game)
+        extracted_state = ButifarraExtractedState(('raw_legal_actions',),
+                                                  partial(self.extract_raw_legal_actions, legal_actions))
         raw_legal_actions = list(legal_actions.keys())
         current_player = game.round.get_current_player()
         current_player_id = current_player.player_id
@@ -497,16 +566,17 @@ class DefaultButifarraStateExtractor(ButifarraStateExtractor):
         obs = np.concatenate(rep)
         extracted_state['obs'] = obs
         extracted_state['legal_actions'] = legal_actions
-        extracted_state['raw_legal_actions'] = [str(a) for a in legal_actions] # TODO: needed for web server, as it complained of not being strings... Really have to check why othres don't have it
         extracted_state['raw_obs'] = obs
+        if self.debug_views:
+            extracted_state.build_debug_views()
         return extracted_state
 
 
 
 class DefaultHiddenButifarraStateExtractor(ButifarraStateExtractor):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, debug_views=False):
+        super().__init__(debug_views=debug_views)
 
         # proposta. Basa actual nomes la carta maxima en format one hot
 
@@ -572,8 +642,6 @@ class DefaultHiddenButifarraStateExtractor(ButifarraStateExtractor):
         Returns:
             (numpy.array): The extracted state
         '''
-        extracted_state = {}
-        extracted_state['class'] = self.__class__.__name__
         legal_actions: OrderedDict = self.get_legal_actions(game=game)
         raw_legal_actions = list(legal_actions.keys())
         current_player = game.round.get_current_player()
@@ -587,17 +655,9 @@ class DefaultHiddenButifarraStateExtractor(ButifarraStateExtractor):
 
         # construct trick_pile_rep
 
-        cartes_jugades_jo = np.zeros(48, dtype=int) 
-
-        cartes_jugades_company = np.zeros(48, dtype=int) 
-        cartes_jugades_dreta = np.zeros(48, dtype=int) 
-        cartes_jugades_esquerra = np.zeros(48, dtype=int) 
-
-        cartes_possibles_company = np.ones(48, dtype=int) 
-        cartes_possibles_dreta = np.ones(48, dtype=int) 
-        cartes_possibles_esquerra = np.ones(48, dtype=int) 
-
-        cartes_amagades = np.zeros(48, dtype=int)
+        cartes_jugades_jo, cartes_jugades_company, cartes_jugades_dreta, cartes_jugades_esquerra, \
+            cartes_possibles_company, cartes_possibles_dreta, cartes_possibles_esquerra, \
+            cartes_amagades = self.extract_card_planes(game=game, hand_rep=hand_rep, current_player_id=current_player_id)
 
         basa_actual = np.ones(3, dtype=int) * -1
         basa_qui = np.ones(4, dtype=int) * -1
@@ -608,71 +668,17 @@ class DefaultHiddenButifarraStateExtractor(ButifarraStateExtractor):
 
         basa_jugador = None
 
-        if not game.round.is_bidding_over():
-            for i in range(48):
-                if hand_rep[i] == 1:
-                    cartes_amagades[i] = 0 
-                    cartes_possibles_company[i] = 0
-                    cartes_possibles_dreta[i] = 0
-                    cartes_possibles_esquerra[i] = 0
-                elif hand_rep[i] == 0:
-                    cartes_amagades[i] = 1
-                else:
-                    raise Exception("mes d'una mateixa carta apareix")
-
-
-        else:
-            first_play_card_idx = -1
-            for i in range(len(game.round.move_sheet)):
-                if isinstance(game.round.move_sheet[i], PlayCardMove):
-                    first_play_card_idx = i
-                    break
-
-            if first_play_card_idx > 0:
-            
-                #trick_moves = game.round.get_bases_moves() # crec que esta malament, aixo retorna la basa actual, volem totes les cartes jugades
-                for move in game.round.move_sheet[first_play_card_idx:]:
-                    player = move.player
-                    card = move.card
-                    if player.player_id == current_player_id: 
-                        # es jo
-                        cartes_jugades_jo[card.card_id] = 1
-
-                    elif player.player_id == player_company: 
-                        # es company
-                        cartes_jugades_company[card.card_id] = 1
-
-                    elif player.player_id == player_dreta: 
-                        # es dreta
-                        cartes_jugades_dreta[card.card_id] = 1
-
-                    elif player.player_id == player_esquerra: 
-                        # es esquerra
-                        cartes_jugades_esquerra[card.card_id] = 1
-
-                    else:
-                        raise Exception("Jugador inexistent")
-                
-            
-            cartes_visibles = hand_rep + cartes_jugades_jo + cartes_jugades_company + cartes_jugades_dreta + cartes_jugades_esquerra
-            for i in range(48):
-                if cartes_visibles[i] == 1:
-                    cartes_amagades[i] = 0 
-                elif cartes_visibles[i] == 0:
-                    cartes_amagades[i] = 1
-                else:
-                    raise Exception("mes d'una mateixa carta apareix")
-                
-
-            trumfo = game.round.get_trumfo()
+        if game.round.is_bidding_over():
+            trumfo_pal_index = game.round.get_trumfo_pal_index()
             cartes_basa = game.round.get_bases_moves()
 
             basa_jugador = current_player_id
 
             if (len(cartes_basa) == 4):
                 max_move = cartes_basa[0]
+                basa_pal_index = cartes_basa[0].card.card_id // 12
                 for i in range(1,4):
-                    if cartes_basa[i].card.mes_alta_que(max_move.card, cartes_basa[0].card.suit, trumfo):
+                    if is_card_higher(cartes_basa[i].card.card_id, max_move.card.card_id, basa_pal_index, trumfo_pal_index):
                         max_move = cartes_basa[i]
                 basa_jugador = max_move.player.player_id
 
@@ -699,13 +705,6 @@ class DefaultHiddenButifarraStateExtractor(ButifarraStateExtractor):
                 raise Exception('la basa no es de ningu')
 
 
-            # construct possible cards
-
-            cartes_possibles_company = calculateHiddenInfo(game.round.move_sheet, hand_rep, trumfo, player_company)
-            cartes_possibles_dreta = calculateHiddenInfo(game.round.move_sheet, hand_rep, trumfo, player_dreta)
-            cartes_possibles_esquerra = calculateHiddenInfo(game.round.move_sheet, hand_rep, trumfo, player_esquerra)
-
-
         # construct is_bidding_rep
         estem_cantant = np.array([1] if game.round.is_bidding_over() else [0])
 
@@ -807,36 +806,174 @@ class DefaultHiddenButifarraStateExtractor(ButifarraStateExtractor):
 
         obs = np.concatenate(rep)
 
+        extracted_state = ButifarraExtractedState(
+            ('raw_legal_actions', 'text'),
+            partial(self.extract_debug_views, legal_actions, hand_rep, cartes_jugades_jo, cartes_jugades_company,
+                    cartes_jugades_dreta, cartes_jugades_esquerra, cartes_possibles_company, cartes_possibles_dreta,
+                    cartes_possibles_esquerra, cartes_amagades, basa_actual, basa_jugador))
+        extracted_state['class'] = self.__class__.__name__
         extracted_state['obs'] = obs
         extracted_state['legal_actions'] = legal_actions
-        extracted_state['raw_legal_actions'] = [str(a) for a in legal_actions] # TODO: needed for web server, as it complained of not being strings... Really have to check why othres don't have it
         extracted_state['raw_obs'] = obs
+        if self.debug_views:
+            extracted_state.build_debug_views()
+        return extracted_state
 
-        extracted_state['text'] = {}
-
-        extracted_state['text']['hand'] = [ButifarraCard.card(i).__repr__() for i in range(48) if hand_rep[i] == 1]
-        extracted_state['text']['cartes_jugades_jo'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_jugades_jo[i] == 1]
-        extracted_state['text']['cartes_jugades_company'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_jugades_company[i] == 1]
-        extracted_state['text']['cartes_jugades_dreta'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_jugades_dreta[i] == 1]
-        extracted_state['text']['cartes_jugades_esquerra'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_jugades_esquerra[i] == 1]
-        extracted_state['text']['cartes_possibles_company'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_possibles_company[i] == 1]
-        extracted_state['text']['cartes_possibles_dreta'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_possibles_dreta[i] == 1]
-        extracted_state['text']['cartes_possibles_esquerra'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_possibles_esquerra[i] == 1]
-        extracted_state['text']['cartes_amagades'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_amagades[i] == 1]
-        extracted_state['text']['basa_actual'] = [ButifarraCard.card(basa_actual[i]).__repr__() for i in range(3) if basa_actual[i] != -1]
-        extracted_state['text']['basa_jugador'] = 'None' if not basa_jugador else basa_jugador
-        #extracted_state['text']['estem_cantant'] = estem_cantant
-        #extracted_state['text']['delegar_qui'] = [ButifarraCard.card(i) for i in range(4) if delegar_rep[i] == 1]
-        #extracted_state['text']['cantar_qui'] = [ButifarraCard.card(i) for i in range(4) if cantar_rep[i] == 1]
-        #extracted_state['text']['contrar'] = contrar_rep
-        #extracted_state['text']['recontrar'] = recontrar_rep
-        #extracted_state['text']['stvicenc'] = st_vicenc_rep
-        #extracted_state['text']['trumfo'] = [CantarAction.accions[i] for i in range(5) if trumfo_suit_rep[i] == 1]
-        #extracted_state['text']['current_player'] =  current_player.player_id #index of current player
+    def extract_debug_views(self, legal_actions, hand_rep, cartes_jugades_jo, cartes_jugades_company,
+                            cartes_jugades_dreta, cartes_jugades_esquerra, cartes_possibles_company,
+                            cartes_possibles_dreta, cartes_possibles_esquerra, cartes_amagades, basa_actual,
+                            basa_jugador):
+        ''' Build the human readable views of a state, from the planes of its observation
 
+        Returns:
+            (dict): The 'raw_legal_actions' and the 'text' of the state
+        '''
+        text = {}
+        text['hand'] = [ButifarraCard.card(i).__repr__() for i in range(48) if hand_rep[i] == 1]
+        text['cartes_jugades_jo'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_jugades_jo[i] == 1]
+        text['cartes_jugades_company'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_jugades_company[i] == 1]
+        text['cartes_jugades_dreta'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_jugades_dreta[i] == 1]
+        text['cartes_jugades_esquerra'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_jugades_esquerra[i] == 1]
+        text['cartes_possibles_company'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_possibles_company[i] == 1]
+        text['cartes_possibles_dreta'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_possibles_dreta[i] == 1]
+        text['cartes_possibles_esquerra'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_possibles_esquerra[i] == 1]
+        text['cartes_amagades'] = [ButifarraCard.card(i).__repr__() for i in range(48) if cartes_amagades[i] == 1]
+        text['basa_actual'] = [ButifarraCard.card(basa_actual[i]).__repr__() for i in range(3) if basa_actual[i] != -1]
+        text['basa_jugador'] = 'None' if not basa_jugador else basa_jugador
+        #text['estem_cantant'] = estem_cantant
+        #text['delegar_qui'] = [ButifarraCard.card(i) for i in range(4) if delegar_rep[i] == 1]
+        #text['cantar_qui'] = [ButifarraCard.card(i) for i in range(4) if cantar_rep[i] == 1]
+        #text['contrar'] = contrar_rep
+        #text['recontrar'] = recontrar_rep
+        #text['stvicenc'] = st_vicenc_rep
+        #text['trumfo'] = [CantarAction.accions[i] for i in range(5) if trumfo_suit_rep[i] == 1]
+        #text['current_player'] =  current_player.player_id #index of current player
+
+        debug_views = self.extract_raw_legal_actions(legal_actions)
+        debug_views['text'] = text
+        return debug_views
+
+    def extract_card_planes(self, game: ButifarraGame, hand_rep, current_player_id: int):
+        ''' Build the card planes of the observation, seen from current_player_id
 
-        return extracted_state
+        Args:
+            game (ButifarraGame): The game
+            hand_rep (numpy.array): one hot of the hand of the current player
+            current_player_id (int): The player the planes are built for
+
+        Returns:
+            (tuple): cartes_jugades_jo, cartes_jugades_company, cartes_jugades_dreta, cartes_jugades_esquerra,
+                cartes_possibles_company, cartes_possibles_dreta, cartes_possibles_esquerra, cartes_amagades
+        '''
+        cartes_jugades_jo = np.zeros(48, dtype=int) 
+
+        cartes_jugades_company = np.zeros(48, dtype=int) 
+        cartes_jugades_dreta = np.zeros(48, dtype=int) 
+        cartes_jugades_esquerra = np.zeros(48, dtype=int) 
 
+        cartes_possibles_company = np.ones(48, dtype=int) 
+        cartes_possibles_dreta = np.ones(48, dtype=int) 
+        cartes_possibles_esquerra = np.ones(48, dtype=int) 
+
+        cartes_amagades = np.zeros(48, dtype=int)
+
+        player_company = ((current_player_id + 2) % 4)
+        player_dreta = ((current_player_id + 3) % 4)
+        player_esquerra = ((current_player_id + 1) % 4)
+
+        if not game.round.is_bidding_over():
+            for i in range(48):
+                if hand_rep[i] == 1:
+                    cartes_amagades[i] = 0 
+                    cartes_possibles_company[i] = 0
+                    cartes_possibles_dreta[i] = 0
+                    cartes_possibles_esquerra[i] = 0
+                elif hand_rep[i] == 0:
+                    cartes_amagades[i] = 1
+                else:
+                    raise Exception("mes d'una mateixa carta apareix")
+
+
+        else:
+            first_play_card_idx = -1
+            for i in range(len(game.round.move_sheet)):
+                if isinstance(game.round.move_sheet[i], PlayCardMove):
+                    first_play_card_idx = i
+                    break
+
+            if first_play_card_idx > 0:
+            
+                #trick_moves = game.round.get_bases_moves() # crec que esta malament, aixo retorna la basa actual, volem totes les cartes jugades
+                for move in game.round.move_sheet[first_play_card_idx:]:
+                    player = move.player
+                    card = move.card
+                    if player.player_id == current_player_id: 
+                        # es jo
+                        cartes_jugades_jo[card.card_id] = 1
+
+                    elif player.player_id == player_company: 
+                        # es company
+                        cartes_jugades_company[card.card_id] = 1
+
+                    elif player.player_id == player_dreta: 
+                        # es dreta
+                        cartes_jugades_dreta[card.card_id] = 1
+
+                    elif player.player_id == player_esquerra: 
+                        # es esquerra
+                        cartes_jugades_esquerra[card.card_id] = 1
+
+                    else:
+                        raise Exception("Jugador inexistent")
+                
+            
+            cartes_visibles = hand_rep + cartes_jugades_jo + cartes_jugades_company + cartes_jugades_dreta + cartes_jugades_esquerra
+            for i in range(48):
+                if cartes_visibles[i] == 1:
+                    cartes_amagades[i] = 0 
+                elif cartes_visibles[i] == 0:
+                    cartes_amagades[i] = 1
+                else:
+                    raise Exception("mes d'una mateixa carta apareix")
+
+            # construct possible cards
+
+            trumfo = game.round.get_trumfo()
+            cartes_possibles_company = calculateHiddenInfo(game.round.move_sheet, hand_rep, trumfo, player_company)
+            cartes_possibles_dreta = calculateHiddenInfo(game.round.move_sheet, hand_rep, trumfo, player_dreta)
+            cartes_possibles_esquerra = calculateHiddenInfo(game.round.move_sheet, hand_rep, trumfo, player_esquerra)
+
+        return cartes_jugades_jo, cartes_jugades_company, cartes_jugades_dreta, cartes_jugades_esquerra, \
+            cartes_possibles_company, cartes_possibles_dreta, cartes_possibles_esquerra, cartes_amagades
+
+
+
+class IncrementalHiddenButifarraStateExtractor(DefaultHiddenButifarraStateExtractor):
+    ''' Same observation as DefaultHiddenButifarraStateExtractor, bit for bit.
+
+        The card planes are read from the CardTracker that ButifarraRound updates on every
+        played card, instead of being rebuilt by rescanning the move_sheet on every step.
+    '''
+
+    def extract_card_planes(self, game: ButifarraGame, hand_rep, current_player_id: int):
+        player_company = ((current_player_id + 2) % 4)
+        player_dreta = ((current_player_id + 3) % 4)
+        player_esquerra = ((current_player_id + 1) % 4)
+
+        card_tracker = game.round.card_tracker
+        played_cards = card_tracker.played_cards
+        cartes_jugades_jo = played_cards[current_player_id].copy()
+        cartes_jugades_company = played_cards[player_company].copy()
+        cartes_jugades_dreta = played_cards[player_dreta].copy()
+        cartes_jugades_esquerra = played_cards[player_esquerra].copy()
+
+        cartes_amagades = 1 - hand_rep - card_tracker.all_played_cards
+        cartes_possibles_company = card_tracker.get_possible_cards(player_company, hand_rep)
+        cartes_possibles_dreta = card_tracker.get_possible_cards(player_dreta, hand_rep)
+        cartes_possibles_esquerra = card_tracker.get_possible_cards(player_esquerra, hand_rep)
+
+        return cartes_jugades_jo, cartes_jugades_company, cartes_jugades_dreta, cartes_jugades_esquerra, \
+            cartes_possibles_company, cartes_possibles_dreta, cartes_possibles_esquerra, cartes_amagades
 
 
 
@@ -867,6 +1004,8 @@ def calculateHiddenInfo(move_sheet, my_hand, trumfo, player_id) :
 
     # for each 1 in cartes_visibles, set one_hot_hidden_cards to 0
 
+    trumfo_index = pal_index(trumfo)
+
     one_hot_hidden_cards = np.ones(48, dtype=int)
     # for each card in my_hand, set one_hot_hidden_cards to 0
     for i in range(48):
@@ -907,13 +1046,14 @@ def calculateHiddenInfo(move_sheet, my_hand, trumfo, player_id) :
 
         cbhm = move_sheet[cbidx[0]]
         pal_basa = cbhm.card.suit
+        pal_basa_index = pal_index(pal_basa)
         cbpm = None
         for i in range(cbidx[0] + 1, cbidx[1]):
             cbcm = move_sheet[i]
             if cbcm.player.player_id == player_id:
                 cbpm = cbcm
                 break
-            if cbcm.card.mes_alta_que(cbhm.card, pal_basa, trumfo):
+            if is_card_higher(cbcm.card.card_id, cbhm.card.card_id, pal_basa_index, trumfo_index):
                 cbhm = cbcm
 
         if cbpm is None:
@@ -940,7 +1080,7 @@ def calculateHiddenInfo(move_sheet, my_hand, trumfo, player_id) :
 
         else : # lastmove is of the same pal
             # if must play higher but is not possible, then he does not have zny cards higher
-            if must_play_higher and not cbpm.card.mes_alta_que(cbhm.card, pal_basa, None): 
+            if must_play_higher and not is_card_higher(cbpm.card.card_id, cbhm.card.card_id, pal_basa_index, NO_TRUMP_PAL_INDEX): 
                 i = oneHotPalInterval(pal_basa)
                 i[0] += ButifarraCard.numero.index(cbhm.card.rank)
 
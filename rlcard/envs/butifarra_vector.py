@@ -0,0 +1,157 @@
+''' Vectorized Butifarra environment: N independent games stepped in lockstep
+'''
+
+import numpy as np
+
+from rlcard.games.butifarra.game import ButifarraGame
+from rlcard.games.butifarra.utils.action_event import ActionEvent
+from rlcard.envs.butifarra import DefaultButifarraPayoffDelegate, IncrementalHiddenButifarraStateExtractor
+from rlcard.utils import seeding
+
+
+class ButifarraVectorEnv(object):
+    ''' Owns `num_envs` independent ButifarraGame instances and steps them together.
+
+        Observations and legal actions of all the games are written into stacked
+        numpy arrays so that a single forward pass of a network can serve every seat:
+
+            obs: (num_envs, state_size)
+            legal_actions_mask: (num_envs, num_actions), True where the action is legal
+            player_ids: (num_envs,), the player that has to act in each game
+
+        When a game finishes during `step`, its payoffs are reported and (by default)
+        the game is reset in place, so every slot always holds a live game.
+
+        Note: The returned arrays are owned by the env and overwritten on every call.
+              Copy them if they must outlive the next `step`.
+    '''
+
+    def __init__(self, num_envs, config=None):
+        ''' Initialize the vectorized environment
+
+        Args:
+            num_envs (int): The number of games stepped in lockstep
+            config (dict): Optional settings. Currently, the dictionary includes:
+                'seed' (int) - A base random seed. Game i is seeded with seed + i.
+                'auto_reset' (boolean) - True if finished games are reset in `step`.
+                'obs_dtype' (str) - None or 'int8'. The obs is not binary, so 'bool'
+                 and 'packed' are not supported.
+        '''
+        if num_envs <= 0:
+            raise ValueError('ButifarraVectorEnv needs at least one game, not {}'.format(num_envs))
+        config = {} if config is None else config
+        self.name = 'butifarra'
+        self.num_envs = num_envs
+        self.auto_reset = config.get('auto_reset', True)
+        self.obs_dtype = config.get('obs_dtype')
+        if self.obs_dtype not in (None, 'int8'):
+            raise ValueError('ButifarraVectorEnv supports obs_dtype None or int8, not {}'.format(self.obs_dtype))
+
+        self.games = [ButifarraGame() for _ in range(num_envs)]
+        self.payoff_delegate = DefaultButifarraPayoffDelegate()
+        self.state_extractor = IncrementalHiddenButifarraStateExtractor()
+
+        self.num_players = self.games[0].get_num_players()
+        self.num_actions = self.games[0].get_num_actions()
+        self.state_size = self.state_extractor.get_state_shape_size()
+        self.state_shape = [[1, self.state_size] for _ in range(self.num_players)]
+
+        self.obs = np.zeros((num_envs, self.state_size), dtype=np.int8 if self.obs_dtype == 'int8' else int)
+        self.legal_actions_mask = np.zeros((num_envs, self.num_actions), dtype=bool)
+        self.player_ids = np.zeros(num_envs, dtype=int)
+
+        self.seed(config.get('seed'))
+
+    def seed(self, seed=None):
+        ''' Seed every game. Game i gets its own generator derived from seed + i.
+
+        Returns:
+            (list): The seeds actually used by each game
+        '''
+        seeds = []
+        for i, game in enumerate(self.games):
+            game.np_random, game_seed = seeding.np_random(None if seed is None else seed + i)
+            seeds.append(game_seed)
+        return seeds
+
+    def reset(self):
+        ''' Start a new game in every slot
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations, (num_envs, state_size)
+                (numpy.array): The legal action masks, (num_envs, num_actions)
+                (numpy.array): The ids of the players to act, (num_envs,)
+        '''
+        for i in range(self.num_envs):
+            self._reset_game(i)
+        return self.obs, self.legal_actions_mask, self.player_ids
+
+    def step(self, actions):
+        ''' Apply one action in every game
+
+        Args:
+            actions (numpy.array): (num_envs,) action ids, one per game
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations, (num_envs, state_size)
+                (numpy.array): The legal action masks, (num_envs, num_actions)
+                (numpy.array): The ids of the players to act, (num_envs,)
+                (numpy.array): The payoffs of the games finished by this step, (num_envs, num_players).
+                               Rows of unfinished games are zero.
+                (numpy.array): (num_envs,) True where the game finished during this step
+
+        Note: With 'auto_reset' on, the observation of a finished game is the first
+              observation of the new game started in its slot. With 'auto_reset' off,
+              the actions given for games that are already over are ignored.
+        '''
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError('Expected {} actions, got shape {}'.format(self.num_envs, actions.shape))
+        payoffs = np.zeros((self.num_envs, self.num_players))
+        dones = np.zeros(self.num_envs, dtype=bool)
+        for i, game in enumerate(self.games):
+            if game.is_over():
+                continue
+            game.step(ActionEvent.from_action_id(action_id=int(actions[i])))
+            if game.is_over():
+                dones[i] = True
+                payoffs[i] = self.payoff_delegate.get_payoffs(game=game)
+                if self.auto_reset:
+                    self._reset_game(i)
+                    continue
+            self._write_state(i)
+        return self.obs, self.legal_actions_mask, self.player_ids, payoffs, dones
+
+    def get_payoffs(self):
+        ''' Get the payoffs of every game in its current state
+
+        Returns:
+            (numpy.array): (num_envs, num_players) payoffs
+        '''
+        return np.stack([self.payoff_delegate.get_payoffs(game=game) for game in self.games])
+
+    def is_over(self):
+        ''' Check which games are over
+
+        Returns:
+            (numpy.array): (num_envs,) True where the game is over
+        '''
+        return np.array([bool(game.is_over()) for game in self.games])
+
+    def _reset_game(self, index):
+        self.games[index].init_game()
+        self._write_state(index)
+
+    def _write_state(self, index):
+        game = self.games[index]
+        self.legal_actions_mask[index] = False
+        if game.is_over():
+            return
+        extracted_state = self.state_extractor.extract_state(game=game)
+        self.obs[index] = extracted_state['obs']
+        self.legal_actions_mask[index, list(extracted_state['legal_actions'].keys())] = True
+        self.player_ids[index] = game.round.current_player_id
@@ -1,4 +1,5 @@
 from rlcard.utils import *
+from rlcard.utils.trajectory import EpisodeRecorder
 
 from rlcard.games.butifarra.utils.action_event import ActionEvent
 from rlcard.games.butifarra.utils.butifarra_card import ButifarraCard
@@ -19,6 +20,9 @@ class Env(object):
                 'seed' (int) - A environment local random seed.
                 'allow_step_back' (boolean) - True if allowing
                  step_back.
+                'obs_dtype' (str) - None to keep the obs of the extractor,
+                 'int8' or 'bool' to convert it, or 'packed' for the bits of
+                 a binary obs packed with np.packbits (see unpack_obs).
                 There can be some game specific configurations, e.g., the
                 number of players in the game. These fields should start with
                 'game_', e.g., 'game_num_players' which specify the number of
@@ -29,7 +33,11 @@ class Env(object):
                 TODO: Support more game configurations in the future.
         '''
         self.allow_step_back = self.game.allow_step_back = config['allow_step_back']
+        self.obs_dtype = config.get('obs_dtype')
+        if self.obs_dtype not in OBS_DTYPES:
+            raise ValueError('obs_dtype should be one of {}, not {}'.format(OBS_DTYPES, self.obs_dtype))
         self.action_recorder = []
+        self.episode_recorder = None  # created by run_columnar
 
         # Game specific configurations
         # Currently only support blackjack、limit-holdem、no-limit-holdem
@@ -64,7 +72,7 @@ class Env(object):
         '''
         state, player_id = self.game.init_game()
         self.action_recorder = []
-        return self._extract_state(state), player_id
+        return self._convert_state(self._extract_state(state)), player_id
 
     def step(self, action, raw_action=False):
         ''' Step forward
@@ -87,7 +95,7 @@ class Env(object):
         self.action_recorder.append((self.get_player_id(), action))
         next_state, player_id = self.game.step(action)
 
-        return self._extract_state(next_state), player_id
+        return self._convert_state(self._extract_state(next_state)), player_id
 
     def step_back(self):
         ''' Take one step backward.
@@ -187,6 +195,61 @@ class Env(object):
 
         return trajectories, payoffs
 
+    def run_columnar(self, is_training=False):
+        '''
+        Run a complete game like `run`, recording the trajectories into columnar episodes.
+
+        Args:
+            is_training (boolean): True if for training purpose.
+
+        Returns:
+            (tuple) Tuple containing:
+
+                (list): One rlcard.utils.trajectory.Episode per player, holding the transitions
+                        that reorganize would build from the trajectories of `run`.
+                (list): A list payoffs. Each entry corresponds to one player.
+
+        Note: Only obs and the legal actions of the states are recorded, not the raw states.
+        '''
+        if self.episode_recorder is None:
+            self.episode_recorder = EpisodeRecorder(self.num_players, self.num_actions)
+        recorder = self.episode_recorder
+        recorder.start()
+        state, player_id = self.reset()
+
+        # Loop to play the game
+        recorder.add_state(player_id, state)
+        while not self.is_over():
+            # Agent plays
+            agent = self.agents[player_id]
+            if not is_training:
+                action, _ = agent.eval_step(state)
+            else:
+                action = agent.step(state)
+
+            # Environment steps
+            next_state, next_player_id = self.step(action, agent.use_raw)
+            if agent.use_raw:
+                action = list(state['legal_actions'].keys())[state['raw_legal_actions'].index(action)]
+            recorder.add_action(player_id, action)
+
+            # Set the state and player
+            state = next_state
+            player_id = next_player_id
+
+            # Save state.
+            if not self.game.is_over():
+                recorder.add_state(player_id, state)
+
+        # Add a final state to all the players
+        for player_id in range(self.num_players):
+            recorder.add_state(player_id, self.get_state(player_id))
+
+        # Payoffs
+        payoffs = self.get_payoffs()
+
+        return recorder.finish(payoffs), payoffs
+
     def is_over(self):
         ''' Check whether the curent game is over
 
@@ -213,7 +276,7 @@ class Env(object):
         Returns:
             (numpy.array): The observed state of the player
         '''
-        return self._extract_state(self.game.get_state(player_id))
+        return self._convert_state(self._extract_state(self.game.get_state(player_id)))
 
     def get_payoffs(self):
         ''' Get the payoffs of players. Must be implemented in the child class.
@@ -260,6 +323,19 @@ class Env(object):
         '''
         raise NotImplementedError
 
+    def _convert_state(self, state):
+        ''' Convert the obs of an extracted state to obs_dtype
+
+        Args:
+            state (dict): The extracted state
+
+        Returns:
+            (dict): The extracted state, with the converted obs
+        '''
+        if self.obs_dtype is not None:
+            state['obs'] = convert_obs(state['obs'], self.obs_dtype)
+        return state
+
     def _decode_action(self, action_id):
         ''' Decode Action id to the action in the game.
 
@@ -0,0 +1,292 @@
+''' A pool of environments stepped in worker processes
+'''
+import multiprocessing
+import time
+import traceback
+from multiprocessing.connection import wait
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+import numpy as np
+
+from rlcard.envs.registration import make
+
+
+def _attach(buffers):
+    ''' Map the shared memory blocks described by buffers as numpy arrays
+
+    Args:
+        buffers (dict): name -> (shared memory name, shape, dtype)
+
+    Returns:
+        (tuple): The shared memory blocks and the dict of arrays
+    '''
+    blocks, arrays = [], {}
+    for name, (shm_name, shape, dtype) in buffers.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        blocks.append(shm)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return blocks, arrays
+
+
+def _worker(connection, env_id, config, index, buffers):
+    ''' Host one environment until the pool closes the connection
+
+        The worker receives action ids (None for a reset, and a closed pipe or
+        'close' to stop), writes the new state into row index of the shared
+        arrays and answers with its index and None. If the environment raises,
+        the worker answers with its index and the formatted traceback, and stops.
+
+    Args:
+        connection (Connection): The worker end of the pipe to the pool
+        env_id (str): The registered environment
+        config (dict): The config of the environment, with the seed of the worker
+        index (int): The row of the environment in the shared arrays
+        buffers (dict): The shared arrays, as given to _attach
+    '''
+    env = make(env_id, config=config)
+    blocks, arrays = _attach(buffers)
+
+    def write_state(state, player_id):
+        arrays['obs'][index] = state['obs']
+        arrays['legal_actions_mask'][index] = False
+        arrays['legal_actions_mask'][index, list(state['legal_actions'].keys())] = True
+        arrays['player_ids'][index] = player_id
+
+    try:
+        while True:
+            action = connection.recv()
+            if action == 'close':
+                break
+            arrays['dones'][index] = False
+            arrays['payoffs'][index] = 0
+            try:
+                if action is None:
+                    write_state(*env.reset())
+                else:
+                    state, player_id = env.step(action)
+                    if env.is_over():
+                        arrays['dones'][index] = True
+                        arrays['payoffs'][index] = env.get_payoffs()
+                        state, player_id = env.reset()
+                    write_state(state, player_id)
+            except Exception:
+                connection.send((index, traceback.format_exc()))
+                break
+            connection.send((index, None))
+    except EOFError:
+        pass
+    finally:
+        del arrays
+        for shm in blocks:
+            shm.close()
+        connection.close()
+
+
+class EnvPool(object):
+    ''' Hosts `num_envs` copies of a registered environment in worker processes
+
+        The workers write the observations, legal actions and payoffs into stacked
+        numpy arrays in shared memory, and only action ids and acknowledgements go
+        through the pipes, so a single learner can keep every core busy:
+
+            obs: (num_envs,) + obs_shape
+            legal_actions_mask: (num_envs, num_actions), True where the action is legal
+            player_ids: (num_envs,), the player that has to act in each game
+            payoffs: (num_envs, num_players), the payoffs of the game finished by the last step
+            dones: (num_envs,), True where the last step finished the game
+
+        A finished game is reset in its worker, so the observation of a done
+        environment is the first observation of its new game.
+
+        The pool is driven either synchronously with `step`, which steps every
+        environment and waits for all of them, or asynchronously with `send`,
+        which steps some environments, and `recv`, which returns the indices of
+        the first pending environments to be ready.
+
+        Note: The arrays returned by `reset` and `step` are the shared arrays and are
+              overwritten by the workers. Copy them if they must outlive the next step.
+    '''
+
+    def __init__(self, env_id, num_envs, config=None):
+        ''' Initialize the pool and start the workers
+
+        Args:
+            env_id (str): The registered environment
+            num_envs (int): The number of environments, one worker process each
+            config (dict): The config of the environments. Environment i is seeded
+                with config['seed'] + i if a seed is given.
+        '''
+        if shared_memory is None:
+            raise ImportError('EnvPool needs multiprocessing.shared_memory, which requires Python 3.8 or later')
+        if num_envs <= 0:
+            raise ValueError('EnvPool needs at least one environment, not {}'.format(num_envs))
+        config = dict(config or {})
+        self.env_id = env_id
+        self.num_envs = num_envs
+
+        # Probe the shapes on a local copy of the environment
+        env = make(env_id, config=config)
+        state, _ = env.reset()
+        obs = np.asarray(state['obs'])
+        self.num_players = env.num_players
+        self.num_actions = env.num_actions
+        self.state_shape = env.state_shape
+
+        specs = {
+            'obs': ((num_envs,) + obs.shape, obs.dtype),
+            'legal_actions_mask': ((num_envs, self.num_actions), np.bool_),
+            'player_ids': ((num_envs,), np.int64),
+            'payoffs': ((num_envs, self.num_players), np.float64),
+            'dones': ((num_envs,), np.bool_),
+        }
+        # The shared memory is created before the workers so that they share its resource tracker
+        self._blocks = {}
+        buffers = {}
+        for name, (shape, dtype) in specs.items():
+            dtype = np.dtype(dtype)
+            shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+            self._blocks[name] = shm
+            buffers[name] = (shm.name, shape, dtype)
+            setattr(self, name, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+        self.workers = []
+        self.connections = []
+        self._pending = set()
+        seed = config.get('seed')
+        for index in range(num_envs):
+            worker_config = dict(config)
+            worker_config['seed'] = None if seed is None else seed + index
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_worker,
+                                             args=(worker_connection, env_id, worker_config, index, buffers),
+                                             daemon=True)
+            worker.start()
+            worker_connection.close()
+            self.workers.append(worker)
+            self.connections.append(connection)
+
+    def reset(self):
+        ''' Start a new game in every environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations
+                (numpy.array): The legal action masks, (num_envs, num_actions)
+                (numpy.array): The ids of the players to act, (num_envs,)
+        '''
+        self.recv(min_ready=len(self._pending))
+        self.send([None] * self.num_envs)
+        self.recv(min_ready=self.num_envs)
+        return self.obs, self.legal_actions_mask, self.player_ids
+
+    def step(self, actions):
+        ''' Apply one action in every environment and wait for all of them
+
+        Args:
+            actions (numpy.array): (num_envs,) action ids, one per environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations
+                (numpy.array): The legal action masks, (num_envs, num_actions)
+                (numpy.array): The ids of the players to act, (num_envs,)
+                (numpy.array): The payoffs of the games finished by this step, (num_envs, num_players).
+                               Rows of unfinished games are zero.
+                (numpy.array): (num_envs,) True where the game finished during this step
+        '''
+        if len(actions) != self.num_envs:
+            raise ValueError('Expected {} actions, got {}'.format(self.num_envs, len(actions)))
+        self.send(actions)
+        self.recv(min_ready=self.num_envs)
+        return self.obs, self.legal_actions_mask, self.player_ids, self.payoffs, self.dones
+
+    def send(self, actions, indices=None):
+        ''' Start stepping some environments without waiting for them
+
+        Args:
+            actions (list): The action ids, or None to reset the environment
+            indices (list): The environments to step, all of them if None
+        '''
+        indices = range(self.num_envs) if indices is None else indices
+        stepping = self._pending.intersection(indices)
+        if stepping:
+            raise ValueError('Environments {} are still stepping'.format(sorted(stepping)))
+        for index, action in zip(indices, actions):
+            self.connections[index].send(None if action is None else int(action))
+            self._pending.add(index)
+
+    def recv(self, min_ready=1, timeout=None):
+        ''' Wait until at least min_ready of the pending environments are ready
+
+        Args:
+            min_ready (int): The number of environments to wait for
+            timeout (float): The maximum time to wait in seconds, None to wait as long as needed
+
+        Returns:
+            (numpy.array): The indices of the ready environments, in increasing order. Their rows
+                of obs, legal_actions_mask, player_ids, payoffs and dones hold the new states.
+
+        Raises:
+            RuntimeError: If the environment of a worker raised or the worker died. The
+                worker is stopped and its environment is no longer pending.
+        '''
+        ready = []
+        min_ready = min(min_ready, len(self._pending))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(ready) < min_ready:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            pending = {self.connections[index]: index for index in self._pending}
+            ready_connections = wait(list(pending), timeout=remaining)
+            if not ready_connections:
+                break
+            for connection in ready_connections:
+                index = pending[connection]
+                self._pending.discard(index)
+                try:
+                    _, error = connection.recv()
+                except EOFError:
+                    error = 'The worker exited'
+                if error is not None:
+                    raise RuntimeError('Worker {} of the EnvPool failed:\n{}'.format(index, error))
+                ready.append(index)
+        return np.array(sorted(ready), dtype=np.int64)
+
+    def close(self):
+        ''' Stop the workers and release the shared memory
+
+            Workers that failed or died are tolerated, and the shared memory is
+            released in any case.
+        '''
+        try:
+            while self._pending:
+                try:
+                    self.recv(min_ready=len(self._pending))
+                except RuntimeError:
+                    pass
+            for connection in self.connections:
+                try:
+                    connection.send('close')
+                except (EOFError, BrokenPipeError):
+                    pass
+                connection.close()
+            for worker in self.workers:
+                worker.join()
+        finally:
+            self.workers = []
+            self.connections = []
+            for name, shm in self._blocks.items():
+                setattr(self, name, None)
+                shm.close()
+                shm.unlink()
+            self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
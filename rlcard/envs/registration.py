@@ -4,6 +4,7 @@ import importlib
 DEFAULT_CONFIG = {
         'allow_step_back': False,
         'seed': None,
+        'obs_dtype': None,
         }
 
 class EnvSpec(object):
@@ -18,8 +19,19 @@ class EnvSpec(object):
             entry_point (string): A string the indicates the location of the envronment class
         '''
         self.env_id = env_id
-        mod_name, class_name = entry_point.split(':')
-        self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        self.entry_point = entry_point
+        self._entry_point = None
+
+    def load_entry_point(self):
+        ''' Import the environment class the first time it is needed
+
+        Returns:
+            (class): The environment class
+        '''
+        if self._entry_point is None:
+            mod_name, class_name = self.entry_point.split(':')
+            self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        return self._entry_point
 
     def make(self, config=DEFAULT_CONFIG):
         ''' Instantiates an instance of the environment
@@ -28,7 +40,7 @@ class EnvSpec(object):
             env (Env): An instance of the environemnt
             config (dict): A dictionary of the environment settings
         '''
-        env = self._entry_point(config)
+        env = self.load_entry_point()(config)
         return env
 
 class EnvRegistry(object):
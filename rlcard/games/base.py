@@ -1,5 +1,9 @@
 ''' Game-related base classes
 '''
+# The cards of every card class, keyed by the class and the suit and rank of the card
+_interned_cards = {}
+
+
 class Card:
     '''
     Card stores the suit and rank of a single card
@@ -7,23 +11,61 @@ class Card:
     Note:
         The suit variable in a standard card game should be one of [S, H, D, C, BJ, RJ] meaning [Spades, Hearts, Diamonds, Clubs, Black Joker, Red Joker]
         Similarly the rank variable should be one of [A, 2, 3, 4, 5, 6, 7, 8, 9, T, J, Q, K]
+
+        Cards are immutable and interned: Card(suit, rank) returns the one instance of
+        the card for its class, and copying or pickling a card returns that instance.
+        card_id is the integer id of the card, its index in init_54_deck for a standard card.
     '''
-    suit = None
-    rank = None
+    __slots__ = ('suit', 'rank', 'card_id', '_hash')
     valid_suit = ['S', 'H', 'D', 'C', 'BJ', 'RJ']
     valid_rank = ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K']
 
-    def __init__(self, suit, rank):
-        ''' Initialize the suit and rank of a card
+    def __new__(cls, suit, rank):
+        ''' Return the card of the suit and rank
 
         Args:
             suit: string, suit of the card, should be one of valid_suit
             rank: string, rank of the card, should be one of valid_rank
         '''
-        self.suit = suit
-        self.rank = rank
+        key = (cls, suit, rank)
+        card = _interned_cards.get(key)
+        if card is None:
+            card = object.__new__(cls)
+            object.__setattr__(card, 'suit', suit)
+            object.__setattr__(card, 'rank', rank)
+            object.__setattr__(card, 'card_id', card._get_card_id())
+            if suit in Card.valid_suit and rank in Card.valid_rank:
+                object.__setattr__(card, '_hash', Card.valid_rank.index(rank) + 100 * Card.valid_suit.index(suit))
+            else:
+                object.__setattr__(card, '_hash', hash((suit, rank)))
+            _interned_cards[key] = card
+        return card
+
+    def _get_card_id(self):
+        if self.suit in ('BJ', 'RJ'):
+            return 48 + Card.valid_suit.index(self.suit)
+        if self.suit in Card.valid_suit and self.rank in Card.valid_rank:
+            return 13 * Card.valid_suit.index(self.suit) + Card.valid_rank.index(self.rank)
+        return None
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), (self.suit, self.rank)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, Card):
             return self.rank == other.rank and self.suit == other.suit
         else:
@@ -31,9 +73,7 @@ class Card:
             return NotImplemented
 
     def __hash__(self):
-        suit_index = Card.valid_suit.index(self.suit)
-        rank_index = Card.valid_rank.index(self.rank)
-        return rank_index + 100 * suit_index
+        return self._hash
 
     def __str__(self):
         ''' Get string representation of a card.
@@ -1,5 +1,4 @@
 from rlcard.utils import init_standard_deck
-import numpy as np
 
 class BlackjackDealer:
 
@@ -19,9 +18,7 @@ class BlackjackDealer:
     def shuffle(self):
         ''' Shuffle the deck
         '''
-        shuffle_deck = np.array(self.deck)
-        self.np_random.shuffle(shuffle_deck)
-        self.deck = list(shuffle_deck)
+        self.np_random.shuffle(self.deck)
 
     def deal_card(self, player):
         ''' Distribute one card to the player
@@ -1,4 +1,3 @@
-from copy import deepcopy
 import numpy as np
 
 from rlcard.games.blackjack import Dealer
@@ -64,10 +63,7 @@ class BlackjackGame:
             int: next plater's id
         '''
         if self.allow_step_back:
-            p = deepcopy(self.players[self.game_pointer])
-            d = deepcopy(self.dealer)
-            w = deepcopy(self.winner)
-            self.history.append((d, p, w))
+            self.history.append(self.journal())
 
         next_state = {}
         # Play hit
@@ -130,10 +126,37 @@ class BlackjackGame:
         '''
         #while len(self.history) > 0:
         if len(self.history) > 0:
-            self.dealer, self.players[self.game_pointer], self.winner = self.history.pop()
+            self.rewind(self.history.pop())
             return True
         return False
 
+    def journal(self):
+        ''' Record the deltas of one step instead of copying the dealer and the player:
+        the game pointer, the hand sizes, statuses and scores, the deck, the winners
+        and the random state the dealer draws cards with
+
+        Returns:
+            entry (tuple): the entry to pass to rewind
+        '''
+        player = self.players[self.game_pointer]
+        return (self.game_pointer, len(player.hand), player.status, player.score,
+                len(self.dealer.hand), self.dealer.status, self.dealer.score,
+                list(self.dealer.deck), dict(self.winner), self.dealer.np_random.get_state())
+
+    def rewind(self, entry):
+        ''' Undo one step from the entry recorded by journal
+
+        Args:
+            entry (tuple): the entry returned by journal
+        '''
+        self.game_pointer, num_player_cards, player_status, player_score, num_dealer_cards, \
+            self.dealer.status, self.dealer.score, self.dealer.deck, self.winner, random_state = entry
+        player = self.players[self.game_pointer]
+        del player.hand[num_player_cards:]
+        player.status, player.score = player_status, player_score
+        del self.dealer.hand[num_dealer_cards:]
+        self.dealer.np_random.set_state(random_state)
+
     def get_num_players(self):
         ''' Return the number of players in blackjack
 
@@ -20,11 +20,12 @@ class BridgeCard(Card):
     def get_deck() -> [Card]:
         return _deck.copy()
 
-    def __init__(self, suit: str, rank: str):
-        super().__init__(suit=suit, rank=rank)
+    __slots__ = ()
+
+    def _get_card_id(self):
         suit_index = BridgeCard.suits.index(self.suit)
         rank_index = BridgeCard.ranks.index(self.rank)
-        self.card_id = 13 * suit_index + rank_index
+        return 13 * suit_index + rank_index
 
     def __str__(self):
         return f'{self.rank}{self.suit}'
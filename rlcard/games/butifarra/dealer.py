@@ -13,13 +13,26 @@ from .utils.butifarra_card import ButifarraCard
 class ButifarraDealer:
     ''' Initialize a BridgeDealer dealer class
     '''
-    def __init__(self, np_random):
+    def __init__(self, np_random, shuffled_deck: List[ButifarraCard] = None):
         ''' set shuffled_deck, set stock_pile
         '''
         self.np_random = np_random
-        self.shuffled_deck: List[ButifarraCard] = ButifarraCard.get_deck()  # keep a copy of the shuffled cards at start of new hand
-        self.np_random.shuffle(self.shuffled_deck)
-        self.stock_pile: List[ButifarraCard] = self.shuffled_deck.copy()
+        self.shuffled_deck: List[ButifarraCard] = []  # keep a copy of the shuffled cards at start of new hand
+        self.stock_pile: List[ButifarraCard] = []
+        self.shuffle(shuffled_deck=shuffled_deck)
+
+    def shuffle(self, shuffled_deck: List[ButifarraCard] = None):
+        ''' Shuffle the deck for a new hand and refill the stock_pile, reusing the lists of the last hand
+
+        Args:
+            shuffled_deck (list): The order of the cards to deal instead of a random one, to replay a hand
+        '''
+        if shuffled_deck is None:
+            self.shuffled_deck[:] = ButifarraCard.get_deck()
+            self.np_random.shuffle(self.shuffled_deck)
+        else:
+            self.shuffled_deck[:] = shuffled_deck
+        self.stock_pile[:] = self.shuffled_deck
 
     def deal_cards(self, player: ButifarraPlayer, num: int):
         ''' Deal some cards from stock_pile to one player
@@ -28,5 +41,8 @@ class ButifarraDealer:
             player (ButifarraPlayer): The ButifarraPlayer object
             num (int): The number of cards to be dealt
         '''
-        for _ in range(num):
-            player.hand.append(self.stock_pile.pop())
+        if num > 0:
+            # the top num cards, in the order they would be popped
+            cards = self.stock_pile[:-num - 1:-1]
+            del self.stock_pile[-num:]
+            player.add_cards_to_hand(cards)
@@ -11,17 +11,25 @@ import numpy as np
 from .judger import ButifarraJudger
 from .round import ButifarraRound
 from .utils.action_event import ActionEvent, CallActionEvent, PlayCardAction
+from .utils.butifarra_card import ButifarraCard
+
+# to_bytes layout: a header of board_id, the number of actions, doubling_cube and the won bases
+# counts of both sides (4 bits each), the rank of the deal among the 48! orders of the deck,
+# then the action ids packed in 6 bits each
+_HEADER_SIZE = 4
+_DEAL_SIZE = 26  # 48! < 2 ** 208
+_ACTION_ID_BITS = 6
 
 
 class ButifarraGame:
     ''' Game class. This class will interact with outer environment.
     '''
 
-    def __init__(self, allow_step_back=False):
+    def __init__(self, allow_step_back=False, np_random=None):
         '''Initialize the class ButifarraGame
         '''
         self.allow_step_back: bool = allow_step_back
-        self.np_random = np.random.RandomState()
+        self.np_random = np.random.RandomState() if np_random is None else np_random
         self.judger: ButifarraJudger = ButifarraJudger(game=self)
         self.actions: [ActionEvent] = []  # must reset in init_game
         self.round: ButifarraRound or None = None  # must reset in init_game
@@ -30,9 +38,17 @@ class ButifarraGame:
     def init_game(self):
         ''' Initialize all characters in the game and start round 1
         '''
-        board_id = self.np_random.choice([1, 2, 3, 4])
-        self.actions: List[ActionEvent] = []
-        self.round = ButifarraRound(num_players=self.num_players, board_id=board_id, np_random=self.np_random)
+        board_id = 1 + self.np_random.randint(4)  # the same draw as np_random.choice([1, 2, 3, 4])
+        return self._deal(board_id=board_id)
+
+    def _deal(self, board_id: int, shuffled_deck: List[ButifarraCard] = None):
+        self.actions.clear()
+        if self.round is None:
+            self.round = ButifarraRound(num_players=self.num_players, board_id=board_id, np_random=self.np_random,
+                                        shuffled_deck=shuffled_deck)
+        else:
+            # deal the new hand into the objects of the last one
+            self.round.reset(board_id=board_id, np_random=self.np_random, shuffled_deck=shuffled_deck)
         for player_id in range(4):
             player = self.round.players[player_id]
             self.round.dealer.deal_cards(player=player, num=12)
@@ -54,6 +70,86 @@ class ButifarraGame:
         next_state = self.get_state(player_id=next_player_id)
         return next_state, next_player_id
 
+    def step_back(self) -> bool:
+        ''' Return to the previous state of the game
+
+        The round undoes the last action from its undo_log, so nothing is copied in step.
+
+        Returns:
+            (bool): True if the game steps back successfully; False at the start of the game
+        '''
+        if not self.actions:
+            return False
+        self.round.step_back()
+        self.actions.pop()
+        return True
+
+    def to_bytes(self) -> bytes:
+        ''' Encode the game: the deal, the actions taken and the counters they lead to
+
+        A finished hand is encoded in about 70 bytes: 4 for the header, 26 for the deal and
+        42 for 56 actions.
+
+        Returns:
+            (bytes): The encoding, to restore the game with from_bytes
+        '''
+        won_bases_counts = self.round.won_bases_counts
+        header = bytes([self.round.board_id, len(self.actions), self.round.doubling_cube,
+                        won_bases_counts[0] << 4 | won_bases_counts[1]])
+        action_bits = 0
+        for action in self.actions:
+            action_bits = action_bits << _ACTION_ID_BITS | action.action_id
+        num_action_bytes = (_ACTION_ID_BITS * len(self.actions) + 7) // 8
+        return header + _rank_deal(self.round.dealer.shuffled_deck).to_bytes(_DEAL_SIZE, 'big') \
+            + action_bits.to_bytes(num_action_bytes, 'big')
+
+    @classmethod
+    def from_bytes(cls, data: bytes, allow_step_back=False, np_random=None):
+        ''' Restore a game encoded by to_bytes, by dealing its hand and replaying its actions
+
+        Each action is checked against the legal actions before it is replayed, and the
+        replayed counters against the encoded ones, so a corrupt encoding raises an Exception.
+
+        Args:
+            data (bytes): The encoding
+            allow_step_back (bool): The allow_step_back of the game
+            np_random: The random state of the game, for its next hands. A new one if None.
+
+        Returns:
+            (ButifarraGame): The game
+        '''
+        game = cls(allow_step_back=allow_step_back, np_random=np_random)
+        game._restore(data)
+        return game
+
+    def clone(self):
+        ''' Return a copy of the game restored from to_bytes
+
+        The copy shares the np_random of the game, which is only drawn from by init_game,
+        as creating a RandomState costs more than restoring a whole hand.
+        '''
+        return ButifarraGame.from_bytes(self.to_bytes(), allow_step_back=self.allow_step_back, np_random=self.np_random)
+
+    def _restore(self, data: bytes):
+        board_id, num_actions, doubling_cube, won_bases_counts = data[:_HEADER_SIZE]
+        deal_end = _HEADER_SIZE + _DEAL_SIZE
+        if len(data) != deal_end + (_ACTION_ID_BITS * num_actions + 7) // 8:
+            raise Exception(f'ButifarraGame from_bytes: invalid size={len(data)} for {num_actions} actions')
+        self._deal(board_id=board_id, shuffled_deck=_unrank_deal(int.from_bytes(data[_HEADER_SIZE:deal_end], 'big')))
+        action_bits = int.from_bytes(data[deal_end:], 'big')
+        for shift in range(_ACTION_ID_BITS * (num_actions - 1), -1, -_ACTION_ID_BITS):
+            action = ActionEvent.from_action_id(action_bits >> shift & ((1 << _ACTION_ID_BITS) - 1))
+            if self.is_over() or action not in self.judger.get_legal_actions():
+                raise Exception(f'ButifarraGame from_bytes: illegal action={action} after {len(self.actions)} actions')
+            if isinstance(action, PlayCardAction):
+                self.round.play_card(action=action)
+            else:
+                self.round.make_call(action=action)
+            self.actions.append(action)
+        if (self.round.doubling_cube, self.round.won_bases_counts) != \
+                (doubling_cube, [won_bases_counts >> 4, won_bases_counts & 15]):
+            raise Exception('ButifarraGame from_bytes: the replayed actions do not match the encoded counters')
+
     def get_num_players(self) -> int:
         ''' Return the number of players in the game
         '''
@@ -91,3 +187,28 @@ class ButifarraGame:
             state['current_player_id'] = self.round.current_player_id
             state['hand'] = self.round.players[player_id].hand
         return state
+
+
+def _rank_deal(shuffled_deck: List[ButifarraCard]) -> int:
+    ''' Return the rank of the order of the deck, in [0, 48!), as a number in the factorial base
+    '''
+    remaining_card_ids = list(range(48))
+    rank = 0
+    for card in shuffled_deck:
+        index = remaining_card_ids.index(card.card_id)
+        rank = rank * len(remaining_card_ids) + index
+        del remaining_card_ids[index]
+    return rank
+
+
+def _unrank_deal(rank: int) -> List[ButifarraCard]:
+    ''' Return the order of the deck of the rank given by _rank_deal
+    '''
+    indices = []
+    for radix in range(1, 49):
+        rank, index = divmod(rank, radix)
+        indices.append(index)
+    if rank:
+        raise Exception('ButifarraGame from_bytes: invalid deal')
+    remaining_card_ids = list(range(48))
+    return [ButifarraCard.card(remaining_card_ids.pop(index)) for index in reversed(indices)]
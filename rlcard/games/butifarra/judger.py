@@ -12,8 +12,9 @@ if TYPE_CHECKING:
 
 from .utils.action_event import PlayCardAction
 from .utils.action_event import ActionEvent, CantarAction, DelegarAction, ContrarAction, RecontrarAction, SantVicencAction, PassarAction
-from .utils.move import MakeCantarMove, MakeDelegarMove, MakeContrarMove, MakeRecontrarMove, MakeSantVicencMove
+from .utils.move import MakeCantarMove, MakeDelegarMove, MakeContrarMove, MakeRecontrarMove
 from .utils.butifarra_card import ButifarraCard
+from .utils import card_mask
 
 
 class ButifarraJudger:
@@ -33,27 +34,15 @@ class ButifarraJudger:
         :return: List[ActionEvent] of legal actions
         """
         legal_actions: List[ActionEvent] = []
-        if not self.game.is_over():
-            current_player = self.game.round.get_current_player()
-            if not self.game.round.is_bidding_over():
-                last_delegar_move: MakeContrarMove or None = None
-                last_cantar_move: MakeCantarMove or None = None
-                last_contrar_move: MakeContrarMove or None = None
-                last_recontrar_move: MakeRecontrarMove or None = None
-                last_santvicenc_move: MakeSantVicencMove or None = None
-                num_pass_move: int = 0
-
-                for move in reversed(self.game.round.move_sheet):
-                    if isinstance(move, MakeCantarMove):
-                        last_cantar_move = move
-                    elif isinstance(move, MakeDelegarMove):
-                        last_delegar_move = move
-                    elif isinstance(move, MakeSantVicencMove):
-                        last_santvicenc_move = move
-                    elif isinstance(move, MakeRecontrarMove):
-                        last_recontrar_move = move
-                    elif isinstance(move, MakeContrarMove):
-                        last_contrar_move = move
+        game_round = self.game.round
+        if not game_round.is_over():
+            current_player = game_round.get_current_player()
+            if not game_round.is_bidding_over():
+                # The round keeps the last call of each kind
+                last_delegar_move: MakeDelegarMove or None = game_round.delegar_move
+                last_cantar_move: MakeCantarMove or None = game_round.cantar_move
+                last_contrar_move: MakeContrarMove or None = game_round.contrar_move
+                last_recontrar_move: MakeRecontrarMove or None = game_round.recontrar_move
 
                 if (not last_cantar_move):
                     legal_actions.append(ActionEvent.from_action_id(action_id=ActionEvent.bastos_action_id))
@@ -63,62 +52,35 @@ class ButifarraJudger:
                     legal_actions.append(ActionEvent.from_action_id(action_id=ActionEvent.butifarra_action_id))
 
                     if not last_delegar_move:
-                        legal_actions.append(DelegarAction())
+                        legal_actions.append(ActionEvent.from_action_id(action_id=ActionEvent.delegar_action_id))
                 
 
                 if last_cantar_move:
-                    legal_actions.append(PassarAction())
+                    legal_actions.append(ActionEvent.from_action_id(action_id=ActionEvent.passar_action_id))
                     if current_player.player_id % 2 != last_cantar_move.player.player_id % 2:
                         if not last_contrar_move:
-                            legal_actions.append(ContrarAction())
+                            legal_actions.append(ActionEvent.from_action_id(action_id=ActionEvent.contrar_action_id))
                         if last_recontrar_move:
-                            legal_actions.append(SantVicencAction())
+                            legal_actions.append(ActionEvent.from_action_id(action_id=ActionEvent.sant_vicenc_action_id))
 
                     else:
                         if last_contrar_move:
-                            legal_actions.append(RecontrarAction())
+                            legal_actions.append(ActionEvent.from_action_id(action_id=ActionEvent.recontrar_action_id))
 
             else:
-                trick_moves = self.game.round.get_bases_moves()
-                hand = self.game.round.players[current_player.player_id].hand
-                legal_cards = hand # En cas de ser la primera tirada, qualsevol carta es valida
-                if trick_moves and len(trick_moves) < 4: # si ja s'ha tirat, aqui venen les normes
-                    carta_basa: ButifarraCard = trick_moves[0].card
-                    carta_mes_alta = carta_basa
-                    jugador_guanyador = trick_moves[0].player
-
-                    pal_basa = carta_basa.suit
-                    pal_trumfo = self.game.round.get_trumfo()
-                    for move in trick_moves[1:]:
-                        if move.card.mes_alta_que(carta_mes_alta, pal_basa, pal_trumfo):
-                            carta_mes_alta = move.card
-                            jugador_guanyador = move.player
-
-                    is_basa_company = (jugador_guanyador.player_id % 2) == (current_player.player_id % 2)
-                    
-                    cartes_de_la_basa = [card for card in hand if card.suit == carta_basa.suit]
-                    
-                    if (is_basa_company):
-                        if cartes_de_la_basa: # Si hi ha alguna carta del pal de la basa, obligat a tirar basa
-                            legal_cards = cartes_de_la_basa
-                        else:
-                            legal_cards = hand 
-                    else: # de l'altre equip
-                        if cartes_de_la_basa: # Ha de jugar el pal i si pot matar
-                            cartes_basa_mes_altes = [card for card in cartes_de_la_basa if card.mes_alta_que(carta_mes_alta, pal_basa, pal_trumfo)]
-                            if cartes_basa_mes_altes: # Alguna carta de la basa pot matar la mes alta (no trumfo)
-                                legal_cards = cartes_basa_mes_altes
-                            else: # No podem matar pero tenim basa
-                                legal_cards = cartes_de_la_basa
-                        else: # No tenim cartes de la basa. Mirem si hi ha trumfo
-                            cartes_que_guanyen = [card for card in hand if card.mes_alta_que(carta_mes_alta, pal_basa, pal_trumfo)]
-                            if cartes_que_guanyen:
-                                legal_cards = cartes_que_guanyen
-                            else: # No tenim res que guany
-                                legal_cards = hand
+                trick_moves = game_round.get_bases_moves()
+                player = game_round.players[current_player.player_id]
+                # En cas de ser la primera tirada, qualsevol carta es valida. Si ja s'ha tirat:
+                #   - si la basa es de la companyia, obligat a tirar basa si es pot
+                #   - si no, ha de jugar el pal i matar si pot; sense pal, ha de matar amb trumfo si pot
+                legal_mask = card_mask.legal_cards_mask(hand_mask=player.hand_mask,
+                                                        player_id=player.player_id,
+                                                        trick_card_ids=[move.card.card_id for move in trick_moves],
+                                                        trick_player_ids=[move.player.player_id for move in trick_moves],
+                                                        trump_pal_index=game_round.get_trumfo_pal_index())
+                legal_cards = [card for card in player.hand if legal_mask & card_mask.card_masks[card.card_id]]
 
                 for card in legal_cards:
-                    action = PlayCardAction(card=card)
-                    legal_actions.append(action)
+                    legal_actions.append(ActionEvent.play_card_action(card))
 
         return legal_actions
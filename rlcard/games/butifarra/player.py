@@ -7,6 +7,7 @@
 from typing import List
 
 from .utils.butifarra_card import ButifarraCard
+from .utils import card_mask
 
 
 class ButifarraPlayer:
@@ -22,9 +23,33 @@ class ButifarraPlayer:
         self.np_random = np_random
         self.player_id: int = player_id
         self.hand: List[ButifarraCard] = []
+        self.hand_mask: int = card_mask.EMPTY_MASK  # same cards as hand, as a card_mask
 
-    def remove_card_from_hand(self, card: ButifarraCard):
-        self.hand.remove(card)
+    def reset(self):
+        ''' Empty the hand for a new hand
+        '''
+        self.hand.clear()
+        self.hand_mask = card_mask.EMPTY_MASK
+
+    def add_card_to_hand(self, card: ButifarraCard):
+        self.hand.append(card)
+        self.hand_mask |= card_mask.card_masks[card.card_id]
+
+    def add_cards_to_hand(self, cards: List[ButifarraCard]):
+        self.hand.extend(cards)
+        self.hand_mask |= card_mask.mask_from_cards(cards)
+
+    def remove_card_from_hand(self, card: ButifarraCard) -> int:
+        ''' Remove card from the hand and return the position it had, for restore_card_to_hand
+        '''
+        index = self.hand.index(card)
+        del self.hand[index]
+        self.hand_mask &= ~card_mask.card_masks[card.card_id]
+        return index
+
+    def restore_card_to_hand(self, card: ButifarraCard, index: int):
+        self.hand.insert(index, card)
+        self.hand_mask |= card_mask.card_masks[card.card_id]
 
     def __str__(self):
         return ['N', 'E', 'S', 'W'][self.player_id]
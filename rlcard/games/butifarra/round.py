@@ -13,6 +13,8 @@ from .utils.action_event import CallActionEvent, ActionEvent, DelegarAction, Can
 from .utils.move import ButifarraMove, MakeDelegarMove, MakeCantarMove, MakePassarMove, MakeContrarMove, MakeRecontrarMove, MakeSantVicencMove, DealHandMove, CallMove, PlayCardMove
 from .utils.tray import Tray
 from .utils.butifarra_card import ButifarraCard
+from .utils.card_tracker import CardTracker
+from .utils import card_mask
 
 class ButifarraRound:
 
@@ -24,17 +26,7 @@ class ButifarraRound:
     def board_id(self) -> int:
         return self.tray.board_id
 
-    @property
-    def round_phase(self):
-        if self.is_over():
-            result = 'game over'
-        elif self.is_bidding_over():
-            result = 'play card'
-        else:
-            result = 'cantar'
-        return result
-
-    def __init__(self, num_players: int, board_id: int, np_random):
+    def __init__(self, num_players: int, board_id: int, np_random, shuffled_deck: List[ButifarraCard] = None):
         ''' Initialize the round class
 
             The round class maintains the following instances:
@@ -43,74 +35,93 @@ class ButifarraRound:
                 3) current_player_id: the id of the current player who has the move
                 4) doubling_cube: 2 if contract is doubled; 4 if contract is redoubled; else 1
                 5) play_card_count: count of PlayCardMoves
-                5) move_sheet: history of the moves of the players (including the deal_hand_move)
+                6) move_sheet: history of the moves of the players (including the deal_hand_move)
+                7) card_tracker: card planes of the play phase, updated on each PlayCardMove
+                8) won_cards_masks: the cards won by each side, as card_masks
+                9) undo_log: per move, the values step_back needs to restore; the round is never copied
+                10) round_phase: 'cantar', 'play card' or 'game over', updated by make_call and play_card
+                11) pass_count: count of MakePassarMoves since the last cantar, delegar, contrar or recontrar
+                12) cantar_move, delegar_move, contrar_move, recontrar_move: the calls made, or None
+                13) declarer: the player who made the cantar_move
 
             The round class maintains a list of moves made by the players in self.move_sheet.
             move_sheet is similar to a chess score sheet.
             I didn't want to call it a score_sheet since it is not keeping score.
             I could have called move_sheet just moves, but that might conflict with the name moves used elsewhere.
             I settled on the longer name "move_sheet" to indicate that it is the official list of moves being made.
+            The move_sheet is only kept as a log: the phase and the calls of the bidding are read from
+            the fields above, so the queries of the judger and the extractors do not rescan it.
+
+            A round is created once per game: reset deals the next hand into the same
+            objects, lists and arrays.
 
         Args:
             num_players: int
             board_id: int
             np_random
+            shuffled_deck: the order of the cards to deal, None to shuffle the deck
         '''
-        tray = Tray(board_id=board_id)
-        dealer_id = tray.dealer_id
-        self.tray = tray
+        self.tray = Tray(board_id=board_id)
         self.np_random = np_random
-        self.dealer: ButifarraDealer = ButifarraDealer(self.np_random)
+        self.dealer: ButifarraDealer = ButifarraDealer(self.np_random, shuffled_deck=shuffled_deck)
         self.players: List[ButifarraPlayer] = []
         for player_id in range(num_players):
             self.players.append(ButifarraPlayer(player_id=player_id, np_random=self.np_random))
-        self.current_player_id: int = dealer_id
+        self.won_bases_counts = [0, 0]  # count of won basess by side
+        self.won_cards : List[List[ButifarraCard]] = [[],[]]
+        self.won_cards_masks: List[int] = [card_mask.EMPTY_MASK, card_mask.EMPTY_MASK]
+        self.card_tracker = CardTracker()
+        self.undo_log: List[tuple] = []
+        self.move_sheet: List[ButifarraMove] = []
+        self._reset_fields()
+
+    def reset(self, board_id: int, np_random, shuffled_deck: List[ButifarraCard] = None):
+        ''' Start a new hand in place: reshuffle the deck and empty the hands, tricks, planes and logs
+
+        Args:
+            board_id: int
+            np_random
+            shuffled_deck: the order of the cards to deal, None to shuffle the deck
+        '''
+        self.tray.board_id = board_id
+        self.np_random = np_random
+        self.dealer.np_random = np_random
+        self.dealer.shuffle(shuffled_deck=shuffled_deck)
+        for player in self.players:
+            player.np_random = np_random
+            player.reset()
+        self.won_bases_counts[:] = [0, 0]
+        for won_cards in self.won_cards:
+            won_cards.clear()
+        self.won_cards_masks[:] = [card_mask.EMPTY_MASK, card_mask.EMPTY_MASK]
+        self.card_tracker.reset()
+        self.undo_log.clear()
+        self.move_sheet.clear()
+        self._reset_fields()
+
+    def _reset_fields(self):
+        self.current_player_id: int = self.tray.dealer_id
         self.doubling_cube: int = 1
         self.is_butifarra: bool = False
         self.play_card_count: int = 0
+        self.round_phase: str = 'cantar'
+        self.pass_count: int = 0
         self.cantar_move: MakeCantarMove or None = None
         self.delegar_move: MakeDelegarMove or None = None
-        self.won_bases_counts = [0, 0]  # count of won basess by side
-        self.won_cards : List[List[ButifarraCard]] = [[],[]]
-        
-        self.move_sheet: List[ButifarraMove] = []
-        self.move_sheet.append(DealHandMove(dealer=self.players[dealer_id], shuffled_deck=self.dealer.shuffled_deck))
+        self.contrar_move: MakeContrarMove or None = None
+        self.recontrar_move: MakeRecontrarMove or None = None
+        self.declarer: ButifarraPlayer or None = None
+        self.move_sheet.append(DealHandMove(dealer=self.players[self.tray.dealer_id], shuffled_deck=self.dealer.shuffled_deck))
 
     def is_bidding_over(self) -> bool:
         ''' Return whether the current bidding is over
         '''
-
-        # Idea. Per que s'acabi la ronda inicial, cal que els dos membres d'una parella hagin passat despres que l'altra parella hagi cantat o apostat.
-        if isinstance(self.move_sheet[-1], PlayCardMove) or \
-           isinstance(self.move_sheet[-1], MakeSantVicencMove):
-            return True
-        pass_count = 0
-        for move in reversed(self.move_sheet):
-            if isinstance(move, MakePassarMove):
-                pass_count +=1
-            if isinstance(move, MakeCantarMove) or \
-               isinstance(move, MakeDelegarMove) or \
-               isinstance(move, MakeRecontrarMove) or \
-               isinstance(move, MakeContrarMove):
-                return pass_count == 2
-        
-        return False
-
+        return self.round_phase != 'cantar'
 
     def is_over(self) -> bool:
         ''' Return whether the current game is over
         '''
-        is_over = True
-        if not self.is_bidding_over():
-            is_over = False
-        elif self.cantar_move:
-            for player in self.players:
-                if player.hand:
-                    is_over = False
-                    break
-
-        if (is_over):
-            return is_over
+        return self.round_phase == 'game over'
 
     def get_current_player(self) -> ButifarraPlayer or None:
         current_player_id = self.current_player_id
@@ -137,84 +148,122 @@ class ButifarraRound:
         else:
             return self.cantar_move.action.pal
 
+    def get_trumfo_pal_index(self) -> int:
+        # NO_TRUMP_PAL_INDEX for butifarra
+        return self.cantar_move.action.pal_id
+
     def make_call(self, action: CallActionEvent):
         # when current_player takes CallActionEvent step, the move is recorded and executed
         current_player = self.players[self.current_player_id]
+        self.undo_log.append((self.current_player_id, self.doubling_cube, self.is_butifarra, self.round_phase,
+                              self.pass_count, self.cantar_move, self.delegar_move, self.contrar_move,
+                              self.recontrar_move, self.declarer))
         if isinstance(action, DelegarAction):
             make_delegar_move = MakeDelegarMove(current_player)
             self.move_sheet.append(make_delegar_move)
             self.delegar_move = make_delegar_move
+            self.pass_count = 0
             self.current_player_id = self.get_company().player_id
         elif isinstance(action, CantarAction):
             self.doubling_cube = 1
             self.is_butifarra = (action.action_id == CantarAction.butifarra_action_id)   
             make_cantar_move = MakeCantarMove(current_player, action)
             self.cantar_move = make_cantar_move
+            self.declarer = current_player
             self.move_sheet.append(make_cantar_move)
+            self.pass_count = 0
             self.current_player_id = (self.current_player_id + 1) % 4
         elif isinstance(action, ContrarAction):
             self.doubling_cube = 2
             make_contrar_move = MakeContrarMove(current_player)
             self.move_sheet.append(make_contrar_move)
+            self.contrar_move = make_contrar_move
+            self.pass_count = 0
             self.current_player_id = (self.current_player_id + 1) % 4
         elif isinstance(action, RecontrarAction):
             self.doubling_cube = 4
             make_recontrar_move = MakeRecontrarMove(current_player)
             self.move_sheet.append(make_recontrar_move)
+            self.recontrar_move = make_recontrar_move
+            self.pass_count = 0
             self.current_player_id = (self.current_player_id + 1) % 4
         elif isinstance(action, SantVicencAction):
             self.doubling_cube = 8
             make_stvicenc_move = MakeSantVicencMove(current_player)
             self.move_sheet.append(make_stvicenc_move)
+            self.round_phase = 'play card'
             # Acaba la ronda, no cal decidir seguent jugador
         elif isinstance(action, PassarAction):
             self.move_sheet.append(MakePassarMove(current_player))
+            self.pass_count += 1
             self.current_player_id = self.get_company().player_id
 
-        if self.is_bidding_over():
-            if not self.is_over():
-                self.current_player_id = self.get_left_defender().player_id
+        # Idea. Per que s'acabi la ronda inicial, cal que els dos membres d'una parella hagin passat despres que l'altra parella hagi cantat o apostat.
+        if self.pass_count == 2:
+            self.round_phase = 'play card'
+        if self.round_phase == 'play card':
+            self.current_player_id = self.get_left_defender().player_id
 
     def play_card(self, action: PlayCardAction):
         # when current_player takes PlayCardAction step, the move is recorded and executed
         current_player = self.players[self.current_player_id]
         self.move_sheet.append(PlayCardMove(current_player, action))
         card = action.card
-        current_player.remove_card_from_hand(card=card)
+        self.card_tracker.play_card(player_id=current_player.player_id, card=card,
+                                    move_index=len(self.move_sheet) - 1, trump_pal_index=self.get_trumfo_pal_index())
+        hand_index = current_player.remove_card_from_hand(card=card)
+        self.undo_log.append((self.current_player_id, hand_index))
         self.play_card_count += 1
+        self.round_phase = 'play card'
+        if not any(player.hand for player in self.players):
+            self.round_phase = 'game over'
         # update current_player_id
         bases_moves = self.get_bases_moves()
         if len(bases_moves) == 4:
-            trump_suit = self.get_trumfo()
-            winning_card = bases_moves[0].card
-            bases_winner = bases_moves[0].player
-            for move in bases_moves[1:]:
-                bases_card = move.card
-                bases_player = move.player
-                if bases_card.suit == winning_card.suit:
-                    if bases_card.card_id > winning_card.card_id:
-                        winning_card = bases_card
-                        bases_winner = bases_player
-                elif bases_card.suit == trump_suit:
-                    winning_card = bases_card
-                    bases_winner = bases_player
+            trump_pal_index = self.get_trumfo_pal_index()
+            bases_card_ids = [move.card.card_id for move in bases_moves]
+            bases_winner = bases_moves[card_mask.trick_winner_index(bases_card_ids, trump_pal_index)].player
             self.current_player_id = bases_winner.player_id
             self.won_bases_counts[bases_winner.player_id % 2] += 1
             for move in bases_moves:
                 self.won_cards[bases_winner.player_id % 2].append(move.card)
+                self.won_cards_masks[bases_winner.player_id % 2] |= card_mask.card_masks[move.card.card_id]
         else:
             self.current_player_id = (self.current_player_id + 1) % 4
 
+    def step_back(self) -> bool:
+        ''' Undo the last make_call or play_card from the undo_log
+
+        Returns:
+            (bool): True if a move was undone; False at the start of the round
+        '''
+        if not self.undo_log:
+            return False
+        move = self.move_sheet.pop()
+        if isinstance(move, PlayCardMove):
+            self.current_player_id, hand_index = self.undo_log.pop()
+            card = move.card
+            if self.play_card_count % 4 == 0:
+                bases_moves = self.move_sheet[-3:] + [move]
+                trump_pal_index = self.get_trumfo_pal_index()
+                bases_card_ids = [bases_move.card.card_id for bases_move in bases_moves]
+                won_side = bases_moves[card_mask.trick_winner_index(bases_card_ids, trump_pal_index)].player.player_id % 2
+                self.won_bases_counts[won_side] -= 1
+                del self.won_cards[won_side][-4:]
+                for bases_move in bases_moves:
+                    self.won_cards_masks[won_side] &= ~card_mask.card_masks[bases_move.card.card_id]
+            self.play_card_count -= 1
+            self.round_phase = 'play card'
+            move.player.restore_card_to_hand(card=card, index=hand_index)
+            self.card_tracker.undo_play_card()
+        else:
+            self.current_player_id, self.doubling_cube, self.is_butifarra, self.round_phase, self.pass_count, \
+                self.cantar_move, self.delegar_move, self.contrar_move, self.recontrar_move, \
+                self.declarer = self.undo_log.pop()
+        return True
+
     def get_declarer(self) -> ButifarraPlayer or None:
-        declarer = None
-        if self.cantar_move:
-            trump_suit = self.cantar_move.action.pal
-            side = self.cantar_move.player.player_id % 2
-            for move in self.move_sheet:
-                if isinstance(move, MakeCantarMove) and move.action.pal == trump_suit and move.player.player_id % 2 == side:
-                    declarer = move.player
-                    break
-        return declarer
+        return self.declarer
 
     def get_dummy(self) -> ButifarraPlayer or None:
         dummy = None
@@ -17,10 +17,16 @@ from .butifarra_card import ButifarraCard
 #       9 -> Sant Vicenç
 #        to 58 -> play_card_action_id
 # ====================================
+#
+# The 58 actions are immutable and interned: from_action_id returns the same
+# instance for an action_id every time, so decoding an action or listing the
+# legal actions does not allocate. The constructors are only used to build them.
 
 
 class ActionEvent(object):  # Interface
 
+    __slots__ = ('action_id',)
+
     delegar_action_id = 0
     orus_action_id = 1
     bastos_action_id = 2
@@ -34,7 +40,13 @@ class ActionEvent(object):  # Interface
     first_play_card_action_id = 10
 
     def __init__(self, action_id: int):
-        self.action_id = action_id
+        object.__setattr__(self, 'action_id', action_id)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
 
     def __eq__(self, other):
         result = False
@@ -42,27 +54,22 @@ class ActionEvent(object):  # Interface
             result = self.action_id == other.action_id
         return result
 
+    def __hash__(self):
+        return hash(self.action_id)
+
+    def __reduce__(self):
+        # Unpickle and copy to the interned instance
+        return ActionEvent.from_action_id, (self.action_id,)
+
     @staticmethod
     def from_action_id(action_id: int):
-        if action_id == ActionEvent.delegar_action_id:
-            return DelegarAction()
-        elif ActionEvent.orus_action_id <= action_id <= ActionEvent.butifarra_action_id:
-            pal = None if action_id == ActionEvent.butifarra_action_id else ButifarraCard.pals[action_id - ActionEvent.orus_action_id]
-            return CantarAction(pal=pal)
-        elif action_id == ActionEvent.passar_action_id:
-            return PassarAction()
-        elif action_id == ActionEvent.contrar_action_id:
-            return ContrarAction()
-        elif action_id == ActionEvent.recontrar_action_id:
-            return RecontrarAction()
-        elif action_id == ActionEvent.sant_vicenc_action_id:
-            return SantVicencAction()
-        elif ActionEvent.first_play_card_action_id <= action_id < ActionEvent.first_play_card_action_id + 48:
-            card_id = action_id - ActionEvent.first_play_card_action_id
-            card = ButifarraCard.card(card_id=card_id)
-            return PlayCardAction(card=card)
-        else:
-            raise Exception(f'ActionEvent from_action_id: invalid action_id={action_id}')
+        if 0 <= action_id < len(_action_events):
+            return _action_events[action_id]
+        raise Exception(f'ActionEvent from_action_id: invalid action_id={action_id}')
+
+    @staticmethod
+    def play_card_action(card: ButifarraCard):
+        return _action_events[ActionEvent.first_play_card_action_id + card.card_id]
 
     @staticmethod
     def get_num_actions():
@@ -71,10 +78,13 @@ class ActionEvent(object):  # Interface
         return  58 #  1 passar 1 delegar 5 cantar 3 contrar 48 cartes 
         
 class CallActionEvent(ActionEvent):  # Interface
-    pass
+
+    __slots__ = ()
 
 class PassarAction(CallActionEvent):
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(action_id=ActionEvent.passar_action_id)
 
@@ -86,6 +96,8 @@ class PassarAction(CallActionEvent):
     
 class DelegarAction(CallActionEvent):
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(action_id=ActionEvent.delegar_action_id)
 
@@ -98,6 +110,8 @@ class DelegarAction(CallActionEvent):
 
 class CantarAction(CallActionEvent):
 
+    __slots__ = ('pal_id', 'pal')
+
     accions = ['Orus', 'Bastos', 'Copes', 'Espases', 'Butifarra']
 
     def __init__(self, pal: str or None): #None for Butifarra
@@ -105,11 +119,12 @@ class CantarAction(CallActionEvent):
         if pal and pal not in pals:
             raise Exception(f'Cantar has invalid pal: {pal}')
         if pal in pals:
-            self.pal_id = pals.index(pal) 
+            pal_id = pals.index(pal) 
         else:
-            self.pal_id = 4
-        self.pal = pal
-        super().__init__(action_id=self.pal_id + 1)
+            pal_id = 4
+        object.__setattr__(self, 'pal_id', pal_id)
+        object.__setattr__(self, 'pal', pal)
+        super().__init__(action_id=pal_id + 1)
 
     def __str__(self):
         return f"{CantarAction.accions[self.pal_id]}"
@@ -120,6 +135,8 @@ class CantarAction(CallActionEvent):
 
 class ContrarAction(CallActionEvent):
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(action_id=ActionEvent.contrar_action_id)
 
@@ -130,6 +147,8 @@ class ContrarAction(CallActionEvent):
         return "Contro"
     
 class RecontrarAction(CallActionEvent):
+
+        __slots__ = ()
     
         def __init__(self):
             super().__init__(action_id=ActionEvent.recontrar_action_id)
@@ -141,6 +160,8 @@ class RecontrarAction(CallActionEvent):
             return "Recontro"
 
 class SantVicencAction(CallActionEvent):
+
+        __slots__ = ()
     
         def __init__(self):
             super().__init__(action_id=ActionEvent.sant_vicenc_action_id)
@@ -154,13 +175,22 @@ class SantVicencAction(CallActionEvent):
 
 class PlayCardAction(ActionEvent):
 
+    __slots__ = ('card',)
+
     def __init__(self, card: ButifarraCard):
         play_card_action_id = ActionEvent.first_play_card_action_id + card.card_id
         super().__init__(action_id=play_card_action_id)
-        self.card: ButifarraCard = card
+        object.__setattr__(self, 'card', card)
 
     def __str__(self):
         return f"{self.card}"
 
     def __repr__(self):
         return f"{self.card}"
+
+
+# _action_events[action_id] is the interned action of action_id
+_action_events = [DelegarAction()] + \
+    [CantarAction(pal=pal) for pal in ButifarraCard.pals] + [CantarAction(pal=None)] + \
+    [PassarAction(), ContrarAction(), RecontrarAction(), SantVicencAction()] + \
+    [PlayCardAction(card=card) for card in ButifarraCard.get_deck()]
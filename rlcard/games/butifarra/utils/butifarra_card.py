@@ -26,13 +26,15 @@ class ButifarraCard(Card):
     def get_deck() -> [Card]:
         return _deck.copy()
 
-    def __init__(self, pal: str, valor: str):
-        super().__init__(suit=pal, rank=valor)
+    __slots__ = ()
 
+    def __new__(cls, pal: str, valor: str):
+        return super().__new__(cls, suit=pal, rank=valor)
+
+    def _get_card_id(self):
         pal_index = ButifarraCard.pals.index(self.suit)
         valor_index = ButifarraCard.numero.index(self.rank)
-
-        self.card_id = 12 * pal_index + valor_index
+        return 12 * pal_index + valor_index
     
     def __repr__(self):
         return f'{self.rank}{self.suit}'
@@ -41,28 +43,11 @@ class ButifarraCard(Card):
         return self.numero_noms[self.rank] + ' ' + self.pals_noms[self.suit] 
     
     def mes_alta_que(self, carta: ButifarraCard, pal_basa : str, pal_trumfo : str or None):
-
         # Si es botifarra, pal_trumfo és None
-        # No passa res, ja que una carta no pot tenir pal none, per tant els 3 primers ifs no fan res
-        if self.suit == pal_trumfo and carta.suit == pal_trumfo:
-            return self.rank > carta.rank 
-        elif self.suit != pal_trumfo and carta.suit == pal_trumfo:
-            return False
-        elif self.suit == pal_trumfo and carta.suit != pal_trumfo:
-            return True
-        else: # Cap carta es trumfo
-            if self.suit == pal_basa and carta.suit == pal_basa:
-                return self.rank > carta.rank
-            elif self.suit != pal_basa and carta.suit == pal_basa:
-                return False
-            elif self.suit == pal_basa and carta.suit != pal_basa:
-                return True
-            else: # Aixo no hauria de passar mai
-                print("Warning")
-                return self.rank > carta.rank
-            
+        return is_card_higher(self.card_id, carta.card_id, pal_index(pal_basa), pal_index(pal_trumfo))
+
     def get_valor(self):
-        return self.valor[ButifarraCard.numero.index(self.rank)]
+        return self.valor[self.card_id % 12]
         
 
         
@@ -71,3 +56,42 @@ class ButifarraCard(Card):
 _deck = [ButifarraCard(pal=pal, valor=valor) for pal in ButifarraCard.pals for valor in ButifarraCard.numero]  # want this to be read-only
 
 
+# pal index used for the trump of a butifarra (no trump), the same as CantarAction.pal_id
+NO_TRUMP_PAL_INDEX = 4
+
+
+def pal_index(pal: str or None) -> int:
+    return NO_TRUMP_PAL_INDEX if pal is None else ButifarraCard.pals.index(pal)
+
+
+def _card_strength(card_id: int, lead_pal_index: int, trump_pal_index: int) -> int:
+    # trumps beat the lead suit, which beats the other suits; within a suit card_id follows the rank
+    card_pal_index, rank_index = divmod(card_id, 12)
+    if card_pal_index == trump_pal_index:
+        return 24 + rank_index
+    elif card_pal_index == lead_pal_index:
+        return 12 + rank_index
+    return rank_index
+
+
+# card_strengths[trump_pal_index][lead_pal_index][card_id]: the higher card of a trick has the higher strength
+card_strengths = [[[_card_strength(card_id, lead_pal_index, trump_pal_index) for card_id in range(48)]
+                   for lead_pal_index in range(4)]
+                  for trump_pal_index in range(5)]
+
+
+def card_strength(card_id: int, lead_pal_index: int, trump_pal_index: int) -> int:
+    return card_strengths[trump_pal_index][lead_pal_index][card_id]
+
+
+def is_card_higher(card_id: int, other_card_id: int, lead_pal_index: int, trump_pal_index: int) -> bool:
+    ''' Return whether card_id beats other_card_id in a trick led with lead_pal_index
+
+    Args:
+        card_id (int): The card to compare
+        other_card_id (int): The card compared against
+        lead_pal_index (int): The suit of the first card of the trick
+        trump_pal_index (int): The trump suit, NO_TRUMP_PAL_INDEX for butifarra
+    '''
+    strengths = card_strengths[trump_pal_index][lead_pal_index]
+    return strengths[card_id] > strengths[other_card_id]
@@ -0,0 +1,113 @@
+'''
+    File name: butifarra/utils/card_mask.py
+'''
+
+#
+#   48-bit integer representation of sets of Butifarra cards.
+#   Bit card_id is set when the card is in the set, so a hand, a trick or the cards won by a side
+#   is a single int and the rules become a few bit operations:
+#       - suit_masks[pal_index]: the 12 cards of a suit
+#       - higher_masks[card_id]: the cards of the same suit that rank above the card
+#       - valor_masks[valor]: the cards worth valor points
+#       - beating_masks[trump_pal_index][lead_pal_index][card_id]: the cards that beat the card in a trick
+#
+
+from typing import List
+
+from .butifarra_card import ButifarraCard, card_strengths
+
+EMPTY_MASK = 0
+FULL_MASK = (1 << 48) - 1
+
+suit_masks: List[int] = [((1 << 12) - 1) << (12 * pal_index) for pal_index in range(4)]
+
+card_masks: List[int] = [1 << card_id for card_id in range(48)]
+
+# card_id order within a suit is the rank order, so the higher cards are the upper bits of the suit
+higher_masks: List[int] = [suit_masks[card_id // 12] & ~((1 << (card_id + 1)) - 1) for card_id in range(48)]
+
+valor_masks: List[int] = [
+    sum(card_masks[card_id] for card_id in range(48) if ButifarraCard.valor[card_id % 12] == valor)
+    for valor in range(max(ButifarraCard.valor) + 1)
+]
+
+beating_masks: List[List[List[int]]] = [
+    [[sum(card_masks[other_card_id] for other_card_id in range(48) if strengths[other_card_id] > strengths[card_id])
+      for card_id in range(48)]
+     for strengths in card_strengths[trump_pal_index]]
+    for trump_pal_index in range(len(card_strengths))
+]
+
+
+def mask_from_cards(cards: List[ButifarraCard]) -> int:
+    mask = EMPTY_MASK
+    for card in cards:
+        mask |= card_masks[card.card_id]
+    return mask
+
+
+def card_ids(mask: int) -> List[int]:
+    ''' Return the card_ids in the mask in increasing order
+    '''
+    result = []
+    while mask:
+        low_bit = mask & -mask
+        result.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return result
+
+
+def count_cards(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+def count_points(mask: int) -> int:
+    ''' Return the sum of get_valor() of the cards in the mask
+    '''
+    return sum(valor * count_cards(mask & valor_masks[valor]) for valor in range(1, len(valor_masks)))
+
+
+def beating_mask(card_id: int, lead_pal_index: int, trump_pal_index: int) -> int:
+    ''' Return the mask of the cards that beat card_id in a trick led with lead_pal_index
+
+    Args:
+        card_id (int): The highest card of the trick so far
+        lead_pal_index (int): The suit of the first card of the trick
+        trump_pal_index (int): The trump suit, NO_TRUMP_PAL_INDEX for butifarra
+    '''
+    return beating_masks[trump_pal_index][lead_pal_index][card_id]
+
+
+def trick_winner_index(trick_card_ids: List[int], trump_pal_index: int) -> int:
+    ''' Return the position in the trick of the card that wins (or is winning) it
+    '''
+    strengths = card_strengths[trump_pal_index][trick_card_ids[0] // 12]
+    winner_index = 0
+    for index in range(1, len(trick_card_ids)):
+        if strengths[trick_card_ids[index]] > strengths[trick_card_ids[winner_index]]:
+            winner_index = index
+    return winner_index
+
+
+def legal_cards_mask(hand_mask: int, player_id: int, trick_card_ids: List[int], trick_player_ids: List[int],
+                     trump_pal_index: int) -> int:
+    ''' Return the mask of the cards of hand_mask that player_id may play on the trick
+
+    Args:
+        hand_mask (int): The hand of the player to play
+        player_id (int): The player to play
+        trick_card_ids (List[int]): The cards already in the trick, in order of play
+        trick_player_ids (List[int]): The players who played trick_card_ids
+        trump_pal_index (int): The trump suit, NO_TRUMP_PAL_INDEX for butifarra
+    '''
+    if not trick_card_ids or len(trick_card_ids) >= 4:
+        return hand_mask  # leading: any card
+    lead_pal_index = trick_card_ids[0] // 12
+    winner_index = trick_winner_index(trick_card_ids, trump_pal_index)
+    following_mask = hand_mask & suit_masks[lead_pal_index]
+    if trick_player_ids[winner_index] % 2 == player_id % 2:
+        return following_mask or hand_mask
+    beating_cards_mask = hand_mask & beating_mask(trick_card_ids[winner_index], lead_pal_index, trump_pal_index)
+    if following_mask:
+        return (following_mask & beating_cards_mask) or following_mask
+    return beating_cards_mask or hand_mask
@@ -0,0 +1,126 @@
+'''
+    File name: butifarra/utils/card_tracker.py
+'''
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .butifarra_card import ButifarraCard, NO_TRUMP_PAL_INDEX, is_card_higher
+
+
+class CardTracker(object):
+    ''' Keeps the card planes of the play phase up to date as cards are played
+
+        The round calls play_card once per PlayCardMove, so every plane is updated in O(1)
+        instead of rewalking the move_sheet on each observation:
+            1) played_cards[player_id]: one hot of the cards played by player_id
+            2) all_played_cards: one hot of every card played so far
+            3) impossible_cards[player_id]: one hot of the cards player_id cannot hold,
+               deduced from the obligation to follow suit and to play higher
+
+        The deductions reproduce calculateHiddenInfo in rlcard/envs/butifarra.py exactly,
+        so the observations do not change for already trained models:
+            - a card is only used for deductions once as many cards as the move_sheet index of
+              the first PlayCardMove have been played after it (admitted cards)
+            - deductions for a player stop at the first admitted trick led by that player
+    '''
+
+    def __init__(self):
+        self.played_cards = np.zeros((4, 48), dtype=int)
+        self.all_played_cards = np.zeros(48, dtype=int)
+        self.impossible_cards = np.zeros((4, 48), dtype=int)
+        self.play_sequence: List[Tuple[int, ButifarraCard]] = []  # (player_id, card) in order of play
+        self.first_play_card_index: int or None = None  # index of the first PlayCardMove in the move_sheet
+        self.is_deduction_stopped = [False, False, False, False]
+        self.lead_pal_index: int or None = None  # of the trick holding the last admitted card
+        self.high_card_id: int or None = None
+        self.high_player_id: int or None = None
+        # one entry per play_card: what undo_play_card needs to restore
+        self.undo_log: List[tuple] = []
+
+    def reset(self):
+        ''' Clear the planes for a new hand, reusing the arrays
+        '''
+        self.played_cards.fill(0)
+        self.all_played_cards.fill(0)
+        self.impossible_cards.fill(0)
+        self.play_sequence.clear()
+        self.first_play_card_index = None
+        self.is_deduction_stopped = [False, False, False, False]
+        self.lead_pal_index = None
+        self.high_card_id = None
+        self.high_player_id = None
+        self.undo_log.clear()
+
+    def play_card(self, player_id: int, card: ButifarraCard, move_index: int, trump_pal_index: int):
+        ''' Record a played card
+
+        Args:
+            player_id (int): The player who plays the card
+            card (ButifarraCard): The card played
+            move_index (int): The index of the PlayCardMove in the move_sheet
+            trump_pal_index (int): The trump suit, NO_TRUMP_PAL_INDEX for butifarra
+        '''
+        if self.first_play_card_index is None:
+            self.first_play_card_index = move_index
+        self.play_sequence.append((player_id, card))
+        self.played_cards[player_id, card.card_id] = 1
+        self.all_played_cards[card.card_id] = 1
+        admitted_player_id, impossible_cards_before = None, None
+        admitted_count = len(self.play_sequence) - self.first_play_card_index
+        if admitted_count > 0:
+            admitted_player_id = self.play_sequence[admitted_count - 1][0]
+            impossible_cards_before = self.impossible_cards[admitted_player_id].copy()
+        self.undo_log.append((self.lead_pal_index, self.high_card_id, self.high_player_id,
+                              list(self.is_deduction_stopped), admitted_player_id, impossible_cards_before))
+        if admitted_count > 0:
+            self._admit(play_index=admitted_count - 1, trump_pal_index=trump_pal_index)
+
+    def undo_play_card(self):
+        ''' Undo the last play_card
+        '''
+        self.lead_pal_index, self.high_card_id, self.high_player_id, self.is_deduction_stopped, \
+            admitted_player_id, impossible_cards_before = self.undo_log.pop()
+        if admitted_player_id is not None:
+            self.impossible_cards[admitted_player_id] = impossible_cards_before
+        player_id, card = self.play_sequence.pop()
+        self.played_cards[player_id, card.card_id] = 0
+        self.all_played_cards[card.card_id] = 0
+        if not self.play_sequence:
+            self.first_play_card_index = None
+
+    def get_possible_cards(self, player_id: int, hand_rep):
+        ''' Return one hot of the cards player_id may hold, seen by the owner of hand_rep
+        '''
+        return ((hand_rep == 0) & (self.all_played_cards == 0) & (self.impossible_cards[player_id] == 0)).astype(int)
+
+    def _admit(self, play_index: int, trump_pal_index: int):
+        player_id, card = self.play_sequence[play_index]
+        if play_index % 4 == 0:
+            self.lead_pal_index = card.card_id // 12
+            self.high_card_id = card.card_id
+            self.high_player_id = player_id
+            self.is_deduction_stopped[player_id] = True
+            return
+        if not self.is_deduction_stopped[player_id]:
+            self._deduce(player_id=player_id, card_id=card.card_id, trump_pal_index=trump_pal_index)
+        if is_card_higher(card.card_id, self.high_card_id, self.lead_pal_index, trump_pal_index):
+            self.high_card_id = card.card_id
+            self.high_player_id = player_id
+
+    def _deduce(self, player_id: int, card_id: int, trump_pal_index: int):
+        impossible_cards = self.impossible_cards[player_id]
+        card_pal_index = card_id // 12
+        lead_suit_start = 12 * self.lead_pal_index
+        must_play_higher = (self.high_player_id % 2) != (player_id % 2)
+        if card_pal_index != self.lead_pal_index:
+            # did not follow suit: has no card of the lead suit
+            impossible_cards[lead_suit_start:lead_suit_start + 12] = 1
+            if must_play_higher and trump_pal_index != NO_TRUMP_PAL_INDEX and card_pal_index != trump_pal_index:
+                # did not trump either: has no trump
+                trump_suit_start = 12 * trump_pal_index
+                impossible_cards[trump_suit_start:trump_suit_start + 12] = 1
+        elif must_play_higher and not is_card_higher(card_id, self.high_card_id, self.lead_pal_index, NO_TRUMP_PAL_INDEX):
+            # followed suit without beating the highest card: has nothing higher
+            impossible_cards[lead_suit_start + self.high_card_id % 12:lead_suit_start + 12] = 1
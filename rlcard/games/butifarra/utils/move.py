@@ -6,6 +6,7 @@
 
 #
 #   These classes are used to keep a move_sheet history of the moves in a round.
+#   They are plain records with __slots__, and their actions are the interned ActionEvents.
 #
 
 from .action_event import ActionEvent, DelegarAction, CantarAction, PassarAction, ContrarAction, RecontrarAction, SantVicencAction, PlayCardAction
@@ -15,11 +16,14 @@ from ..player import ButifarraPlayer
 
 
 class ButifarraMove(object):  # Interface
-    pass
+
+    __slots__ = ()
 
 
 class PlayerMove(ButifarraMove):  # Interface
 
+    __slots__ = ('player', 'action')
+
     def __init__(self, player: ButifarraPlayer, action: ActionEvent):
         super().__init__()
         self.player = player
@@ -28,12 +32,16 @@ class PlayerMove(ButifarraMove):  # Interface
 
 class CallMove(PlayerMove):  # Interface
 
+    __slots__ = ()
+
     def __init__(self, player: ButifarraPlayer, action: ActionEvent):
         super().__init__(player=player, action=action)
 
 
 class DealHandMove(ButifarraMove):
 
+    __slots__ = ('dealer', 'shuffled_deck')
+
     def __init__(self, dealer: ButifarraPlayer, shuffled_deck: [ButifarraCard]):
         super().__init__()
         self.dealer = dealer
@@ -46,8 +54,10 @@ class DealHandMove(ButifarraMove):
 
 class MakeDelegarMove(CallMove):
 
+    __slots__ = ()
+
     def __init__(self, player: ButifarraPlayer):
-        super().__init__(player=player, action=DelegarAction())
+        super().__init__(player=player, action=ActionEvent.from_action_id(ActionEvent.delegar_action_id))
 
     def __str__(self):
         return f'{self.player}: {self.action}'
@@ -55,32 +65,40 @@ class MakeDelegarMove(CallMove):
 
 class MakeContrarMove(CallMove):
 
+    __slots__ = ()
+
     def __init__(self, player: ButifarraPlayer):
-        super().__init__(player=player, action=ContrarAction())
+        super().__init__(player=player, action=ActionEvent.from_action_id(ActionEvent.contrar_action_id))
 
     def __str__(self):
         return f'{self.player}: {self.action}'
     
 class MakeRecontrarMove(CallMove):
 
+    __slots__ = ()
+
     def __init__(self, player: ButifarraPlayer):
-        super().__init__(player=player, action=RecontrarAction())
+        super().__init__(player=player, action=ActionEvent.from_action_id(ActionEvent.recontrar_action_id))
 
     def __str__(self):
         return f'{self.player}: {self.action}'
 
 class MakeSantVicencMove(CallMove):
 
+    __slots__ = ()
+
     def __init__(self, player: ButifarraPlayer):
-        super().__init__(player=player, action=SantVicencAction())
+        super().__init__(player=player, action=ActionEvent.from_action_id(ActionEvent.sant_vicenc_action_id))
 
     def __str__(self):
         return f'{self.player}: {self.action}'
     
 class MakePassarMove(CallMove):
 
+    __slots__ = ()
+
     def __init__(self, player: ButifarraPlayer):
-        super().__init__(player=player, action=PassarAction())
+        super().__init__(player=player, action=ActionEvent.from_action_id(ActionEvent.passar_action_id))
 
     def __str__(self):
         return f'{self.player}: {self.action}'
@@ -90,9 +108,10 @@ class MakePassarMove(CallMove):
 
 class MakeCantarMove(CallMove):
 
+    __slots__ = ()
+
     def __init__(self, player: ButifarraPlayer, cantar_action: CantarAction):
-        super().__init__(player=player, action=cantar_action)
-        self.action = cantar_action  # Note: keep type as BidAction rather than ActionEvent
+        super().__init__(player=player, action=cantar_action)  # Note: keep type as BidAction rather than ActionEvent
 
     def __str__(self):
         return f'{self.player}: canto {self.action}'
@@ -100,9 +119,10 @@ class MakeCantarMove(CallMove):
 
 class PlayCardMove(PlayerMove):
 
+    __slots__ = ()
+
     def __init__(self, player: ButifarraPlayer, action: PlayCardAction):
-        super().__init__(player=player, action=action)
-        self.action = action  # Note: keep type as PlayCardAction rather than ActionEvent
+        super().__init__(player=player, action=action)  # Note: keep type as PlayCardAction rather than ActionEvent
 
     @property
     def card(self):
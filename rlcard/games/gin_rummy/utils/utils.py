@@ -53,9 +53,7 @@ def get_card(card_id: int):
 
 
 def get_card_id(card: Card) -> int:
-    rank_id = get_rank_id(card)
-    suit_id = get_suit_id(card)
-    return rank_id + 13 * suit_id
+    return card.card_id
 
 
 def get_rank_id(card: Card) -> int:
@@ -1,5 +1,4 @@
 import numpy as np
-from copy import copy
 
 from rlcard.games.leducholdem import Dealer
 from rlcard.games.leducholdem import Player
@@ -107,16 +106,8 @@ class LeducholdemGame(Game):
                 (int): next plater's id
         '''
         if self.allow_step_back:
-            # First snapshot the current state
-            r = copy(self.round)
-            r_raised = copy(self.round.raised)
-            gp = self.game_pointer
-            r_c = self.round_counter
-            d_deck = copy(self.dealer.deck)
-            p = copy(self.public_card)
-            ps = [copy(self.players[i]) for i in range(self.num_players)]
-            ps_hand = [copy(self.players[i].hand) for i in range(self.num_players)]
-            self.history.append((r, r_raised, gp, r_c, d_deck, p, ps, ps_hand))
+            # First journal what this action can change
+            self.history.append(self.journal())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -184,10 +175,30 @@ class LeducholdemGame(Game):
             (bool): True if the game steps back successfully
         '''
         if len(self.history) > 0:
-            self.round, r_raised, self.game_pointer, self.round_counter, d_deck, self.public_card, self.players, ps_hand = self.history.pop()
-            self.round.raised = r_raised
-            self.dealer.deck = d_deck
-            for i, hand in enumerate(ps_hand):
-                self.players[i].hand = hand
+            self.rewind(self.history.pop())
             return True
         return False
+
+    def journal(self):
+        ''' Record the deltas of one step: the pointers, the round counter, the public card
+        and the chips and status of the acting player
+
+        Returns:
+            (tuple): The entry to pass to rewind
+        '''
+        return (self.game_pointer, self.round_counter, self.public_card,
+                self.round.journal(), self.players[self.game_pointer].journal())
+
+    def rewind(self, entry):
+        ''' Undo one step from the entry recorded by journal
+
+        Args:
+            entry (tuple): The entry returned by journal
+        '''
+        self.game_pointer, self.round_counter, public_card, round_entry, player_entry = entry
+        self.round.rewind(round_entry)
+        self.players[self.game_pointer].rewind(player_entry)
+        if self.public_card is not None and public_card is None:
+            # Put the public card dealt during the step back on top of the deck
+            self.dealer.deck.append(self.public_card)
+        self.public_card = public_card
@@ -32,6 +32,19 @@ class LeducholdemPlayer:
         state['legal_actions'] = legal_actions
         return state
 
+    def journal(self):
+        ''' Record the fields that an action of this player changes
+
+        Returns:
+            (tuple): The entry to pass to rewind
+        '''
+        return self.in_chips, self.status
+
+    def rewind(self, entry):
+        ''' Restore the fields recorded by journal
+        '''
+        self.in_chips, self.status = entry
+
     def get_player_id(self):
         ''' Return the id of the player
         '''
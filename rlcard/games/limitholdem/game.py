@@ -1,4 +1,3 @@
-from copy import deepcopy, copy
 import numpy as np
 
 from rlcard.games.limitholdem import Dealer
@@ -116,15 +115,8 @@ class LimitHoldemGame:
                 (int): next player id
         """
         if self.allow_step_back:
-            # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            rn = copy(self.history_raise_nums)
-            self.history.append((r, b, r_c, d, p, ps, rn))
+            # First journal what this action can change
+            self.history.append(self.journal())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -163,11 +155,37 @@ class LimitHoldemGame:
             (bool): True if the game steps back successfully
         """
         if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, \
-                self.players, self.history_raises_nums = self.history.pop()
+            self.rewind(self.history.pop())
             return True
         return False
 
+    def journal(self):
+        """
+        Record the deltas of one step instead of copying the game: the pointers, the round counters,
+        the chips and status of the acting player and the number of public cards dealt so far
+
+        Returns:
+            (tuple): The entry to pass to rewind
+        """
+        return (self.game_pointer, self.round_counter, self.history_raise_nums[self.round_counter],
+                len(self.public_cards), self.round.journal(), self.players[self.game_pointer].journal())
+
+    def rewind(self, entry):
+        """
+        Undo one step from the entry recorded by journal
+
+        Args:
+            entry (tuple): The entry returned by journal
+        """
+        self.game_pointer, self.round_counter, raise_num, num_public_cards, round_entry, player_entry = entry
+        self.history_raise_nums[self.round_counter] = raise_num
+        self.round.rewind(round_entry)
+        self.players[self.game_pointer].rewind(player_entry)
+        # Put the cards dealt during the step back on top of the deck
+        dealt_cards = self.public_cards[num_public_cards:]
+        del self.public_cards[num_public_cards:]
+        self.dealer.deck.extend(reversed(dealt_cards))
+
     def get_num_players(self):
         """
         Return the number of players in limit texas holdem
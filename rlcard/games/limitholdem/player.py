@@ -43,5 +43,20 @@ class LimitHoldemPlayer:
             'legal_actions': legal_actions
         }
 
+    def journal(self):
+        """
+        Record the fields that an action of this player changes
+
+        Returns:
+            (tuple): The entry to pass to rewind
+        """
+        return self.in_chips, self.status
+
+    def rewind(self, entry):
+        """
+        Restore the fields recorded by journal
+        """
+        self.in_chips, self.status = entry
+
     def get_player_id(self):
         return self.player_id
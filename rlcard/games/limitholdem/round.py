@@ -92,6 +92,26 @@ class LimitHoldemRound:
 
         return self.game_pointer
 
+    def journal(self):
+        """
+        Record the fields that proceed_round and start_new_round change
+
+        Returns:
+            (tuple): The entry to pass to rewind
+        """
+        return self.game_pointer, self.raise_amount, self.have_raised, self.not_raise_num, self.player_folded, \
+            list(self.raised)
+
+    def rewind(self, entry):
+        """
+        Restore the fields recorded by journal
+
+        Args:
+            entry (tuple): The entry returned by journal
+        """
+        self.game_pointer, self.raise_amount, self.have_raised, self.not_raise_num, self.player_folded, \
+            self.raised = entry
+
     def get_legal_actions(self):
         """
         Obtain the legal actions for the current player
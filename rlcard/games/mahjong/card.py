@@ -1,20 +1,54 @@
+# The mahjong cards, keyed by their type and trait
+_interned_cards = {}
+
 
 class MahjongCard:
+    ''' A mahjong card. Cards are immutable and interned: MahjongCard(card_type, trait)
+        returns the one instance of the card. index_num is the index of the trait among
+        the traits of the type, and card_id the index of the card in init_deck.
+    '''
+    __slots__ = ('type', 'trait', 'index_num', 'card_id')
 
     info = {'type':  ['dots', 'bamboo', 'characters', 'dragons', 'winds'],
             'trait': ['1', '2', '3', '4', '5', '6', '7', '8', '9', 'green', 'red', 'white', 'east', 'west', 'north', 'south']
             }
 
-    def __init__(self, card_type, trait):
-        ''' Initialize the class of MahjongCard
+    def __new__(cls, card_type, trait):
+        ''' Return the MahjongCard of the type and trait
 
         Args:
             card_type (str): The type of card
             trait (str): The trait of card
         '''
-        self.type = card_type
-        self.trait = trait
-        self.index_num = 0
+        card = _interned_cards.get((card_type, trait))
+        if card is None:
+            card = object.__new__(cls)
+            object.__setattr__(card, 'type', card_type)
+            object.__setattr__(card, 'trait', trait)
+            type_index = cls.info['type'].index(card_type)
+            trait_index = cls.info['trait'].index(trait)
+            if type_index < 3:
+                index_num, card_id = trait_index, 9 * type_index + trait_index
+            else:
+                # the dragons and winds follow the 27 suited cards
+                index_num = trait_index - (9 if card_type == 'dragons' else 12)
+                card_id = 18 + trait_index
+            object.__setattr__(card, 'index_num', index_num)
+            object.__setattr__(card, 'card_id', card_id)
+            _interned_cards[(card_type, trait)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError('MahjongCard is immutable')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return MahjongCard, (self.type, self.trait)
 
     def get_str(self):
         ''' Get the string representation of card
@@ -23,9 +57,3 @@ class MahjongCard:
             (str): The string of card's color and trait
         '''
         return self.type+ '-'+ self.trait
-
-    def set_index_num(self, index_num):
-
-        self.index_num = index_num
-        
-
@@ -1,7 +1,6 @@
 from enum import Enum
 
 import numpy as np
-from copy import deepcopy
 from rlcard.games.limitholdem import Game
 from rlcard.games.limitholdem import PlayerStatus
 
@@ -133,14 +132,8 @@ class NolimitholdemGame(Game):
             raise Exception('Action not allowed')
 
         if self.allow_step_back:
-            # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            self.history.append((r, b, r_c, d, p, ps))
+            # First journal what this action can change
+            self.history.append(self.journal())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -216,11 +209,29 @@ class NolimitholdemGame(Game):
             (bool): True if the game steps back successfully
         """
         if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players = self.history.pop()
-            self.stage = Stage(self.round_counter)
+            self.rewind(self.history.pop())
             return True
         return False
 
+    def journal(self):
+        """
+        Record the deltas of one step, adding the stage and the pot to the limit holdem entry
+
+        Returns:
+            (tuple): The entry to pass to rewind
+        """
+        return super().journal(), self.stage, self.dealer.pot
+
+    def rewind(self, entry):
+        """
+        Undo one step from the entry recorded by journal
+
+        Args:
+            entry (tuple): The entry returned by journal
+        """
+        holdem_entry, self.stage, self.dealer.pot = entry
+        super().rewind(holdem_entry)
+
     def get_num_players(self):
         """
         Return the number of players in no limit texas holdem
@@ -17,3 +17,18 @@ class NolimitholdemPlayer(Player):
         quantity = chips if chips <= self.remained_chips else self.remained_chips
         self.in_chips += quantity
         self.remained_chips -= quantity
+
+    def journal(self):
+        """
+        Record the fields that an action of this player changes
+
+        Returns:
+            (tuple): The entry to pass to rewind
+        """
+        return self.in_chips, self.status, self.remained_chips
+
+    def rewind(self, entry):
+        """
+        Restore the fields recorded by journal
+        """
+        self.in_chips, self.status, self.remained_chips = entry
@@ -123,6 +123,24 @@ class NolimitholdemRound:
 
         return self.game_pointer
 
+    def journal(self):
+        """
+        Record the fields that proceed_round and start_new_round change
+
+        Returns:
+            (tuple): The entry to pass to rewind
+        """
+        return self.game_pointer, self.not_raise_num, self.not_playing_num, list(self.raised)
+
+    def rewind(self, entry):
+        """
+        Restore the fields recorded by journal
+
+        Args:
+            entry (tuple): The entry returned by journal
+        """
+        self.game_pointer, self.not_raise_num, self.not_playing_num, self.raised = entry
+
     def get_nolimit_legal_actions(self, players):
         """
         Obtain the legal actions for the current player
@@ -1,6 +1,16 @@
 from termcolor import colored
 
+# The uno cards, keyed by their color and trait
+_interned_cards = {}
+
+
 class UnoCard:
+    ''' An uno card. Cards are immutable and interned: UnoCard(card_type, color, trait)
+        returns the one instance of the card, so a wild card gets its color by being
+        replaced with the wild card of the color. card_id is the index of the card in
+        the action space.
+    '''
+    __slots__ = ('type', 'color', 'trait', 'str', 'card_id')
 
     info = {'type':  ['number', 'action', 'wild'],
             'color': ['r', 'g', 'b', 'y'],
@@ -8,18 +18,36 @@ class UnoCard:
                       'skip', 'reverse', 'draw_2', 'wild', 'wild_draw_4']
             }
 
-    def __init__(self, card_type, color, trait):
-        ''' Initialize the class of UnoCard
+    def __new__(cls, card_type, color, trait):
+        ''' Return the UnoCard of the color and trait
 
         Args:
             card_type (str): The type of card
             color (str): The color of card
             trait (str): The trait of card
         '''
-        self.type = card_type
-        self.color = color
-        self.trait = trait
-        self.str = self.get_str()
+        card = _interned_cards.get((color, trait))
+        if card is None:
+            card = object.__new__(cls)
+            object.__setattr__(card, 'type', card_type)
+            object.__setattr__(card, 'color', color)
+            object.__setattr__(card, 'trait', trait)
+            object.__setattr__(card, 'str', card.get_str())
+            object.__setattr__(card, 'card_id', 15 * cls.info['color'].index(color) + cls.info['trait'].index(trait))
+            _interned_cards[(color, trait)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError('UnoCard is immutable')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return UnoCard, (self.type, self.color, self.trait)
 
     def get_str(self):
         ''' Get the string representation of card
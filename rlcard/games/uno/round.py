@@ -30,7 +30,7 @@ class UnoRound:
         '''
         top = self.dealer.flip_top_card()
         if top.trait == 'wild':
-            top.color = self.np_random.choice(UnoCard.info['color'])
+            top = UnoCard(top.type, self.np_random.choice(UnoCard.info['color']), top.trait)
         self.target = top
         self.played_cards.append(top)
         return top
@@ -70,7 +70,6 @@ class UnoRound:
         if trait == 'wild' or trait == 'wild_draw_4':
             for index, card in enumerate(player.hand):
                 if trait == card.trait:
-                    card.color = color # update the color of wild card to match the action
                     remove_index = index
                     break
         else:
@@ -79,6 +78,8 @@ class UnoRound:
                     remove_index = index
                     break
         card = player.hand.pop(remove_index)
+        if card.type == 'wild':
+            card = UnoCard(card.type, color, card.trait) # the wild card of the color of the action
         if not player.hand:
             self.is_over = True
             self.winner = [self.current_player]
@@ -171,7 +172,7 @@ class UnoRound:
 
         # draw a wild card
         if card.type == 'wild':
-            card.color = self.np_random.choice(UnoCard.info['color'])
+            card = UnoCard(card.type, self.np_random.choice(UnoCard.info['color']), card.trait)
             self.target = card
             self.played_cards.append(card)
             self.current_player = (self.current_player + self.direction) % self.num_players
@@ -11,8 +11,19 @@ class ModelSpec(object):
             entry_point (string): a string that indicates the location of the model class
         '''
         self.model_id = model_id
-        mod_name, class_name = entry_point.split(':')
-        self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        self.entry_point = entry_point
+        self._entry_point = None
+
+    def load_entry_point(self):
+        ''' Import the model class the first time it is needed
+
+        Returns:
+            (class): The model class
+        '''
+        if self._entry_point is None:
+            mod_name, class_name = self.entry_point.split(':')
+            self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        return self._entry_point
 
     def load(self):
         ''' Instantiates an instance of the model
@@ -20,7 +31,7 @@ class ModelSpec(object):
         Returns:
             Model (Model): an instance of the Model
         '''
-        model = self._entry_point()
+        model = self.load_entry_point()()
         return model
 
 
@@ -0,0 +1,146 @@
+''' Columnar trajectories: the transitions of an episode stored column by column
+'''
+import numpy as np
+
+
+class Episode(object):
+    ''' The transitions of one player in one game
+
+        The states the player observed are the rows of obs and legal_actions_masks,
+        with the final state as the last row, so transition t goes from row t to
+        row t+1. This is the layout of the transitions returned by reorganize:
+
+            obs: (T+1,) + obs_shape
+            legal_actions_masks: (T+1, num_actions), True where the action is legal
+            actions: (T,) the action ids taken by the player
+            rewards: (T,) zero except the payoff of the player on the last transition
+            dones: (T,) True on the last transition
+    '''
+
+    def __init__(self, obs, legal_actions_masks, actions, rewards, dones):
+        self.obs = obs
+        self.legal_actions_masks = legal_actions_masks
+        self.actions = actions
+        self.rewards = rewards
+        self.dones = dones
+
+    def __len__(self):
+        return len(self.actions)
+
+    @property
+    def states(self):
+        return self.obs[:-1]
+
+    @property
+    def next_states(self):
+        return self.obs[1:]
+
+    @property
+    def next_legal_actions_masks(self):
+        return self.legal_actions_masks[1:]
+
+    def transitions(self):
+        ''' Convert the episode to the transitions of reorganize, without the raw states
+
+        Returns:
+            (list): [state, action, reward, next_state, done] lists, where the
+                states are dicts with the 'obs' and 'legal_actions' of the player
+        '''
+        states = [{'obs': self.obs[t], 'legal_actions': {action: None for action in np.flatnonzero(mask)}}
+                  for t, mask in enumerate(self.legal_actions_masks)]
+        return [[states[t], int(self.actions[t]), float(self.rewards[t]), states[t + 1], bool(self.dones[t])]
+                for t in range(len(self))]
+
+
+class EpisodeRecorder(object):
+    ''' Records the episodes of the players of a game into preallocated arrays
+
+        The arrays of every player are allocated on the first state, from the shape
+        and dtype of its obs, and are reused by the next episodes. They double when
+        an episode outgrows them. `finish` copies the recorded rows into one Episode
+        per player, so a game costs a few array copies instead of a dict per step.
+    '''
+
+    def __init__(self, num_players, num_actions, capacity=64):
+        ''' Initialize the recorder
+
+        Args:
+            num_players (int): The number of players of the game
+            num_actions (int): The number of actions of the game
+            capacity (int): The number of states of a player allocated up front
+        '''
+        self.num_players = num_players
+        self.num_actions = num_actions
+        self.capacity = capacity
+        self.obs = [None for _ in range(num_players)]
+        self.legal_actions_masks = [np.zeros((capacity, num_actions), dtype=bool) for _ in range(num_players)]
+        self.actions = [np.zeros(capacity, dtype=np.int64) for _ in range(num_players)]
+        self.num_states = [0 for _ in range(num_players)]
+        self.num_actions_taken = [0 for _ in range(num_players)]
+
+    def start(self):
+        ''' Start a new episode
+        '''
+        self.num_states = [0 for _ in range(self.num_players)]
+        self.num_actions_taken = [0 for _ in range(self.num_players)]
+
+    def add_state(self, player_id, state):
+        ''' Record a state observed by a player
+
+        Args:
+            player_id (int): The player
+            state (dict): The extracted state, with 'obs' and 'legal_actions'
+        '''
+        t = self.num_states[player_id]
+        obs = np.asarray(state['obs'])
+        if self.obs[player_id] is None:
+            self.obs[player_id] = np.zeros((self.capacity,) + obs.shape, dtype=obs.dtype)
+        if t == len(self.obs[player_id]):
+            self._grow(player_id)
+        self.obs[player_id][t] = obs
+        mask = self.legal_actions_masks[player_id][t]
+        mask[:] = False
+        mask[list(state['legal_actions'].keys())] = True
+        self.num_states[player_id] = t + 1
+
+    def add_action(self, player_id, action):
+        ''' Record the action id taken by a player
+        '''
+        t = self.num_actions_taken[player_id]
+        if t == len(self.actions[player_id]):
+            self._grow(player_id)
+        self.actions[player_id][t] = action
+        self.num_actions_taken[player_id] = t + 1
+
+    def finish(self, payoffs):
+        ''' Close the episode
+
+        Args:
+            payoffs (list): The payoffs of the players
+
+        Returns:
+            (list): One Episode per player
+        '''
+        episodes = []
+        for player_id in range(self.num_players):
+            num_transitions = self.num_actions_taken[player_id]
+            num_states = self.num_states[player_id]
+            rewards = np.zeros(num_transitions, dtype=np.float32)
+            dones = np.zeros(num_transitions, dtype=bool)
+            if num_transitions > 0:
+                rewards[-1] = payoffs[player_id]
+                dones[-1] = True
+            episodes.append(Episode(self.obs[player_id][:num_states].copy(),
+                                    self.legal_actions_masks[player_id][:num_states].copy(),
+                                    self.actions[player_id][:num_transitions].copy(),
+                                    rewards, dones))
+        return episodes
+
+    def _grow(self, player_id):
+        for columns in (self.obs, self.legal_actions_masks, self.actions):
+            old = columns[player_id]
+            if old is None:
+                continue
+            new = np.zeros((2 * len(old),) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            columns[player_id] = new
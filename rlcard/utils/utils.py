@@ -178,6 +178,51 @@ def reorganize(trajectories, payoffs):
             new_trajectories[player].append(transition)
     return new_trajectories
 
+OBS_DTYPES = (None, 'int8', 'bool', 'packed')
+
+def convert_obs(obs, obs_dtype):
+    ''' Convert an observation to a compact dtype
+
+    Args:
+        obs (numpy.array): The observation
+        obs_dtype (str): None to keep it, 'int8', 'bool', or 'packed' for the
+            bits of a binary observation flattened and packed with np.packbits
+
+    Returns:
+        (numpy.array): The converted observation
+
+    Raises:
+        ValueError: If the values of the observation do not fit in obs_dtype
+    '''
+    if obs_dtype is None:
+        return obs
+    obs = np.asarray(obs)
+    if obs_dtype == 'int8':
+        converted = obs.astype(np.int8)
+        if not np.array_equal(converted, obs):
+            raise ValueError('The observation does not fit in int8')
+        return converted
+    if obs_dtype not in ('bool', 'packed'):
+        raise ValueError('Unknown obs_dtype: {}'.format(obs_dtype))
+    converted = obs.astype(bool)
+    if not np.array_equal(converted, obs):
+        raise ValueError('The observation is not binary')
+    if obs_dtype == 'packed':
+        converted = np.packbits(converted.reshape(-1))
+    return converted
+
+def unpack_obs(packed, size):
+    ''' Unpack observations packed by convert_obs(obs, 'packed')
+
+    Args:
+        packed (numpy.array): (..., ceil(size / 8)) packed observations
+        size (int): The number of values of an observation
+
+    Returns:
+        (numpy.array): (..., size) uint8 observations of zeros and ones
+    '''
+    return np.unpackbits(packed, axis=-1, count=size)
+
 def remove_illegal(action_probs, legal_actions):
     ''' Remove illegal actions and normalize the
         probability vector
@@ -3,6 +3,7 @@ import numpy as np
 
 import rlcard
 from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.cfr_table import InfosetTable
 
 class TestNFSP(unittest.TestCase):
 
@@ -35,3 +36,20 @@ class TestNFSP(unittest.TestCase):
         self.assertEqual(len(agent.regrets), len(new_agent.regrets))
         self.assertEqual(agent.iteration, new_agent.iteration)
 
+    def test_infoset_table(self):
+        table = InfosetTable(num_actions=3, capacity=2)
+        rows = [table.get_row(obs) for obs in [b'a', b'b', b'c', b'a']]
+        self.assertEqual(rows, [0, 1, 2, 0])
+        self.assertEqual(len(table), 3)
+        table.regrets[:3] = [[1., 3., -2.], [-1., -1., 0.], [0., 2., 0.]]
+        table.update_policy()
+        self.assertTrue(np.allclose(table.policy[:3], [[0.25, 0.75, 0.], [1/3, 1/3, 1/3], [0., 1., 0.]]))
+
+        policy, average_policy, regrets = table.to_dicts()
+        new_table = InfosetTable.from_dicts(3, policy, average_policy, regrets)
+        self.assertEqual(new_table.keys, table.keys)
+        self.assertTrue(np.array_equal(new_table.regrets[:3], table.regrets[:3]))
+        self.assertTrue(np.array_equal(new_table.policy[:3], table.policy[:3]))
+        self.assertTrue(np.array_equal(table.to_dict('regrets')[b'b'], [-1., -1., 0.]))
+        with self.assertRaises(ValueError):
+            table.to_dict('keys')
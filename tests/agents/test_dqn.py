@@ -1,8 +1,10 @@
+import copy
 import unittest
+from unittest import mock
 import torch
 import numpy as np
 
-from rlcard.agents.dqn_agent import DQNAgent
+from rlcard.agents.dqn_agent import DQNAgent, Memory, PrioritizedMemory, SumTree, Transition
 
 class TestDQN(unittest.TestCase):
 
@@ -51,3 +53,211 @@ class TestDQN(unittest.TestCase):
         predicted_action = agent.step({'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}})
         self.assertGreaterEqual(predicted_action, 0)
         self.assertLessEqual(predicted_action, 1)
+
+    def test_memory(self):
+        memory = Memory(memory_size=5, batch_size=3, num_actions=4)
+        for i in range(8):
+            memory.save(np.full(2, i), i, float(i), np.full(2, i + 1), [i % 4], i == 7)
+        self.assertEqual(len(memory), 5)
+        self.assertEqual(sorted(memory.actions), [3, 4, 5, 6, 7])
+
+        state_batch, action_batch, reward_batch, next_state_batch, done_batch, legal_actions_batch = memory.sample()
+        self.assertEqual(state_batch.shape, (3, 2))
+        self.assertEqual(legal_actions_batch.shape, (3, 4))
+        self.assertTrue(np.array_equal(state_batch[:, 0], action_batch))
+        self.assertTrue(np.array_equal(next_state_batch[:, 0], action_batch + 1))
+        self.assertTrue(np.array_equal(np.argmax(legal_actions_batch, axis=1), action_batch % 4))
+        self.assertTrue(np.array_equal(done_batch, action_batch == 7))
+
+        restored = Memory.from_checkpoint(memory.checkpoint_attributes())
+        self.assertEqual(restored.position, memory.position)
+        for name in ['states', 'actions', 'rewards', 'next_states', 'dones', 'legal_actions_masks']:
+            self.assertTrue(np.array_equal(getattr(restored, name), getattr(memory, name)))
+
+    def test_memory_from_transitions_checkpoint(self):
+        transitions = [Transition(np.zeros(2), 1, 0.5, np.ones(2), False, [0, 1]) for _ in range(3)]
+        memory = Memory.from_checkpoint({'memory_size': 10, 'batch_size': 2, 'memory': transitions})
+        self.assertEqual(len(memory), 3)
+        self.assertTrue(np.array_equal(memory.legal_actions_masks[0], [True, True]))
+
+    def test_sum_tree(self):
+        tree = SumTree(5)
+        priorities = np.array([1.0, 0.0, 2.0, 3.0, 0.5])
+        tree.update(np.arange(5), priorities)
+        self.assertAlmostEqual(tree.total, 6.5)
+        values = np.array([0.0, 0.99, 1.0, 2.5, 3.0, 5.9, 6.0, 6.4])
+        expected = np.searchsorted(np.cumsum(priorities), values, side='right')
+        self.assertTrue(np.array_equal(tree.find(values), expected))
+        tree.update([3, 0], [0.0, 4.0])
+        self.assertAlmostEqual(tree.total, 6.5)
+        self.assertTrue(np.array_equal(tree.get([0, 3]), [4.0, 0.0]))
+
+    def test_prioritized_memory(self):
+        memory = PrioritizedMemory(memory_size=4, batch_size=2, num_actions=2, alpha=1.0, epsilon=0.0)
+        for i in range(4):
+            memory.save(np.full(2, i), i % 2, 0.0, np.full(2, i), [0, 1], False)
+        memory.update_priorities(np.arange(4), np.array([0.0, 0.0, 2.0, 0.0]))
+        for _ in range(10):
+            *batch, indices, weights = memory.sample(beta=1.0)
+            self.assertTrue(np.array_equal(indices, [2, 2]))
+            self.assertTrue(np.array_equal(batch[0][:, 0], [2, 2]))
+            self.assertTrue(np.array_equal(weights, [1.0, 1.0]))
+
+        # New transitions get the largest priority
+        memory.save(np.full(2, 4), 0, 0.0, np.full(2, 4), [0], True)
+        self.assertEqual(memory.sum_tree.get([0])[0], 2.0)
+
+        restored = PrioritizedMemory.from_checkpoint(memory.checkpoint_attributes())
+        self.assertEqual(restored.alpha, 1.0)
+        self.assertTrue(np.array_equal(restored.sum_tree.tree, memory.sum_tree.tree))
+
+    def test_train_prioritized(self):
+        agent = DQNAgent(replay_memory_size=200,
+                         replay_memory_init_size=50,
+                         update_target_estimator_every=100,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'),
+                         prioritized_replay=True)
+        for _ in range(100):
+            ts = [{'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}}, np.random.randint(2), 0, {'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}}, True]
+            agent.feed(ts)
+        priorities = agent.memory.sum_tree.get(np.arange(len(agent.memory)))
+        self.assertTrue(np.all(priorities > 0))
+        self.assertFalse(np.all(priorities == priorities[0]))
+
+        restored = DQNAgent.from_checkpoint(agent.checkpoint_attributes())
+        self.assertTrue(restored.prioritized_replay)
+        self.assertIsInstance(restored.memory, PrioritizedMemory)
+        self.assertTrue(np.array_equal(restored.memory.sum_tree.tree, agent.memory.sum_tree.tree))
+
+    def test_update_td_errors(self):
+        agent = DQNAgent(num_actions=2, state_shape=[2], mlp_layers=[10], device=torch.device('cpu'))
+        states = torch.rand(8, 2)
+        actions = torch.randint(2, (8,))
+        targets = torch.rand(8)
+        # The TD errors come from the training forward pass of the update, with batch statistics
+        qnet = copy.deepcopy(agent.q_estimator.qnet).train()
+        with torch.no_grad():
+            q_values = qnet(states).gather(1, actions.unsqueeze(1)).squeeze(1)
+        loss, td_errors = agent.q_estimator.update(states, actions, targets, return_td_errors=True)
+        self.assertTrue(torch.allclose(td_errors, q_values - targets))
+        self.assertFalse(td_errors.requires_grad)
+        self.assertAlmostEqual(loss, float(torch.mean((q_values - targets) ** 2)), places=5)
+        self.assertIsInstance(agent.q_estimator.update(states, actions, targets), float)
+
+    def test_target_update(self):
+        agent = DQNAgent(replay_memory_size=200,
+                         replay_memory_init_size=20,
+                         update_target_estimator_every=1000,
+                         batch_size=4,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'),
+                         target_update_tau=0.5)
+        target_params = list(agent.target_estimator.qnet.parameters())
+        for p, q in zip(target_params, agent.q_estimator.qnet.parameters()):
+            self.assertTrue(torch.equal(p, q))
+
+        for _ in range(30):
+            ts = [{'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}}, np.random.randint(2), 0, {'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}}, True]
+            agent.feed(ts)
+        # The parameters are updated in place, and differ from the Q estimator
+        for p, target_p, q in zip(target_params, agent.target_estimator.qnet.parameters(), agent.q_estimator.qnet.parameters()):
+            self.assertIs(p, target_p)
+        self.assertFalse(all(torch.equal(p, q) for p, q in zip(target_params, agent.q_estimator.qnet.parameters())))
+
+        checkpoint = agent.checkpoint_attributes()
+        self.assertEqual(checkpoint['target_update'], 'soft')
+        restored = DQNAgent.from_checkpoint(checkpoint)
+        self.assertEqual(restored.target_update_tau, 0.5)
+        for p, q in zip(restored.target_estimator.qnet.parameters(), target_params):
+            self.assertTrue(torch.equal(p, q))
+
+        agent.target_estimator.sync_from(agent.q_estimator)
+        for p, q in zip(agent.target_estimator.qnet.parameters(), agent.q_estimator.qnet.parameters()):
+            self.assertTrue(torch.equal(p, q))
+
+    def test_sync_from_without_foreach(self):
+        # torch < 2.1 has no torch._foreach_copy_
+        source = DQNAgent(num_actions=2, state_shape=[2], mlp_layers=[10], device=torch.device('cpu'))
+        agent = DQNAgent(num_actions=2, state_shape=[2], mlp_layers=[10], device=torch.device('cpu'))
+        with mock.patch.object(torch, '_foreach_copy_', create=True):
+            del torch._foreach_copy_
+            expected = [0.5 * (p + q) for p, q in zip(agent.q_estimator.qnet.parameters(), source.q_estimator.qnet.parameters())]
+            agent.q_estimator.sync_from(source.q_estimator, tau=0.5)
+            for p, q in zip(agent.q_estimator.qnet.parameters(), expected):
+                self.assertTrue(torch.allclose(p, q))
+            agent.q_estimator.sync_from(source.q_estimator)
+            for p, q in zip(agent.q_estimator.qnet.parameters(), source.q_estimator.qnet.parameters()):
+                self.assertTrue(torch.equal(p, q))
+        self.assertTrue(hasattr(torch, '_foreach_copy_'))
+
+    def test_feed_episode(self):
+        import rlcard
+        from rlcard.agents.random_agent import RandomAgent
+
+        # RandomAgent draws from the global np.random
+        np.random.seed(0)
+        env = rlcard.make('leduc-holdem', config={'seed': 0})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        agents = [DQNAgent(replay_memory_size=7, replay_memory_init_size=1000, num_actions=env.num_actions,
+                           state_shape=env.state_shape[0], mlp_layers=[10], device=torch.device('cpu'),
+                           prioritized_replay=prioritized_replay)
+                  for prioritized_replay in (False, True) for _ in range(2)]
+        for _ in range(5):
+            episodes, _ = env.run_columnar(is_training=True)
+            for episode in episodes:
+                for agent in agents[:2]:
+                    for transition in episode.transitions():
+                        agent.feed(transition)
+                agents[2].feed_episode(episode)
+                agents[3].feed_episode(episode)
+
+        self.assertEqual(agents[0].total_t, agents[2].total_t)
+        for agent in agents[1:]:
+            self.assertEqual(agent.memory.position, agents[0].memory.position)
+            for name in ['states', 'actions', 'rewards', 'next_states', 'dones', 'legal_actions_masks']:
+                self.assertTrue(np.array_equal(getattr(agent.memory, name), getattr(agents[0].memory, name)))
+        self.assertTrue(np.all(agents[3].memory.sum_tree.get(np.arange(agents[3].memory.size)) == 1.0))
+
+    def test_memory_packbits(self):
+        memory = Memory(memory_size=5, batch_size=3, num_actions=2, packbits=True)
+        states = np.random.randint(0, 2, (4, 11))
+        for i in range(3):
+            memory.save(states[i], i, 0.0, states[i + 1], [0, 1], False)
+        self.assertEqual(memory.states.shape, (5, 2))
+        self.assertEqual(memory.states.dtype, np.uint8)
+
+        state_batch, action_batch, _, next_state_batch, _, _ = memory.sample()
+        self.assertTrue(np.array_equal(state_batch, states[action_batch]))
+        self.assertTrue(np.array_equal(next_state_batch, states[action_batch + 1]))
+
+        # States packed by the env are stored as they are
+        memory.save_batch(np.packbits(states[:1], axis=1), [3], [0.0], np.packbits(states[1:2], axis=1),
+                          np.ones((1, 2), dtype=bool), [True])
+        self.assertTrue(np.array_equal(memory.states[3], memory.states[0]))
+
+        restored = Memory.from_checkpoint(memory.checkpoint_attributes())
+        self.assertTrue(restored.packbits)
+        self.assertEqual(restored.state_size, 11)
+        self.assertTrue(np.array_equal(restored.states, memory.states))
+
+    def test_train_packed_obs(self):
+        import rlcard
+
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'obs_dtype': 'packed'})
+        for replay_packbits, prioritized_replay in [(False, False), (True, False), (True, True)]:
+            agent = DQNAgent(replay_memory_size=50, replay_memory_init_size=20, batch_size=8,
+                             num_actions=env.num_actions, state_shape=env.state_shape[0], mlp_layers=[10],
+                             device=torch.device('cpu'), replay_packbits=replay_packbits,
+                             prioritized_replay=prioritized_replay)
+            env.set_agents([agent, agent])
+            while agent.train_t == 0:
+                trajectories, payoffs = env.run(is_training=True)
+                for ts in rlcard.utils.reorganize(trajectories, payoffs)[0]:
+                    agent.feed(ts)
+            if replay_packbits:
+                self.assertEqual(agent.memory.states.shape[1], 5)
+            state, _ = env.reset()
+            self.assertEqual(agent.predict(state).shape, (env.num_actions,))
@@ -0,0 +1,94 @@
+import importlib.util
+import multiprocessing
+import threading
+import unittest
+
+import numpy as np
+import torch
+
+from rlcard.agents.dqn_agent import DQNAgent
+from rlcard.agents.inference_server import InferenceServer
+
+
+def _remote_predict(client, states, outputs):
+    outputs.put(client.predict([states]))
+
+
+class TestInferenceServer(unittest.TestCase):
+
+    def test_estimator(self):
+        agent = DQNAgent(num_actions=3, state_shape=[4], mlp_layers=[8], device=torch.device('cpu'))
+        server = InferenceServer(agent.q_estimator, max_latency=0.05)
+        clients = [server.client() for _ in range(4)]
+        server.start()
+
+        states = np.random.rand(len(clients), 4).astype(np.float32)
+        results = [None] * len(clients)
+
+        def run(i):
+            results[i] = clients[i].predict([states[i:i+1]])
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(clients))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = agent.q_estimator.predict_nograd(states)
+        self.assertTrue(np.allclose(np.concatenate(results), expected, atol=1e-6))
+        self.assertLess(server.num_batches, server.num_requests)
+
+        # A remote network stands in for the qnet of an estimator
+        remote_agent = DQNAgent(num_actions=3, state_shape=[4], mlp_layers=[8], device=torch.device('cpu'))
+        remote_agent.q_estimator.qnet = clients[0].network()
+        state = {'obs': states[0], 'legal_actions': {0: None, 2: None}, 'raw_legal_actions': ['a', 'c']}
+        self.assertTrue(np.allclose(remote_agent.predict(state), agent.predict(state), atol=1e-6))
+        server.stop()
+
+    def test_errors(self):
+        agent = DQNAgent(num_actions=3, state_shape=[4], mlp_layers=[8], device=torch.device('cpu'))
+        server = InferenceServer(agent.q_estimator)
+        client = server.client()
+        states = np.random.rand(2, 4).astype(np.float32)
+
+        # The server is not started yet
+        with self.assertRaises(TimeoutError):
+            client.predict([states], timeout=0.05)
+        server.start()
+        # The late response to the request that timed out is skipped
+        expected = agent.q_estimator.predict_nograd(states)
+        self.assertTrue(np.allclose(client.predict([states], timeout=5), expected, atol=1e-6))
+
+        # The errors of the forward passes are raised by the clients, and the server keeps serving
+        with self.assertRaises(RuntimeError):
+            client.predict([np.random.rand(2, 5).astype(np.float32)], timeout=5)
+        with self.assertRaises(KeyError):
+            client.predict([states], network_id=1, timeout=5)
+        self.assertTrue(np.allclose(client.predict([states], timeout=5), expected, atol=1e-6))
+        server.stop()
+
+    @unittest.skipUnless(importlib.util.find_spec('git'), 'rlcard.agents.dmc_agent requires GitPython')
+    def test_dmc_model(self):
+        from rlcard.agents.dmc_agent.model import DMCModel
+
+        model = DMCModel([[4], [4]], [[3], [3]], mlp_layers=[8], device='cpu')
+        server = InferenceServer(model)
+        client = server.client()
+        outputs = multiprocessing.Queue()
+        states = np.random.rand(5, 4).astype(np.float32)
+        worker = multiprocessing.Process(target=_remote_predict, args=(client, states, outputs))
+        worker.start()
+        server.start()
+        with self.assertRaises(ValueError):
+            InferenceServer(object())
+
+        state = {'obs': states[0], 'legal_actions': {0: None, 1: None}, 'raw_legal_actions': ['a', 'b']}
+        expected = model.get_agent(1).predict(state)[1]
+        model.get_agent(1).net = client.network(1)
+        self.assertTrue(np.allclose(model.get_agent(1).predict(state)[1], expected, atol=1e-6))
+
+        self.assertEqual(outputs.get().shape, (5, 3))
+        worker.join()
+        server.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import shutil
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.mccfr_agent import ExternalSamplingCFRAgent, OutcomeSamplingCFRAgent
+
+
+class TestMCCFR(unittest.TestCase):
+
+    def test_train(self):
+        for agent_class in [ExternalSamplingCFRAgent, OutcomeSamplingCFRAgent]:
+            env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+            agent = agent_class(env, model_path='experiments/mccfr_model', seed=0)
+
+            for _ in range(100):
+                agent.train()
+
+            state = {'obs': np.array([1., 1., 0., 0., 0., 0.]), 'legal_actions': {0: None,2: None}, 'raw_legal_actions': ['call', 'fold']}
+            action, _ = agent.eval_step(state)
+
+            self.assertIn(action, [0, 2])
+
+    def test_is_deterministic(self):
+        tables = []
+        for _ in range(2):
+            env = rlcard.make('leduc-holdem', config={'seed': 0, 'allow_step_back':True})
+            agent = OutcomeSamplingCFRAgent(env, model_path='experiments/mccfr_model', seed=0)
+            for _ in range(50):
+                agent.train()
+            tables.append(agent.table)
+        self.assertEqual(tables[0].keys, tables[1].keys)
+        self.assertTrue(np.array_equal(tables[0].regrets, tables[1].regrets))
+
+    def test_save_every(self):
+        model_path = 'experiments/mccfr_model_checkpoint'
+        shutil.rmtree(model_path, ignore_errors=True)
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = ExternalSamplingCFRAgent(env, model_path=model_path, save_every=10)
+
+        for _ in range(9):
+            agent.train()
+        self.assertFalse(os.path.exists(model_path))
+        for _ in range(6):
+            agent.train()
+
+        new_agent = ExternalSamplingCFRAgent(env, model_path=model_path)
+        new_agent.load()
+        self.assertEqual(new_agent.iteration, 10)
+        self.assertTrue(0 < len(new_agent.table) <= len(agent.table))
+        self.assertEqual(len(new_agent.policy), len(new_agent.average_policy))
+        shutil.rmtree(model_path)
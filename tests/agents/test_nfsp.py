@@ -1,8 +1,9 @@
 import unittest
+import tempfile
 import torch
 import numpy as np
 
-from rlcard.agents.nfsp_agent import NFSPAgent
+from rlcard.agents.nfsp_agent import NFSPAgent, ReservoirBuffer, Transition
 
 class TestNFSP(unittest.TestCase):
 
@@ -45,3 +46,105 @@ class TestNFSP(unittest.TestCase):
 
             ts = [{'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}}, np.random.randint(2), 0, {'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}, 'raw_legal_actions': ['call', 'raise']}, True]
             agent.feed(ts)
+
+    def test_soft_target_update_checkpoint(self):
+        agent = NFSPAgent(num_actions=2,
+                          state_shape=[2],
+                          hidden_layers_sizes=[10,10],
+                          q_replay_memory_init_size=10,
+                          q_batch_size=4,
+                          q_mlp_layers=[10,10],
+                          q_target_update_tau=0.1,
+                          device=torch.device('cpu'))
+        for _ in range(20):
+            ts = [{'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}}, np.random.randint(2), 0, {'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}}, True]
+            agent.feed(ts)
+        checkpoint = agent.checkpoint_attributes()
+        self.assertEqual(checkpoint['rl_agent']['target_update'], 'soft')
+
+        restored = NFSPAgent.from_checkpoint(checkpoint)
+        self.assertEqual(restored._rl_agent.target_update_tau, 0.1)
+        self.assertEqual(restored._rl_agent.train_t, agent._rl_agent.train_t)
+        for p, q in zip(restored._rl_agent.target_estimator.qnet.parameters(), agent._rl_agent.target_estimator.qnet.parameters()):
+            self.assertTrue(torch.equal(p, q))
+
+    def test_reservoir_buffer(self):
+        buffer = ReservoirBuffer(5)
+        for i in range(20):
+            buffer.add(Transition(info_state=np.full(3, i), action_probs=np.eye(2)[i % 2]))
+        self.assertEqual(len(buffer), 5)
+        info_states, action_probs = buffer.sample(4)
+        self.assertEqual(info_states.shape, (4, 3))
+        self.assertEqual(action_probs.shape, (4, 2))
+        self.assertTrue(np.array_equal(np.argmax(action_probs, axis=1), info_states[:, 0] % 2))
+        with self.assertRaises(ValueError):
+            buffer.sample(6)
+
+        restored = ReservoirBuffer.from_checkpoint(buffer.checkpoint_attributes())
+        self.assertEqual(restored._add_calls, 20)
+        self.assertTrue(np.array_equal([t.info_state for t in restored], [t.info_state for t in buffer]))
+
+        transitions = [Transition(info_state=np.zeros(3), action_probs=np.ones(2)) for _ in range(3)]
+        legacy = ReservoirBuffer.from_checkpoint({'reservoir_buffer_capacity': 5, 'data': transitions, 'add_calls': 3})
+        self.assertEqual(len(legacy), 3)
+
+    def test_reservoir_buffer_memmap(self):
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            buffer = ReservoirBuffer(10, memmap_dir)
+            for i in range(4):
+                buffer.add(Transition(info_state=np.full(3, i, dtype=np.int8), action_probs=np.eye(2)[i % 2]))
+            checkpoint = buffer.checkpoint_attributes()
+            self.assertEqual(checkpoint['columns'], {})
+            self.assertIsInstance(buffer._info_states, np.memmap)
+
+            restored = ReservoirBuffer.from_checkpoint(checkpoint)
+            self.assertEqual(len(restored), 4)
+            self.assertEqual(restored._info_states.dtype, np.int8)
+            self.assertTrue(np.array_equal(restored._info_states[:4, 0], np.arange(4)))
+            del buffer, restored
+
+    def test_feed_episode(self):
+        from rlcard.utils.trajectory import EpisodeRecorder
+
+        agent = NFSPAgent(num_actions=2,
+                          state_shape=[2],
+                          hidden_layers_sizes=[10,10],
+                          q_mlp_layers=[10,10],
+                          device=torch.device('cpu'))
+        recorder = EpisodeRecorder(num_players=1, num_actions=2)
+        recorder.start()
+        for t in range(3):
+            recorder.add_state(0, {'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}})
+            recorder.add_action(0, t % 2)
+        recorder.add_state(0, {'obs': np.random.random_sample((2,)), 'legal_actions': {}})
+        agent.feed_episode(recorder.finish([1.0])[0])
+        self.assertEqual(agent.total_t, 3)
+        self.assertEqual(len(agent._rl_agent.memory), 3)
+
+    def test_train_packed_obs(self):
+        import rlcard
+
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'obs_dtype': 'packed'})
+        agent = NFSPAgent(num_actions=env.num_actions,
+                          state_shape=env.state_shape[0],
+                          hidden_layers_sizes=[10],
+                          reservoir_buffer_capacity=50,
+                          anticipatory_param=1,
+                          batch_size=8,
+                          min_buffer_size_to_learn=20,
+                          q_replay_memory_size=50,
+                          q_replay_memory_init_size=20,
+                          q_batch_size=8,
+                          q_mlp_layers=[10],
+                          device=torch.device('cpu'))
+        env.set_agents([agent, agent])
+        while agent.train_t == 0:
+            agent.sample_episode_policy()
+            trajectories, payoffs = env.run(is_training=True)
+            for ts in rlcard.utils.reorganize(trajectories, payoffs)[0]:
+                agent.feed(ts)
+        # The reservoir buffer keeps the packed observations
+        self.assertEqual(agent._reservoir_buffer._info_states.shape[1], 5)
+        state, _ = env.reset()
+        action, info = agent.eval_step(state)
+        self.assertIn(action, state['legal_actions'])
@@ -0,0 +1,57 @@
+import importlib.util
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.parallel_cfr_agent import ParallelCFRAgent
+from rlcard.utils import seeding
+
+
+@unittest.skipUnless(importlib.util.find_spec('multiprocessing.shared_memory'), 'ParallelCFRAgent requires Python 3.8 or later')
+class TestParallelCFR(unittest.TestCase):
+
+    def test_one_worker_matches_cfr(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = ParallelCFRAgent(env, model_path='experiments/parallel_cfr_model', num_workers=1, seed=0)
+        cfr_env = rlcard.make('leduc-holdem', config={'allow_step_back':True, 'seed': seeding.hash_seed(0)})
+        cfr_agent = CFRAgent(cfr_env, model_path='experiments/cfr_model')
+        for _ in range(10):
+            agent.train()
+            cfr_agent.train()
+        agent.close()
+
+        self.assertEqual(sorted(agent.table.keys), sorted(cfr_agent.table.keys))
+        for obs in cfr_agent.table.keys:
+            row, cfr_row = agent.table.index[obs], cfr_agent.table.index[obs]
+            self.assertTrue(np.allclose(agent.table.regrets[row], cfr_agent.table.regrets[cfr_row]))
+            self.assertTrue(np.allclose(agent.table.average_policy[row], cfr_agent.table.average_policy[cfr_row]))
+
+    def test_is_deterministic(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        tables = []
+        for _ in range(2):
+            agent = ParallelCFRAgent(env, model_path='experiments/parallel_cfr_model', num_workers=2, seed=0)
+            for _ in range(5):
+                agent.train()
+            agent.close()
+            tables.append(agent.table)
+        self.assertEqual(tables[0].keys, tables[1].keys)
+        self.assertTrue(np.array_equal(tables[0].regrets, tables[1].regrets))
+
+    def test_save_and_load(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = ParallelCFRAgent(env, model_path='experiments/parallel_cfr_model', num_workers=2, seed=0)
+        for _ in range(5):
+            agent.train()
+        agent.save()
+
+        agent.load()
+        for _ in range(2):
+            agent.train()
+        agent.close()
+        self.assertEqual(agent.iteration, 7)
+
+        state = {'obs': np.array([1., 1., 0., 0., 0., 0.]), 'legal_actions': {0: None,2: None}, 'raw_legal_actions': ['call', 'fold']}
+        action, _ = agent.eval_step(state)
+        self.assertIn(action, [0, 2])
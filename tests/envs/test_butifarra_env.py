@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.envs.butifarra import DefaultHiddenButifarraStateExtractor, IncrementalHiddenButifarraStateExtractor
+from .determism_util import is_deterministic
+
+
+class TestButifarraEnv(unittest.TestCase):
+
+    def test_init_and_extract_state(self):
+        env = rlcard.make('butifarra')
+        state, _ = env.reset()
+        self.assertEqual(state['obs'].size, env.state_shape[0][1])
+
+    def test_is_deterministic(self):
+        self.assertTrue(is_deterministic('butifarra'))
+
+    def test_incremental_extractor_matches_default(self):
+        env = rlcard.make('butifarra', config={'seed': 0})
+        default_extractor = DefaultHiddenButifarraStateExtractor()
+        incremental_extractor = IncrementalHiddenButifarraStateExtractor()
+        for _ in range(20):
+            state, _ = env.reset()
+            while not env.is_over():
+                expected = default_extractor.extract_state(env.game)
+                actual = incremental_extractor.extract_state(env.game)
+                self.assertTrue(np.array_equal(expected['obs'], actual['obs']))
+                self.assertEqual(expected['obs'].dtype, actual['obs'].dtype)
+                self.assertEqual(list(expected['legal_actions']), list(actual['legal_actions']))
+                state, _ = env.step(np.random.choice(list(state['legal_actions'].keys())))
+
+    def test_step_back(self):
+        env = rlcard.make('butifarra', config={'allow_step_back': True})
+        state, player_id = env.reset()
+        env.step(list(state['legal_actions'].keys())[0])
+        back_state, back_player_id = env.step_back()
+        self.assertEqual(player_id, back_player_id)
+        self.assertTrue(np.array_equal(state['obs'], back_state['obs']))
+        self.assertEqual(env.step_back(), False)
+
+        env = rlcard.make('butifarra')
+        with self.assertRaises(Exception):
+            env.step_back()
+
+    def test_obs_dtype(self):
+        env = rlcard.make('butifarra', config={'seed': 0})
+        state, _ = env.reset()
+        int8_env = rlcard.make('butifarra', config={'seed': 0, 'obs_dtype': 'int8'})
+        int8_state, _ = int8_env.reset()
+        self.assertEqual(int8_state['obs'].dtype, np.int8)
+        self.assertTrue(np.array_equal(int8_state['obs'], state['obs']))
+
+        # The observation holds card counts and ids, not bits
+        bool_env = rlcard.make('butifarra', config={'obs_dtype': 'bool'})
+        with self.assertRaises(ValueError):
+            bool_env.reset()
+
+    def test_debug_views(self):
+        env = rlcard.make('butifarra', config={'seed': 0})
+        debug_env = rlcard.make('butifarra', config={'seed': 0, 'debug_views': True})
+        state, _ = env.reset()
+        debug_state, _ = debug_env.reset()
+        self.assertNotIn('text', list(state.keys()))
+        self.assertIn('text', list(debug_state.keys()))
+
+        # The views are built when they are looked up
+        self.assertIn('raw_legal_actions', state)
+        self.assertIn('raw_legal_actions', list(state.keys()))
+        self.assertEqual(len(state), len(debug_state))
+        self.assertEqual(state['raw_legal_actions'], [str(action) for action in state['legal_actions']])
+        self.assertEqual(state.get('text'), debug_state['text'])
+        self.assertEqual(sorted(state.keys()), sorted(debug_state.keys()))
+        self.assertIsNone(state.get('missing'))
+        with self.assertRaises(KeyError):
+            state['missing']
+
+    def test_run(self):
+        env = rlcard.make('butifarra')
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        trajectories, payoffs = env.run(is_training=False)
+        self.assertEqual(len(trajectories), 4)
+        self.assertEqual(len(payoffs), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+
+from rlcard.envs.butifarra import DefaultHiddenButifarraStateExtractor
+from rlcard.envs.butifarra_vector import ButifarraVectorEnv
+
+
+def random_actions(legal_actions_mask):
+    return np.array([np.random.choice(np.flatnonzero(mask)) for mask in legal_actions_mask])
+
+
+class TestButifarraVectorEnv(unittest.TestCase):
+
+    def test_reset(self):
+        env = ButifarraVectorEnv(8, config={'seed': 0})
+        obs, legal_actions_mask, player_ids = env.reset()
+        self.assertEqual(obs.shape, (8, env.state_size))
+        self.assertEqual(legal_actions_mask.shape, (8, 58))
+        self.assertEqual(player_ids.shape, (8,))
+        self.assertTrue(legal_actions_mask.any(axis=1).all())
+
+    def test_matches_single_game_extractor(self):
+        env = ButifarraVectorEnv(4, config={'seed': 1})
+        extractor = DefaultHiddenButifarraStateExtractor()
+        obs, legal_actions_mask, player_ids = env.reset()
+        for _ in range(60):
+            obs, legal_actions_mask, player_ids, _, _ = env.step(random_actions(legal_actions_mask))
+            for i, game in enumerate(env.games):
+                state = extractor.extract_state(game)
+                self.assertTrue(np.array_equal(obs[i], state['obs']))
+                self.assertEqual(list(np.flatnonzero(legal_actions_mask[i])), sorted(state['legal_actions']))
+                self.assertEqual(player_ids[i], game.round.current_player_id)
+
+    def test_auto_reset_reports_payoffs(self):
+        env = ButifarraVectorEnv(4, config={'seed': 2})
+        _, legal_actions_mask, _ = env.reset()
+        finished = 0
+        while finished < 8:
+            _, legal_actions_mask, _, payoffs, dones = env.step(random_actions(legal_actions_mask))
+            finished += dones.sum()
+            self.assertTrue((payoffs[~dones] == 0).all())
+            self.assertFalse(env.is_over().any())
+
+    def test_without_auto_reset(self):
+        env = ButifarraVectorEnv(3, config={'seed': 3, 'auto_reset': False})
+        _, legal_actions_mask, _ = env.reset()
+        while not env.is_over().all():
+            actions = np.zeros(3, dtype=int)
+            live = legal_actions_mask.any(axis=1)
+            actions[live] = random_actions(legal_actions_mask[live])
+            _, legal_actions_mask, _, _, _ = env.step(actions)
+        self.assertFalse(legal_actions_mask.any())
+        self.assertEqual(env.get_payoffs().shape, (3, 4))
+
+    def test_obs_dtype(self):
+        env = ButifarraVectorEnv(2, config={'seed': 3})
+        int8_env = ButifarraVectorEnv(2, config={'seed': 3, 'obs_dtype': 'int8'})
+        obs, _, _ = env.reset()
+        int8_obs, _, _ = int8_env.reset()
+        self.assertEqual(int8_obs.dtype, np.int8)
+        self.assertTrue(np.array_equal(int8_obs, obs))
+        with self.assertRaises(ValueError):
+            ButifarraVectorEnv(2, config={'obs_dtype': 'packed'})
+
+    def test_is_deterministic(self):
+        all_obs = []
+        for _ in range(2):
+            np.random.seed(5)
+            env = ButifarraVectorEnv(2, config={'seed': 7})
+            obs, legal_actions_mask, _ = env.reset()
+            trace = [obs.copy()]
+            for _ in range(30):
+                obs, legal_actions_mask, _, _, _ = env.step(random_actions(legal_actions_mask))
+                trace.append(obs.copy())
+            all_obs.append(np.stack(trace))
+        self.assertTrue(np.array_equal(all_obs[0], all_obs[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import importlib.util
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.envs.env_pool import EnvPool
+
+
+@unittest.skipUnless(importlib.util.find_spec('multiprocessing.shared_memory'), 'EnvPool requires Python 3.8 or later')
+class TestEnvPool(unittest.TestCase):
+
+    def test_step(self):
+        num_envs = 3
+        envs = [rlcard.make('leduc-holdem', config={'seed': 7 + i}) for i in range(num_envs)]
+        states = [env.reset()[0] for env in envs]
+        with EnvPool('leduc-holdem', num_envs, config={'seed': 7}) as pool:
+            self.assertEqual(pool.num_actions, envs[0].num_actions)
+            obs, legal_actions_mask, player_ids = pool.reset()
+            num_dones = 0
+            for _ in range(30):
+                for i, env in enumerate(envs):
+                    self.assertTrue(np.array_equal(obs[i], states[i]['obs']))
+                    self.assertEqual(player_ids[i], env.get_player_id())
+                    self.assertEqual(list(np.flatnonzero(legal_actions_mask[i])), list(states[i]['legal_actions']))
+                actions = [list(state['legal_actions'])[0] for state in states]
+                obs, legal_actions_mask, player_ids, payoffs, dones = pool.step(actions)
+                for i, env in enumerate(envs):
+                    states[i], _ = env.step(actions[i])
+                    self.assertEqual(dones[i], env.is_over())
+                    if env.is_over():
+                        num_dones += 1
+                        self.assertTrue(np.array_equal(payoffs[i], env.get_payoffs()))
+                        states[i], _ = env.reset()
+                    else:
+                        self.assertTrue(np.all(payoffs[i] == 0))
+            self.assertGreater(num_dones, 0)
+
+    def test_async(self):
+        with EnvPool('leduc-holdem', 4, config={'seed': 0}) as pool:
+            obs, legal_actions_mask, player_ids = pool.reset()
+            pool.send([np.flatnonzero(mask)[0] for mask in legal_actions_mask])
+            with self.assertRaises(ValueError):
+                pool.send([0], [2])
+            num_steps = 0
+            while num_steps < 40:
+                ready = pool.recv()
+                self.assertGreater(len(ready), 0)
+                num_steps += len(ready)
+                actions = [np.flatnonzero(pool.legal_actions_mask[i])[-1] for i in ready]
+                pool.send(actions, ready)
+            self.assertEqual(len(pool.recv(min_ready=4)), 4)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            EnvPool('leduc-holdem', 0)
+
+    def test_worker_error(self):
+        pool = EnvPool('leduc-holdem', 2, config={'seed': 0})
+        try:
+            pool.reset()
+            with self.assertRaises(RuntimeError) as context:
+                pool.step([99, 99])
+            # The error names the worker and carries the traceback of the environment
+            self.assertRegex(str(context.exception), r'Worker [01] of the EnvPool failed')
+            self.assertIn('Traceback', str(context.exception))
+            self.assertEqual(len(pool._pending), 1)
+        finally:
+            pool.close()
+        self.assertEqual(pool._pending, set())
+        self.assertEqual(pool._blocks, {})
+        self.assertIsNone(pool.obs)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import numpy as np
 
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.utils import unpack_obs
 from .determism_util import is_deterministic
 
 
@@ -15,6 +16,23 @@ class TestLeducholdemEnv(unittest.TestCase):
         for action in state['legal_actions']:
             self.assertLess(action, env.num_actions)
 
+    def test_obs_dtype(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0})
+        state, _ = env.reset()
+        for obs_dtype, dtype in [('int8', np.int8), ('bool', np.bool_)]:
+            converted_env = rlcard.make('leduc-holdem', config={'seed': 0, 'obs_dtype': obs_dtype})
+            converted, _ = converted_env.reset()
+            self.assertEqual(converted['obs'].dtype, dtype)
+            self.assertTrue(np.array_equal(converted['obs'], state['obs']))
+
+        packed_env = rlcard.make('leduc-holdem', config={'seed': 0, 'obs_dtype': 'packed'})
+        packed, _ = packed_env.reset()
+        self.assertEqual(packed['obs'].shape, (5,))
+        self.assertTrue(np.array_equal(unpack_obs(packed['obs'], 36), state['obs']))
+
+        with self.assertRaises(ValueError):
+            rlcard.make('leduc-holdem', config={'obs_dtype': 'float16'})
+
     def test_is_deterministic(self):
         self.assertTrue(is_deterministic('leduc-holdem'))
 
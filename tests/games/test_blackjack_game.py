@@ -62,6 +62,16 @@ class TestBlackjackGame(unittest.TestCase):
         success = game.step_back()
         self.assertEqual(success, False)
 
+    def test_step_back_deals_same_card(self):
+        game = Game(allow_step_back=True)
+        game.configure(DEFAULT_GAME_CONFIG)
+        game.init_game()
+        deck_size = len(game.dealer.deck)
+        state, _ = game.step('hit')
+        game.step_back()
+        self.assertEqual(len(game.dealer.deck), deck_size)
+        self.assertEqual(game.step('hit')[0], state)
+
     def test_get_state(self):
         game = Game()
         game.configure(DEFAULT_GAME_CONFIG)
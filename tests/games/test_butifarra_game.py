@@ -4,15 +4,20 @@
     Date created: 11/25/2021
 '''
 
+import copy
+import pickle
 import unittest
 import numpy as np
 
 from rlcard.games.butifarra.game import ButifarraGame as Game
 from rlcard.games.butifarra.dealer import ButifarraDealer
 from rlcard.games.butifarra.player import ButifarraPlayer
-from rlcard.games.butifarra.utils.action_event import PassarAction, DelegarAction
-from rlcard.games.butifarra.utils.butifarra_card import ButifarraCard
-from rlcard.games.butifarra.utils.move import DealHandMove
+from rlcard.games.butifarra.utils.action_event import ActionEvent, PassarAction, DelegarAction
+from rlcard.games.butifarra.utils.butifarra_card import ButifarraCard, pal_index, is_card_higher
+from rlcard.games.butifarra.utils.move import DealHandMove, PlayCardMove, MakeCantarMove, MakeDelegarMove, \
+    MakeContrarMove, MakeRecontrarMove, MakeSantVicencMove, MakePassarMove
+from rlcard.games.butifarra.utils import card_mask
+from rlcard.envs.butifarra import IncrementalHiddenButifarraStateExtractor
 
 
 class TestButifarraGame(unittest.TestCase):
@@ -46,6 +51,23 @@ class TestButifarraGame(unittest.TestCase):
         self.assertEqual(len(ButifarraCard.get_deck()), 48)
         print("done")
 
+    def test_interned_cards(self):
+        for card_id, card in enumerate(ButifarraCard.get_deck()):
+            self.assertEqual(card.card_id, card_id)
+            self.assertIs(ButifarraCard(card.suit, card.rank), card)
+            self.assertIs(pickle.loads(pickle.dumps(card)), card)
+            self.assertIs(copy.deepcopy(card), card)
+            self.assertFalse(hasattr(card, '__dict__'))
+            with self.assertRaises(AttributeError):
+                card.card_id = 0
+        self.assertEqual(len(set(ButifarraCard.get_deck())), 48)
+
+        # The dealer shuffles the references to the interned cards
+        np_random = np.random.RandomState(3)
+        deck = ButifarraCard.get_deck()
+        np_random.shuffle(deck)
+        self.assertEqual(ButifarraDealer(np.random.RandomState(3)).shuffled_deck, deck)
+
     def test_init_game(self):
         player_ids = list(range(4))
         game = Game()
@@ -137,6 +159,236 @@ class TestButifarraGame(unittest.TestCase):
             hand = player.hand
             self.assertTrue(not hand)
 
+    def test_card_mask_count_points(self):
+        deck = ButifarraCard.get_deck()
+        self.assertEqual(card_mask.count_points(card_mask.FULL_MASK), sum(card.get_valor() for card in deck))
+        cards = [deck[i] for i in np.random.choice(48, 20, replace=False)]
+        mask = card_mask.mask_from_cards(cards)
+        self.assertEqual(card_mask.card_ids(mask), sorted(card.card_id for card in cards))
+        self.assertEqual(card_mask.count_points(mask), sum(card.get_valor() for card in cards))
+
+    def test_card_mask_beating_mask(self):
+        deck = ButifarraCard.get_deck()
+        for trump_suit in ButifarraCard.pals + [None]:
+            for lead_suit in ButifarraCard.pals:
+                for high_card in deck:
+                    if high_card.suit not in (lead_suit, trump_suit):
+                        continue
+                    expected = card_mask.mask_from_cards([card for card in deck if card.mes_alta_que(high_card, lead_suit, trump_suit)])
+                    actual = card_mask.beating_mask(high_card.card_id, pal_index(lead_suit), pal_index(trump_suit))
+                    self.assertEqual(actual, expected)
+
+    def test_is_card_higher(self):
+        deck = ButifarraCard.get_deck()
+        for trump_suit in ButifarraCard.pals + [None]:
+            for lead_suit in ButifarraCard.pals:
+                for card in deck:
+                    for other_card in deck:
+                        rank_index, other_rank_index = ButifarraCard.numero.index(card.rank), ButifarraCard.numero.index(other_card.rank)
+                        if card.suit == other_card.suit:
+                            expected = rank_index > other_rank_index
+                        else:
+                            expected = card.suit == trump_suit or (card.suit == lead_suit and other_card.suit != trump_suit)
+                            if other_card.suit not in (lead_suit, trump_suit) and card.suit not in (lead_suit, trump_suit):
+                                expected = rank_index > other_rank_index
+                        self.assertEqual(is_card_higher(card.card_id, other_card.card_id, pal_index(lead_suit), pal_index(trump_suit)), expected)
+                        self.assertEqual(card.mes_alta_que(other_card, lead_suit, trump_suit), expected)
+
+    def test_hand_mask_follows_hand(self):
+        game = Game()
+        game.init_game()
+        while not game.is_over():
+            for player in game.round.players:
+                self.assertEqual(player.hand_mask, card_mask.mask_from_cards(player.hand))
+            game.step(np.random.choice(game.judger.get_legal_actions()))
+        self.assertEqual(game.round.won_cards_masks[0] | game.round.won_cards_masks[1], card_mask.FULL_MASK)
+
+    def test_bidding_state_matches_move_sheet(self):
+        def bidding_over_from_move_sheet(move_sheet):
+            if isinstance(move_sheet[-1], (PlayCardMove, MakeSantVicencMove)):
+                return True
+            pass_count = 0
+            for move in reversed(move_sheet):
+                if isinstance(move, MakePassarMove):
+                    pass_count += 1
+                if isinstance(move, (MakeCantarMove, MakeDelegarMove, MakeRecontrarMove, MakeContrarMove)):
+                    return pass_count == 2
+            return False
+
+        def last_move(move_sheet, move_class):
+            return next((move for move in reversed(move_sheet) if isinstance(move, move_class)), None)
+
+        game = Game(allow_step_back=True)
+        for _ in range(20):
+            game.init_game()
+            num_steps = 0
+            while True:
+                game_round = game.round
+                bidding_over = bidding_over_from_move_sheet(game_round.move_sheet)
+                game_over = bidding_over and not any(player.hand for player in game_round.players)
+                self.assertEqual(game_round.is_bidding_over(), bidding_over)
+                self.assertEqual(game_round.is_over(), game_over)
+                self.assertEqual(game_round.round_phase, 'game over' if game_over else 'play card' if bidding_over else 'cantar')
+                for attribute, move_class in [('cantar_move', MakeCantarMove), ('delegar_move', MakeDelegarMove),
+                                              ('contrar_move', MakeContrarMove), ('recontrar_move', MakeRecontrarMove)]:
+                    self.assertIs(getattr(game_round, attribute), last_move(game_round.move_sheet, move_class))
+                cantar_move = last_move(game_round.move_sheet, MakeCantarMove)
+                self.assertIs(game_round.get_declarer(), cantar_move.player if cantar_move else None)
+                if game_over:
+                    break
+                game.step(np.random.choice(game.judger.get_legal_actions()))
+                num_steps += 1
+                # Undo and redo a step now and then
+                if num_steps % 7 == 0:
+                    action = game.actions[-1]
+                    self.assertTrue(game.step_back())
+                    game.step(action)
+
+    def test_interned_action_events(self):
+        for action_id in range(Game.get_num_actions()):
+            action = ActionEvent.from_action_id(action_id)
+            self.assertEqual(action.action_id, action_id)
+            self.assertIs(ActionEvent.from_action_id(action_id), action)
+            self.assertIs(pickle.loads(pickle.dumps(action)), action)
+            self.assertIs(copy.deepcopy(action), action)
+            self.assertEqual(hash(action), hash(ActionEvent(action_id)))
+            with self.assertRaises(AttributeError):
+                action.action_id = 0
+        self.assertIs(ActionEvent.play_card_action(ButifarraCard.card(5)), ActionEvent.from_action_id(15))
+        with self.assertRaises(Exception):
+            ActionEvent.from_action_id(Game.get_num_actions())
+
+        game = Game()
+        game.init_game()
+        while not game.is_over():
+            legal_actions = game.judger.get_legal_actions()
+            for action in legal_actions:
+                self.assertIs(action, ActionEvent.from_action_id(action.action_id))
+            game.step(np.random.choice(legal_actions))
+        for move in game.round.move_sheet:
+            self.assertFalse(hasattr(move, '__dict__'))
+
+    def test_step_back(self):
+        extractor = IncrementalHiddenButifarraStateExtractor()
+        game = Game(allow_step_back=True)
+        game.init_game()
+        self.assertFalse(game.step_back())
+        snapshots = []
+        while not game.is_over():
+            state = extractor.extract_state(game)
+            snapshots.append((state['obs'].copy(), list(state['legal_actions']), game.round.current_player_id,
+                              [list(player.hand) for player in game.round.players], list(game.round.won_bases_counts)))
+            game.step(np.random.choice(game.judger.get_legal_actions()))
+        while snapshots:
+            self.assertTrue(game.step_back())
+            obs, legal_actions, current_player_id, hands, won_bases_counts = snapshots.pop()
+            state = extractor.extract_state(game)
+            self.assertTrue(np.array_equal(state['obs'], obs))
+            self.assertEqual(list(state['legal_actions']), legal_actions)
+            self.assertEqual(game.round.current_player_id, current_player_id)
+            self.assertEqual([player.hand for player in game.round.players], hands)
+            self.assertEqual(game.round.won_bases_counts, won_bases_counts)
+            for player in game.round.players:
+                self.assertEqual(player.hand_mask, card_mask.mask_from_cards(player.hand))
+        self.assertEqual(len(game.round.move_sheet), 1)
+        self.assertFalse(game.step_back())
+
+
+    def test_reset_in_place(self):
+        extractor = IncrementalHiddenButifarraStateExtractor()
+        game = Game()
+        game.np_random.seed(7)
+        game.init_game()
+        butifarra_round, players, card_tracker = game.round, game.round.players, game.round.card_tracker
+        for _ in range(3):
+            while not game.is_over():
+                game.step(np.random.choice(game.judger.get_legal_actions()))
+            rng_state = game.np_random.get_state()
+            game.init_game()
+            self.assertIs(game.round, butifarra_round)
+            self.assertIs(game.round.players, players)
+            self.assertIs(game.round.card_tracker, card_tracker)
+
+            # The hand dealt in place is the hand of a new round drawn from the same random state
+            fresh_game = Game()
+            fresh_game.np_random.set_state(rng_state)
+            fresh_game.init_game()
+            self.assertEqual(game.round.board_id, fresh_game.round.board_id)
+            self.assertEqual(game.round.current_player_id, fresh_game.round.current_player_id)
+            self.assertEqual(game.round.dealer.shuffled_deck, fresh_game.round.dealer.shuffled_deck)
+            self.assertEqual([player.hand for player in players], [player.hand for player in fresh_game.round.players])
+            self.assertEqual([player.hand_mask for player in players],
+                             [player.hand_mask for player in fresh_game.round.players])
+            self.assertEqual(len(game.round.move_sheet), 1)
+            self.assertEqual(game.round.won_cards, [[], []])
+            self.assertEqual(game.round.won_bases_counts, [0, 0])
+            self.assertFalse(game.round.undo_log)
+            self.assertTrue(np.array_equal(extractor.extract_state(game)['obs'],
+                                           extractor.extract_state(fresh_game)['obs']))
+
+        # A new np_random, as set by Env.seed, is used by the next hand
+        game.np_random = np.random.RandomState(3)
+        game.init_game()
+        self.assertIs(game.round.dealer.np_random, game.np_random)
+
+    def test_to_bytes(self):
+        extractor = IncrementalHiddenButifarraStateExtractor()
+        game = Game()
+        game.init_game()
+        while True:
+            data = game.to_bytes()
+            self.assertLess(len(data), 100)
+            restored_game = Game.from_bytes(data)
+            self.assertEqual(restored_game.to_bytes(), data)
+            self.assertEqual(restored_game.round.dealer.shuffled_deck, game.round.dealer.shuffled_deck)
+            self.assertEqual([player.hand for player in restored_game.round.players],
+                             [player.hand for player in game.round.players])
+            self.assertEqual(restored_game.round.won_cards, game.round.won_cards)
+            self.assertEqual(restored_game.round.round_phase, game.round.round_phase)
+            self.assertEqual(restored_game.is_over(), game.is_over())
+            if game.is_over():
+                break
+            self.assertEqual(restored_game.get_player_id(), game.get_player_id())
+            self.assertTrue(np.array_equal(extractor.extract_state(restored_game)['obs'],
+                                           extractor.extract_state(game)['obs']))
+            game.step(np.random.choice(game.judger.get_legal_actions()))
+
+        # The replayed undo log steps back to the deal
+        while restored_game.step_back():
+            pass
+        self.assertEqual(sum(len(player.hand) for player in restored_game.round.players), 48)
+
+        with self.assertRaises(Exception):
+            Game.from_bytes(data[:-1])
+
+        # A card of the hand that may not be played raises even when the encoded counters match
+        game = Game()
+        game.np_random.seed(0)
+        illegal_actions = []
+        while not illegal_actions:
+            game.init_game()
+            while not game.round.is_bidding_over():
+                game.step(game.judger.get_legal_actions()[0])
+            game.step(game.judger.get_legal_actions()[0])
+            legal_actions = game.judger.get_legal_actions()
+            illegal_actions = [ActionEvent.play_card_action(card) for card in game.round.get_current_player().hand
+                               if ActionEvent.play_card_action(card) not in legal_actions]
+        game.actions.append(illegal_actions[0])
+        with self.assertRaises(Exception):
+            Game.from_bytes(game.to_bytes())
+
+    def test_clone(self):
+        game = Game()
+        game.init_game()
+        for _ in range(20):
+            game.step(np.random.choice(game.judger.get_legal_actions()))
+        data = game.to_bytes()
+        clone = game.clone()
+        self.assertIs(clone.np_random, game.np_random)
+        while not clone.is_over():
+            clone.step(np.random.choice(clone.judger.get_legal_actions()))
+        self.assertEqual(game.to_bytes(), data)
+        self.assertEqual(len(game.actions), 20)
 
 if __name__ == '__main__':
     unittest.main()
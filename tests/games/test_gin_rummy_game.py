@@ -214,5 +214,15 @@ class TestGinRummyGame(unittest.TestCase):
         self.assertEqual(result_as_set, correct_result_as_set)
 
 
+    def test_interned_cards(self):
+        for card_id in range(52):
+            card = utils.get_card(card_id)
+            self.assertEqual(card.card_id, card_id)
+            self.assertEqual(utils.get_card_id(card), card_id)
+            self.assertIs(utils.card_from_text(str(card)), card)
+            self.assertIs(utils.card_from_card_id(card_id), card)
+        self.assertEqual(sorted(card.card_id for card in GinRummyDealer(np.random.RandomState()).shuffled_deck),
+                         list(range(52)))
+
 if __name__ == '__main__':
     unittest.main()
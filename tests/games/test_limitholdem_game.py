@@ -99,6 +99,24 @@ class TestLimitHoldemMethods(unittest.TestCase):
             action = np.random.choice(legal_actions)
             game.step(action)
 
+    def test_step_back_restores_state(self):
+        game = Game(allow_step_back=True)
+        game.init_game()
+        states = []
+        while not game.is_over():
+            player_id = game.get_player_id()
+            state = game.get_state(player_id)
+            state['raise_nums'] = list(state['raise_nums'])
+            states.append((player_id, state, len(game.dealer.deck)))
+            game.step(np.random.choice(game.get_legal_actions()))
+        while states:
+            self.assertTrue(game.step_back())
+            player_id, state, deck_size = states.pop()
+            self.assertEqual(game.get_player_id(), player_id)
+            self.assertEqual(game.get_state(player_id), state)
+            self.assertEqual(len(game.dealer.deck), deck_size)
+        self.assertFalse(game.step_back())
+
     def test_payoffs(self):
         game = Game()
         np.random.seed(0)
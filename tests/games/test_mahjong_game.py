@@ -1,8 +1,11 @@
+import copy
 import unittest
 import numpy as np
 
 from rlcard.games.mahjong.game import MahjongGame as Game
 from rlcard.games.mahjong.player import MahjongPlayer as Player
+from rlcard.games.mahjong.card import MahjongCard
+from rlcard.games.mahjong.utils import init_deck
 
 class TestMahjongMethods(unittest.TestCase):
 
@@ -68,6 +71,17 @@ class TestMahjongMethods(unittest.TestCase):
         success = game.step_back()
         self.assertEqual(success, False)
 
+    def test_interned_cards(self):
+        deck = init_deck()
+        self.assertEqual(len(deck), 136)
+        self.assertEqual([card.card_id for card in deck[:34]], list(range(34)))
+        self.assertEqual([card.index_num for card in deck[27:34]], [0, 1, 2, 0, 1, 2, 3])
+        for card in deck:
+            self.assertIs(MahjongCard(card.type, card.trait), card)
+            self.assertIs(copy.deepcopy(card), card)
+            with self.assertRaises(AttributeError):
+                card.index_num = 0
+
     def test_player_get_player_id(self):
         player = Player(0, np.random.RandomState())
         self.assertEqual(0, player.get_player_id())
@@ -49,6 +49,23 @@ class TestNolimitholdemMethods(unittest.TestCase):
         player.bet(150)
         self.assertEqual(100, player.in_chips)
 
+    def test_step_back(self):
+        game = Game(allow_step_back=True)
+        game.init_game()
+        self.assertFalse(game.step_back())
+        states = []
+        while not game.is_over():
+            player_id = game.get_player_id()
+            states.append((player_id, game.get_state(player_id), len(game.dealer.deck)))
+            game.step(np.random.choice(game.get_legal_actions()))
+        while states:
+            self.assertTrue(game.step_back())
+            player_id, state, deck_size = states.pop()
+            self.assertEqual(game.get_player_id(), player_id)
+            self.assertEqual(game.get_state(player_id), state)
+            self.assertEqual(len(game.dealer.deck), deck_size)
+        self.assertFalse(game.step_back())
+
     def test_step_2(self):
         game = Game()
 
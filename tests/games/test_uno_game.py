@@ -1,9 +1,11 @@
+import copy
 import unittest
 import numpy as np
 
 from rlcard.games.uno.game import UnoGame as Game
 from rlcard.games.uno.player import UnoPlayer as Player
-from rlcard.games.uno.utils import ACTION_LIST
+from rlcard.games.uno.card import UnoCard
+from rlcard.games.uno.utils import ACTION_LIST, ACTION_SPACE, init_deck
 from rlcard.games.uno.utils import hand2dict, encode_hand, encode_target
 
 class TestUnoMethods(unittest.TestCase):
@@ -69,6 +71,23 @@ class TestUnoMethods(unittest.TestCase):
         success = game.step_back()
         self.assertEqual(success, False)
 
+    def test_interned_cards(self):
+        for card in init_deck():
+            self.assertIs(UnoCard(card.type, card.color, card.trait), card)
+            self.assertEqual(card.card_id, ACTION_SPACE[card.str])
+            self.assertIs(copy.deepcopy(card), card)
+            with self.assertRaises(AttributeError):
+                card.color = 'r'
+        self.assertEqual(len(set(init_deck())), 60)
+
+        # Wild cards are replaced by the wild card of the chosen color
+        game = Game()
+        game.init_game()
+        while not game.is_over():
+            target = game.round.target
+            self.assertEqual(target.str, target.color + '-' + target.trait)
+            game.step(np.random.choice(game.get_legal_actions()))
+
     def test_hand2dict(self):
         hand_1 = ['y-1', 'r-8', 'b-9', 'y-reverse', 'r-skip']
         hand1_dict = hand2dict(hand_1)
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import rlcard
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(rlcard.__file__)))
+
+# Cold import budget of each package in microseconds. Importing them used to take
+# seconds (pip freeze, torch and every game), and takes a few milliseconds now
+IMPORT_TIME_BUDGET = 200000
+
+HEAVY_MODULES = ('numpy', 'torch', 'subprocess')
+
+
+def cold_import(module):
+    ''' Import module in a fresh interpreter
+
+    Returns:
+        (tuple) that contains:
+            cumulative_time (int): The import time of the module in microseconds
+            heavy_modules (list): The modules of HEAVY_MODULES loaded by the import
+    '''
+    code = 'import sys, {}; print(",".join(m for m in {!r} if m in sys.modules))'.format(module, HEAVY_MODULES)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ROOT_DIR, env.get('PYTHONPATH', '')])
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, env=env, cwd=ROOT_DIR, check=True)
+    cumulative_time = None
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            cumulative_time = int(cumulative)
+    heavy_modules = [name for name in result.stdout.strip().split(',') if name]
+    return cumulative_time, heavy_modules
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_import_rlcard(self):
+        cumulative_time, heavy_modules = cold_import('rlcard')
+        self.assertEqual(heavy_modules, [])
+        self.assertLess(cumulative_time, IMPORT_TIME_BUDGET)
+
+    def test_import_agents(self):
+        cumulative_time, heavy_modules = cold_import('rlcard.agents')
+        self.assertEqual(heavy_modules, [])
+        self.assertLess(cumulative_time, IMPORT_TIME_BUDGET)
+
+    def test_import_models(self):
+        cumulative_time, heavy_modules = cold_import('rlcard.models')
+        self.assertEqual(heavy_modules, [])
+        self.assertLess(cumulative_time, IMPORT_TIME_BUDGET)
+
+    def test_lazy_agents(self):
+        import rlcard.agents
+        from rlcard.agents import CFRAgent, RandomAgent
+        from rlcard.agents.cfr_agent import CFRAgent as cfr_agent
+        self.assertIs(CFRAgent, cfr_agent)
+        self.assertIn('RandomAgent', dir(rlcard.agents))
+        with self.assertRaises(AttributeError):
+            rlcard.agents.UnknownAgent
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.trajectory import EpisodeRecorder
+from rlcard.utils.utils import reorganize
+
+
+class TestTrajectory(unittest.TestCase):
+
+    def test_run_columnar(self):
+        for env_name in ['leduc-holdem', 'blackjack', 'butifarra']:
+            env = rlcard.make(env_name, config={'seed': 3})
+            env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+            for _ in range(5):
+                np.random.seed(11)
+                env.seed(5)
+                trajectories, payoffs = env.run(is_training=True)
+                np.random.seed(11)
+                env.seed(5)
+                episodes, columnar_payoffs = env.run_columnar(is_training=True)
+                self.assertTrue(np.array_equal(payoffs, columnar_payoffs))
+
+                for transitions, episode in zip(reorganize(trajectories, payoffs), episodes):
+                    self.assertEqual(len(transitions), len(episode))
+                    for (state, action, reward, next_state, done), columnar in zip(transitions, episode.transitions()):
+                        self.assertTrue(np.array_equal(state['obs'], columnar[0]['obs']))
+                        self.assertEqual(sorted(state['legal_actions']), list(columnar[0]['legal_actions']))
+                        self.assertEqual(action, columnar[1])
+                        self.assertEqual(reward, columnar[2])
+                        self.assertTrue(np.array_equal(next_state['obs'], columnar[3]['obs']))
+                        self.assertEqual(sorted(next_state['legal_actions']), list(columnar[3]['legal_actions']))
+                        self.assertEqual(done, columnar[4])
+
+    def test_recorder_grows(self):
+        recorder = EpisodeRecorder(num_players=1, num_actions=3, capacity=2)
+        recorder.start()
+        for t in range(5):
+            recorder.add_state(0, {'obs': np.full(2, t), 'legal_actions': {t % 3: None}})
+            recorder.add_action(0, t % 3)
+        recorder.add_state(0, {'obs': np.full(2, 5), 'legal_actions': {}})
+        episode = recorder.finish([1.5])[0]
+        self.assertEqual(len(episode), 5)
+        self.assertTrue(np.array_equal(episode.next_states[:, 0], np.arange(1, 6)))
+        self.assertTrue(np.array_equal(np.argmax(episode.legal_actions_masks[:5], axis=1), np.arange(5) % 3))
+        self.assertEqual(list(episode.rewards), [0, 0, 0, 0, 1.5])
+        self.assertEqual(list(episode.dones), [False, False, False, False, True])
+
+if __name__ == '__main__':
+    unittest.main()